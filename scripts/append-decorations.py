@@ -65,9 +65,16 @@ def extract_decoration_tiles():
     return tiles
 
 
-def append_to_tileset(tiles):
-    """Append decoration tiles to arena_unified.png as rows 44-45."""
-    tileset = Image.open(TILESET_PATH).convert("RGBA")
+def append_to_tileset(tiles, tileset=None, save=True):
+    """
+    Append decoration tiles to arena_unified.png as rows 44-45.
+
+    An already decoded 8x44 tileset can be passed in instead of reading the
+    file, and save=False skips the write. Returns the extended image.
+    """
+    if tileset is None:
+        tileset = Image.open(TILESET_PATH)
+    tileset = tileset.convert("RGBA")
     orig_w, orig_h = tileset.size
 
     # 12 tiles = row 44 (8 tiles) + row 45 (4 tiles + 4 empty)
@@ -85,14 +92,22 @@ def append_to_tileset(tiles):
         y = orig_h + row * TILE_SIZE
         new_tileset.paste(tile, (x, y))
 
-    new_tileset.save(TILESET_PATH)
-    print(f"Updated {TILESET_PATH}")
+    if save:
+        new_tileset.save(TILESET_PATH)
+        print(f"Updated {TILESET_PATH}")
+    else:
+        print("Appended decorations in memory")
     print(f"  Original: {orig_w}x{orig_h}")
     print(f"  New:      {orig_w}x{new_h}")
     print(f"  Added {len(tiles)} decoration tiles in rows {orig_h // TILE_SIZE}-{orig_h // TILE_SIZE + new_rows - 1}")
     print(f"  Tile IDs: {orig_h // TILE_SIZE * 8 + 1}-{orig_h // TILE_SIZE * 8 + len(tiles)}")
+    return new_tileset
 
 
-if __name__ == "__main__":
+def main(tileset=None, save=True):
     tiles = extract_decoration_tiles()
-    append_to_tileset(tiles)
+    return append_to_tileset(tiles, tileset, save)
+
+
+if __name__ == "__main__":
+    main()
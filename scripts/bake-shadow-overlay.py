@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Bake soft contact-shadow / ambient-occlusion overlays for every arena map.
+
+The wall volume (canopy + front face tiles) is rasterized into an occupancy
+grid at SUBDIV cells per tile, then convolved with a distance-based darkening
+kernel that is offset towards the bottom-right (light from the top-left).
+The convolution is a sum of shifted whole-grid slices, one per kernel tap,
+so a 50x38 map bakes in a few milliseconds.
+
+Rocks are destructible, so they are not baked into the map overlay. Instead a
+single rock shadow stamp is baked with the same kernel; the client places it
+under each rock sprite and destroys it together with the rock.
+
+Input:  client/public/maps/*.json
+Output: client/public/tilesets/baked/<map>/shadow.png (full map size, black + alpha)
+        client/public/tilesets/baked/rock_shadow.png
+        client/public/tilesets/baked/shadows.json
+
+Usage:
+    python3 scripts/bake-shadow-overlay.py
+"""
+
+from PIL import Image
+import numpy as np
+import json
+import os
+import time
+
+from tile_atlas import THEME_OFFSETS, TILES_PER_THEME, WALL_FRONT_OFFSET
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+MAPS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "maps")
+BAKED_DIR = os.path.join(PROJECT_ROOT, "client", "public", "tilesets", "baked")
+
+SUBDIV = 4             # Occupancy cells per tile edge (8px cells for 32px tiles)
+RADIUS = 6             # Kernel radius in cells
+OFFSET = (1, 2)        # Shadow drop (dx, dy) in cells, towards bottom-right
+MAX_DARKNESS = 0.45    # Alpha cap for the darkest shadow
+FALLOFF = 2.0          # Kernel falloff exponent (higher = tighter contact shadow)
+
+
+# ============================================================
+# Occupancy + kernel
+# ============================================================
+
+def is_wall_volume(ids):
+    """Vectorized check for wall canopy or wall front tile IDs (any theme)."""
+    mask = np.zeros(ids.shape, dtype=bool)
+    for offset in THEME_OFFSETS.values():
+        mask |= (ids >= 1 + offset) & (ids <= offset + TILES_PER_THEME + WALL_FRONT_OFFSET)
+    return mask
+
+
+def build_occupancy(tile_mask, subdiv=SUBDIV):
+    """Expand a (h, w) boolean tile mask to a (h*subdiv, w*subdiv) float grid."""
+    occ = np.repeat(np.repeat(tile_mask, subdiv, axis=0), subdiv, axis=1)
+    return occ.astype(np.float32)
+
+
+def build_kernel(radius=RADIUS, falloff=FALLOFF):
+    """Distance-based darkening kernel, normalized so a half-plane of occupancy reaches 1.0."""
+    coords = np.arange(-radius, radius + 1, dtype=np.float32)
+    dist = np.sqrt(coords[None, :] ** 2 + coords[:, None] ** 2)
+    kernel = np.clip(1.0 - dist / (radius + 1), 0.0, None) ** falloff
+    return kernel / (kernel.sum() * 0.5)
+
+
+def convolve(occ, kernel, offset=OFFSET):
+    """
+    Convolve occupancy with the kernel, shifted by `offset` cells.
+
+    Implemented as one shifted-slice multiply-add per kernel tap over the
+    whole grid (no per-cell Python loop).
+    """
+    r = kernel.shape[0] // 2
+    dx, dy = offset
+    pad = r + max(abs(dx), abs(dy))
+    padded = np.pad(occ, pad)
+    h, w = occ.shape
+    out = np.zeros_like(occ)
+    for ky in range(kernel.shape[0]):
+        for kx in range(kernel.shape[1]):
+            weight = kernel[ky, kx]
+            if weight == 0.0:
+                continue
+            # Shadow at (y, x) gathers occupancy from (y - dy + ky - r, x - dx + kx - r)
+            y0 = pad - dy + ky - r
+            x0 = pad - dx + kx - r
+            out += weight * padded[y0:y0 + h, x0:x0 + w]
+    return out
+
+
+def shade_to_rgba(shade, occ, scale):
+    """
+    Convert a shade grid to a black RGBA overlay upscaled by `scale`.
+
+    Shadow is masked out on occupied cells so it never darkens wall tops.
+    """
+    alpha = np.clip(shade, 0.0, 1.0) * MAX_DARKNESS
+    alpha[occ > 0] = 0.0
+    alpha_img = Image.fromarray((alpha * 255).astype(np.uint8), "L")
+    alpha_img = alpha_img.resize((alpha_img.width * scale, alpha_img.height * scale), Image.BILINEAR)
+    overlay = Image.new("RGBA", alpha_img.size, (0, 0, 0, 0))
+    overlay.putalpha(alpha_img)
+    return overlay
+
+
+# ============================================================
+# Baking
+# ============================================================
+
+def bake_map_shadow(d, kernel):
+    """Return the shadow overlay Image for a map's Walls + WallFronts layers."""
+    w = d["width"]
+    h = d["height"]
+    layers_by_name = {l["name"]: l for l in d["layers"] if l.get("type") == "tilelayer"}
+
+    tile_mask = np.zeros((h, w), dtype=bool)
+    for layer_name in ("Walls", "WallFronts"):
+        layer = layers_by_name.get(layer_name)
+        if layer is not None:
+            ids = np.asarray(layer["data"], dtype=np.int64).reshape(h, w)
+            tile_mask |= is_wall_volume(ids)
+
+    occ = build_occupancy(tile_mask)
+    shade = convolve(occ, kernel)
+    return shade_to_rgba(shade, occ, d["tilewidth"] // SUBDIV)
+
+
+def bake_rock_stamp(kernel, tile_size):
+    """
+    Bake the shadow of a single rock tile, padded by the kernel reach.
+
+    Returns (Image, margin_px): place the stamp at (rockX - margin, rockY - margin).
+    """
+    reach = RADIUS + max(abs(OFFSET[0]), abs(OFFSET[1]))
+    cells = SUBDIV + 2 * reach
+    occ = np.zeros((cells, cells), dtype=np.float32)
+    occ[reach:reach + SUBDIV, reach:reach + SUBDIV] = 1.0
+    shade = convolve(occ, kernel)
+    scale = tile_size // SUBDIV
+    return shade_to_rgba(shade, occ, scale), reach * scale
+
+
+def main():
+    print("Baking shadow overlays...")
+    print()
+
+    os.makedirs(BAKED_DIR, exist_ok=True)
+    kernel = build_kernel()
+    index = {"maps": {}}
+    tile_size = 32
+
+    for filename in sorted(os.listdir(MAPS_DIR)):
+        if not filename.endswith(".json"):
+            continue
+        map_name = os.path.splitext(filename)[0]
+        with open(os.path.join(MAPS_DIR, filename)) as f:
+            d = json.load(f)
+        tile_size = d["tilewidth"]
+
+        start = time.perf_counter()
+        overlay = bake_map_shadow(d, kernel)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        out_dir = os.path.join(BAKED_DIR, map_name)
+        os.makedirs(out_dir, exist_ok=True)
+        overlay.save(os.path.join(out_dir, "shadow.png"))
+        index["maps"][map_name] = {"image": f"{map_name}/shadow.png", "width": overlay.width, "height": overlay.height}
+        print(f"  Created {out_dir}/shadow.png ({overlay.width}x{overlay.height}, baked in {elapsed_ms:.1f}ms)")
+
+    stamp, margin = bake_rock_stamp(kernel, tile_size)
+    stamp_path = os.path.join(BAKED_DIR, "rock_shadow.png")
+    stamp.save(stamp_path)
+    index["rockStamp"] = {"image": "rock_shadow.png", "offsetX": -margin, "offsetY": -margin}
+    print(f"  Created {stamp_path} ({stamp.width}x{stamp.height}, offset -{margin}px)")
+
+    index_path = os.path.join(BAKED_DIR, "shadows.json")
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+    print(f"  Created {index_path}")
+
+    print()
+    print("Shadow overlay baking complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Bake the static tile layers of every arena map into chunked PNG images.
+
+For each map in client/public/maps, the Ground, Decorations, WallFronts and
+Walls layers are composited from the unified tileset into full-resolution
+layer images, then cut into CHUNK_SIZE x CHUNK_SIZE pixel chunks. Fully
+transparent chunks are dropped. The client can draw a handful of quads per
+layer instead of building thousands of tile sprites.
+
+Destructible rocks (IDs 289-296) are left out of the baked Walls layer so they
+can still disappear at runtime; their positions are listed in the manifest.
+
+Input:  client/public/maps/*.json + the tileset image each map references
+Output: client/public/tilesets/baked/<map>/<layer>_<cx>_<cy>.png
+        client/public/tilesets/baked/<map>/manifest.json
+
+Usage:
+    python3 scripts/bake-static-chunks.py
+"""
+
+from PIL import Image
+import numpy as np
+import json
+import os
+
+from tile_atlas import ROCK_CANOPY_MAX, ROCK_CANOPY_MIN, load_tile_stack
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+MAPS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "maps")
+BAKED_DIR = os.path.join(PROJECT_ROOT, "client", "public", "tilesets", "baked")
+
+CHUNK_SIZE = 512  # Chunk edge in pixels
+
+# Layers baked in render order (bottom-to-top). Missing layers are skipped.
+STATIC_LAYERS = ["Ground", "Decorations", "WallFronts", "Walls"]
+
+
+# ============================================================
+# Layer compositing
+# ============================================================
+
+def render_layer(data, width, height, stack, firstgid=1):
+    """
+    Render a flat tile layer into a (height*th, width*tw, 4) RGBA array.
+
+    Each cell holds exactly one tile, so the whole layer is a single gather
+    from the tile stack followed by a reshape -- no per-tile pasting.
+    """
+    gids = np.asarray(data, dtype=np.int64).reshape(height, width)
+    local = np.where(gids > 0, gids - firstgid + 1, 0)
+    if local.max() >= len(stack):
+        raise ValueError(f"Tile ID {int(local.max()) + firstgid - 1} is outside the tileset")
+
+    th, tw = stack.shape[1:3]
+    tiles = stack[local]  # (height, width, th, tw, 4)
+    return tiles.transpose(0, 2, 1, 3, 4).reshape(height * th, width * tw, 4)
+
+
+def split_dynamic_tiles(data, width):
+    """
+    Remove destructible rocks from a Walls layer.
+
+    Returns (static_data, dynamic) where dynamic lists {x, y, gid} in tile coords.
+    """
+    static = list(data)
+    dynamic = []
+    for i, gid in enumerate(data):
+        if ROCK_CANOPY_MIN <= gid <= ROCK_CANOPY_MAX:
+            static[i] = 0
+            dynamic.append({"x": i % width, "y": i // width, "gid": gid})
+    return static, dynamic
+
+
+def write_chunks(layer_img, layer_name, out_dir, chunk_size=CHUNK_SIZE):
+    """Cut a layer image into chunks, skipping fully transparent ones. Returns chunk entries."""
+    h, w = layer_img.shape[:2]
+    prefix = layer_name.lower()
+    chunks = []
+    for cy, y0 in enumerate(range(0, h, chunk_size)):
+        for cx, x0 in enumerate(range(0, w, chunk_size)):
+            chunk = layer_img[y0:y0 + chunk_size, x0:x0 + chunk_size]
+            if not chunk[:, :, 3].any():
+                continue
+            filename = f"{prefix}_{cx}_{cy}.png"
+            Image.fromarray(chunk, "RGBA").save(os.path.join(out_dir, filename))
+            chunks.append({
+                "x": x0,
+                "y": y0,
+                "w": chunk.shape[1],
+                "h": chunk.shape[0],
+                "image": filename,
+            })
+    return chunks
+
+
+# ============================================================
+# Map baking
+# ============================================================
+
+def bake_map(map_path, out_root, tile_cache):
+    """Bake one map's static layers to chunk PNGs plus a manifest."""
+    map_name = os.path.splitext(os.path.basename(map_path))[0]
+    with open(map_path) as f:
+        d = json.load(f)
+
+    width = d["width"]
+    height = d["height"]
+    tileset = d["tilesets"][0]
+    firstgid = tileset["firstgid"]
+
+    image_path = os.path.normpath(os.path.join(os.path.dirname(map_path), tileset["image"]))
+    cache_key = (image_path, tileset["tilecount"])
+    if cache_key not in tile_cache:
+        tile_cache[cache_key] = load_tile_stack(tileset, os.path.dirname(map_path))
+    stack = tile_cache[cache_key]
+
+    out_dir = os.path.join(out_root, map_name)
+    os.makedirs(out_dir, exist_ok=True)
+
+    layers_by_name = {l["name"]: l for l in d["layers"] if l.get("type") == "tilelayer"}
+    manifest_layers = []
+    dynamic = []
+
+    for layer_name in STATIC_LAYERS:
+        layer = layers_by_name.get(layer_name)
+        if layer is None:
+            continue
+
+        data = layer["data"]
+        if layer_name == "Walls":
+            data, dynamic = split_dynamic_tiles(data, width)
+
+        layer_img = render_layer(data, width, height, stack, firstgid)
+        chunks = write_chunks(layer_img, layer_name, out_dir)
+        manifest_layers.append({"name": layer_name, "chunks": chunks})
+
+    manifest = {
+        "map": map_name,
+        "tileWidth": d["tilewidth"],
+        "tileHeight": d["tileheight"],
+        "width": width * d["tilewidth"],
+        "height": height * d["tileheight"],
+        "chunkSize": CHUNK_SIZE,
+        "layers": manifest_layers,
+        "dynamic": {"layer": "Walls", "tiles": dynamic},
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    chunk_count = sum(len(l["chunks"]) for l in manifest_layers)
+    print(f"  Created {out_dir} ({len(manifest_layers)} layers, {chunk_count} chunks, {len(dynamic)} dynamic rocks)")
+
+
+def main(tile_cache=None):
+    """
+    `tile_cache` maps (tileset image path, tilecount) to an already decoded
+    tile stack (see load_tile_stack), so a pipeline can skip re-reading it.
+    """
+    print("Baking static layer chunks...")
+    print()
+
+    tile_cache = dict(tile_cache or {})
+    for filename in sorted(os.listdir(MAPS_DIR)):
+        if not filename.endswith(".json"):
+            continue
+        bake_map(os.path.join(MAPS_DIR, filename), BAKED_DIR, tile_cache)
+
+    print()
+    print("Static layer baking complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Build a minimal extruded tileset atlas for every arena map.
+
+Every map references the full arena_unified.png (368 tiles: three wall themes,
+all floors and decorations) although it only draws its own theme's tiles.
+This stage collects the tile IDs each map actually uses, packs just those
+tiles (in original ID order) into a compact atlas with the same 1px
+extrusion as extrude-tileset.py, and writes a copy of the map with every
+layer rewritten to dense IDs 1..N.
+
+The compact map keeps the tileset name "arena_unified", so GameScene's
+addTilesetImage call works unchanged once it is pointed at the compact
+texture. Keys in collisionOverrides are rewritten to the new IDs. The remap is
+stored as a stringified "tileRemap" map property ({compactId: originalId})
+so server-side logic can still resolve tile semantics from tileRegistry.ts.
+
+Input:  client/public/maps/*.json + the tileset image each map references
+Output: client/public/maps/compact/<map>.json
+        client/public/tilesets/compact/<map>.png
+
+Usage:
+    python3 scripts/build-map-atlases.py
+"""
+
+from PIL import Image
+import numpy as np
+import json
+import os
+
+from tile_atlas import build_extruded_atlas, get_property, load_tile_stack, set_property
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+MAPS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "maps")
+COMPACT_MAPS_DIR = os.path.join(MAPS_DIR, "compact")
+COMPACT_TILESETS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "tilesets", "compact")
+
+COLS = 8       # Atlas columns, as in arena_unified.png
+EXTRUDE = 1    # Pixels of edge extrusion per side (margin=1, spacing=2)
+
+
+# ============================================================
+# Map rewriting
+# ============================================================
+
+def used_tile_ids(d):
+    """Return the sorted array of non-zero tile IDs across all tile layers."""
+    ids = [np.asarray(l["data"], dtype=np.int64) for l in d["layers"] if l.get("type") == "tilelayer"]
+    used = np.unique(np.concatenate(ids))
+    return used[used > 0]
+
+
+def compact_map(d, used, map_name):
+    """
+    Return a copy of the map rewritten to dense tile IDs 1..len(used).
+
+    `used` holds the original IDs in compact order, so compact ID i is used[i - 1].
+    """
+    tileset = d["tilesets"][0]
+    firstgid = tileset["firstgid"]
+    lut = np.zeros(int(used.max()) + 1, dtype=np.int64)
+    lut[used] = np.arange(1, len(used) + 1)
+
+    out = json.loads(json.dumps(d))
+    for layer in out["layers"]:
+        if layer.get("type") == "tilelayer":
+            layer["data"] = lut[np.asarray(layer["data"], dtype=np.int64)].tolist()
+
+    tw = tileset["tilewidth"]
+    th = tileset["tileheight"]
+    rows = -(-len(used) // COLS)
+    out["tilesets"] = [{
+        "firstgid": 1,
+        "columns": COLS,
+        "image": f"../../tilesets/compact/{map_name}.png",
+        "imagewidth": COLS * (tw + 2 * EXTRUDE),
+        "imageheight": rows * (th + 2 * EXTRUDE),
+        "margin": EXTRUDE,
+        "name": tileset["name"],
+        "spacing": 2 * EXTRUDE,
+        "tilecount": len(used),
+        "tilewidth": tw,
+        "tileheight": th,
+    }]
+
+    overrides_raw = get_property(d, "collisionOverrides")
+    if overrides_raw:
+        overrides = json.loads(overrides_raw)
+        remapped = {}
+        for key, rect in overrides.items():
+            old = int(key) - firstgid + 1
+            if old < len(lut) and lut[old]:
+                remapped[str(int(lut[old]))] = rect
+        set_property(out, "collisionOverrides", json.dumps(remapped, separators=(",", ":")))
+
+    remap = {str(i + 1): int(old) + firstgid - 1 for i, old in enumerate(used)}
+    set_property(out, "tileRemap", json.dumps(remap, separators=(",", ":")))
+    return out
+
+
+def build_map_atlas(map_path, tile_cache):
+    """Write the compact atlas and remapped map for one map. Returns (used count, total count)."""
+    map_name = os.path.splitext(os.path.basename(map_path))[0]
+    with open(map_path) as f:
+        d = json.load(f)
+
+    tileset = d["tilesets"][0]
+    image_path = os.path.normpath(os.path.join(os.path.dirname(map_path), tileset["image"]))
+    cache_key = (image_path, tileset["tilecount"])
+    if cache_key not in tile_cache:
+        tile_cache[cache_key] = load_tile_stack(tileset, os.path.dirname(map_path))
+    stack = tile_cache[cache_key]
+
+    # Layer GIDs -> local stack indices (stack index 0 is the empty tile)
+    used = used_tile_ids(d) - tileset["firstgid"] + 1
+    if len(used) and used.max() >= len(stack):
+        raise ValueError(f"{map_name}: tile ID {int(used.max()) + tileset['firstgid'] - 1} is outside the tileset")
+
+    atlas = build_extruded_atlas(stack[used], COLS, EXTRUDE)
+    Image.fromarray(atlas, "RGBA").save(os.path.join(COMPACT_TILESETS_DIR, f"{map_name}.png"))
+
+    with open(os.path.join(COMPACT_MAPS_DIR, f"{map_name}.json"), "w") as f:
+        json.dump(compact_map(d, used, map_name), f, indent=2)
+
+    full_px = tileset["imagewidth"] * tileset["imageheight"]
+    pct = atlas.shape[0] * atlas.shape[1] * 100 / full_px
+    print(f"  Created {map_name}: {len(used)}/{tileset['tilecount']} tiles, "
+          f"{atlas.shape[1]}x{atlas.shape[0]} atlas ({pct:.0f}% of the full tileset)")
+    return len(used), tileset["tilecount"]
+
+
+def main(tile_cache=None):
+    """
+    `tile_cache` maps (tileset image path, tilecount) to an already decoded
+    tile stack (see load_tile_stack), so a pipeline can skip re-reading it.
+    """
+    print("Building per-map tileset atlases...")
+    print()
+
+    os.makedirs(COMPACT_MAPS_DIR, exist_ok=True)
+    os.makedirs(COMPACT_TILESETS_DIR, exist_ok=True)
+    tile_cache = dict(tile_cache or {})
+    for filename in sorted(os.listdir(MAPS_DIR)):
+        if not filename.endswith(".json"):
+            continue
+        build_map_atlas(os.path.join(MAPS_DIR, filename), tile_cache)
+
+    print()
+    print("Per-map atlas building complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Collapse duplicate tiles in the unified tileset into shared atlas slots.
+
+create_unified_tileset() writes plain-color fills, reserved empty rows and
+floor tiles copied from the same source coordinates, and several wall
+variants upscale to identical 32x32 images. This pass hashes every tile's
+pixels (fully transparent pixels count as one color), keeps the first
+occurrence of each distinct tile, and writes a smaller extruded atlas plus an
+alias table from every legacy tile ID (the IDs tileRegistry.ts and the map
+files use) to its physical slot.
+
+Existing maps and arena_unified.png are not modified. A client using the
+deduplicated atlas maps each layer's GIDs through the alias table on load;
+slots are 1-based, so they can be used directly as GIDs with firstgid=1.
+
+Input:  client/public/tilesets/arena_unified.png (272x1564, 8x46 @ 32px, margin=1, spacing=2)
+Output: client/public/tilesets/arena_unified_dedup.png (same layout, fewer rows)
+        client/public/tilesets/arena_unified_aliases.json
+
+Usage:
+    python3 scripts/dedupe-tileset.py
+"""
+
+from PIL import Image
+import numpy as np
+import hashlib
+import json
+import os
+
+from tile_atlas import COLS, EXTRUDE, ROWS, TILE, build_extruded_atlas, read_tiles
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+TILESETS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "tilesets")
+TILESET_PATH = os.path.join(TILESETS_DIR, "arena_unified.png")
+DEDUP_PATH = os.path.join(TILESETS_DIR, "arena_unified_dedup.png")
+ALIASES_PATH = os.path.join(TILESETS_DIR, "arena_unified_aliases.json")
+
+
+# ============================================================
+# Deduplication
+# ============================================================
+
+def dedupe_tiles(tiles):
+    """
+    Collapse identical tiles, keeping first occurrences in legacy ID order.
+
+    Invisible RGB under alpha 0 is zeroed first so it cannot split visually
+    identical tiles. Returns (unique tiles array, {legacy ID: 1-based slot}).
+    """
+    tiles = tiles.copy()
+    tiles[tiles[..., 3] == 0] = 0
+
+    slots = {}
+    unique = []
+    aliases = {}
+    for i, tile in enumerate(tiles):
+        digest = hashlib.sha1(tile.tobytes()).digest()
+        if digest not in slots:
+            unique.append(tile)
+            slots[digest] = len(unique)
+        aliases[str(i + 1)] = slots[digest]
+    return np.stack(unique), aliases
+
+
+def main(tiles=None):
+    """`tiles` is an already decoded (368, 32, 32, 4) tile array; by default TILESET_PATH is read."""
+    print("Deduplicating unified tileset...")
+    print()
+
+    if tiles is None:
+        tiles = read_tiles(Image.open(TILESET_PATH))
+    unique, aliases = dedupe_tiles(tiles)
+
+    dedup = build_extruded_atlas(unique, COLS, EXTRUDE)
+    Image.fromarray(dedup, "RGBA").save(DEDUP_PATH)
+    print(f"  Created {DEDUP_PATH} ({dedup.shape[1]}x{dedup.shape[0]})")
+
+    table = {
+        "image": os.path.basename(DEDUP_PATH),
+        "tileWidth": TILE,
+        "tileHeight": TILE,
+        "columns": COLS,
+        "margin": EXTRUDE,
+        "spacing": 2 * EXTRUDE,
+        "tileCount": len(unique),
+        "legacyTileCount": len(tiles),
+        "aliases": aliases,
+    }
+    with open(ALIASES_PATH, "w") as f:
+        json.dump(table, f, indent=2)
+    print(f"  Created {ALIASES_PATH}")
+
+    full_h = ROWS * (TILE + 2 * EXTRUDE)
+    saved = full_h - dedup.shape[0]
+    print(f"    Tiles: {len(tiles)} -> {len(unique)} slots ({len(tiles) - len(unique)} duplicates), "
+          f"{saved}px shorter ({saved * 100 / full_h:.0f}%)")
+
+    print()
+    print("Tileset deduplication complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,102 +1,118 @@
 #!/usr/bin/env python3
 """
-Extrude tiles in a tileset PNG to prevent tile-seam bleeding.
+Extrude tiles in a tileset PNG to prevent tile-seam bleeding, and build
+downscaled LOD atlases for the zoomed-out overview camera.
 
 Adds 1px extrusion around each tile by duplicating the outermost pixel
 row/column outward. This prevents sub-pixel rendering gaps (white lines)
 that appear when the camera is at non-integer positions.
 
+For every size in LOD_TILE_SIZES the tiles are box-filtered down in
+premultiplied alpha, one tile at a time, so no color bleeds in from
+transparent pixels or from neighbouring tiles. Each LOD atlas gets its own
+1px extrusion. The column/row layout is the same at every size, so a tile
+index resolves to the same tile in every atlas and the client can swap
+textures by zoom level.
+
 Input:  client/public/tilesets/arena_unified.png (256x1472, 8x46 @ 32px, margin=0, spacing=0)
+        (an already extruded 272x1564 input is accepted too, so the script can be re-run)
 Output: same path, overwritten (272x1564, 8x46 @ 32px, margin=1, spacing=2)
+        client/public/tilesets/arena_unified_16.png (144x828, 8x46 @ 16px, margin=1, spacing=2)
+        client/public/tilesets/arena_unified_8.png (80x460, 8x46 @ 8px, margin=1, spacing=2)
+        client/public/tilesets/arena_unified_lods.json
 """
 
 from PIL import Image
+import numpy as np
+import json
 import os
 
+from tile_atlas import COLS, EXTRUDE, ROWS, TILE, build_extruded_atlas, extruded_size, read_tiles
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-TILESET_PATH = os.path.join(PROJECT_ROOT, "client", "public", "tilesets", "arena_unified.png")
-
-TILE = 32
-COLS = 8
-ROWS = 46
-EXTRUDE = 1  # pixels of extrusion per side
-
-
-def extrude_tileset():
-    src = Image.open(TILESET_PATH).convert("RGBA")
-
-    expected_w = COLS * TILE
-    expected_h = ROWS * TILE
-    if src.size != (expected_w, expected_h):
-        print(f"WARNING: Expected {expected_w}x{expected_h}, got {src.size[0]}x{src.size[1]}")
-
-    # New tile stride = TILE + 2 * EXTRUDE
-    stride = TILE + 2 * EXTRUDE  # 34
-    new_w = EXTRUDE + COLS * stride - EXTRUDE  # margin + cols*stride - one trailing extrude overlap
-    new_h = EXTRUDE + ROWS * stride - EXTRUDE
-    # Simplifies to: COLS * stride + EXTRUDE... wait let me think carefully.
-    # Layout: margin=1, spacing=2 between tiles.
-    # Tile at (col, row) starts at (1 + col*34, 1 + row*34).
-    # Last tile right edge: 1 + (COLS-1)*34 + 32 = 1 + 7*34 + 32 = 1 + 238 + 32 = 271.
-    # Plus 1px right extrusion = 272.
-    new_w = EXTRUDE + (COLS - 1) * stride + TILE + EXTRUDE
-    new_h = EXTRUDE + (ROWS - 1) * stride + TILE + EXTRUDE
-
-    dst = Image.new("RGBA", (new_w, new_h), (0, 0, 0, 0))
-
-    for row in range(ROWS):
-        for col in range(COLS):
-            # Source tile position
-            sx = col * TILE
-            sy = row * TILE
-            tile = src.crop((sx, sy, sx + TILE, sy + TILE))
-
-            # Destination tile position (inside the extrusion border)
-            dx = EXTRUDE + col * stride
-            dy = EXTRUDE + row * stride
-
-            # Paste the tile itself
-            dst.paste(tile, (dx, dy))
-
-            # Extrude edges by duplicating outermost pixel rows/columns
-
-            # Top edge: duplicate top row upward
-            top_row = tile.crop((0, 0, TILE, 1))
-            dst.paste(top_row, (dx, dy - EXTRUDE))
-
-            # Bottom edge: duplicate bottom row downward
-            bottom_row = tile.crop((0, TILE - 1, TILE, TILE))
-            dst.paste(bottom_row, (dx, dy + TILE))
-
-            # Left edge: duplicate left column leftward
-            left_col = tile.crop((0, 0, 1, TILE))
-            dst.paste(left_col, (dx - EXTRUDE, dy))
-
-            # Right edge: duplicate right column rightward
-            right_col = tile.crop((TILE - 1, 0, TILE, TILE))
-            dst.paste(right_col, (dx + TILE, dy))
-
-            # Corners: duplicate corner pixels
-            # Top-left
-            tl = tile.getpixel((0, 0))
-            dst.putpixel((dx - EXTRUDE, dy - EXTRUDE), tl)
-
-            # Top-right
-            tr = tile.getpixel((TILE - 1, 0))
-            dst.putpixel((dx + TILE, dy - EXTRUDE), tr)
-
-            # Bottom-left
-            bl = tile.getpixel((0, TILE - 1))
-            dst.putpixel((dx - EXTRUDE, dy + TILE), bl)
-
-            # Bottom-right
-            br = tile.getpixel((TILE - 1, TILE - 1))
-            dst.putpixel((dx + TILE, dy + TILE), br)
-
-    dst.save(TILESET_PATH)
+TILESETS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "tilesets")
+TILESET_PATH = os.path.join(TILESETS_DIR, "arena_unified.png")
+LODS_PATH = os.path.join(TILESETS_DIR, "arena_unified_lods.json")
+
+# Downscaled tile sizes; each must divide TILE
+LOD_TILE_SIZES = [16, 8]
+
+
+# ============================================================
+# LOD downscaling
+# ============================================================
+
+def box_downscale(tiles, size):
+    """
+    Box-filter (n, tile, tile, 4) tiles down to (n, size, size, 4).
+
+    Averaging happens per tile in premultiplied alpha: color is weighted by
+    coverage before averaging and divided back out afterwards, so transparent
+    pixels never darken edges.
+    """
+    n, tile = tiles.shape[:2]
+    factor = tile // size
+    if factor * size != tile:
+        raise ValueError(f"LOD size {size} does not divide tile size {tile}")
+
+    px = tiles.astype(np.float64)
+    alpha = px[..., 3:4] / 255.0
+    premul = np.concatenate([px[..., :3] * alpha, alpha], axis=-1)
+    blocks = premul.reshape(n, size, factor, size, factor, 4).mean(axis=(2, 4))
+
+    a = blocks[..., 3:4]
+    rgb = np.divide(blocks[..., :3], a, out=np.zeros_like(blocks[..., :3]), where=a > 0)
+    out = np.concatenate([rgb, a * 255.0], axis=-1)
+    return np.clip(np.rint(out), 0, 255).astype(np.uint8)
+
+
+def lod_path(size):
+    """Output path of the LOD atlas for a tile size."""
+    stem, ext = os.path.splitext(TILESET_PATH)
+    return f"{stem}_{size}{ext}"
+
+
+def extrude_tileset(src=None):
+    """
+    Extrude the unified tileset and write the LOD atlases.
+
+    `src` is an already decoded tileset image; by default TILESET_PATH is
+    read. Returns the (rows * cols, tile, tile, 4) tile array.
+    """
+    if src is None:
+        src = Image.open(TILESET_PATH)
+    tiles = read_tiles(src)
+
+    atlas = build_extruded_atlas(tiles, COLS, EXTRUDE)
+    Image.fromarray(atlas, "RGBA").save(TILESET_PATH)
+    new_w, new_h = extruded_size(TILE)
     print(f"Extruded tileset saved: {new_w}x{new_h} ({TILESET_PATH})")
 
+    lods = {}
+    for size in LOD_TILE_SIZES:
+        lod_atlas = build_extruded_atlas(box_downscale(tiles, size), COLS, EXTRUDE)
+        path = lod_path(size)
+        Image.fromarray(lod_atlas, "RGBA").save(path)
+        lods[str(size)] = {
+            "image": os.path.basename(path),
+            "imagewidth": lod_atlas.shape[1],
+            "imageheight": lod_atlas.shape[0],
+            "tilewidth": size,
+            "tileheight": size,
+            "columns": COLS,
+            "margin": EXTRUDE,
+            "spacing": 2 * EXTRUDE,
+            "tilecount": COLS * ROWS,
+            "scale": size / TILE,
+        }
+        print(f"LOD tileset saved: {lod_atlas.shape[1]}x{lod_atlas.shape[0]} @ {size}px ({path})")
+
+    with open(LODS_PATH, "w") as f:
+        json.dump({"baseTileSize": TILE, "lods": lods}, f, indent=2)
+    print(f"LOD index saved: {LODS_PATH}")
+    return tiles
+
 
 if __name__ == "__main__":
     extrude_tileset()
@@ -4,7 +4,13 @@ Generate unified tileset PNG and arena map JSONs for 3 themed arenas.
 
 Produces:
   - 1 unified tileset (256x1408, 8x44 grid of 32x32 tiles, 352 total)
-  - 3 map JSONs (50x38 tiles, 3 layers: Ground, WallFronts, Walls)
+  - 3 map JSONs (50x38 tiles, 4 layers: Ground, Decorations, WallFronts, Walls)
+    in build/generated-maps
+
+The maps in client/public/maps are authored in Tiled and have their own
+layouts, so generated maps never overwrite them. Each generated map carries
+the custom properties (mapName, spawnPoints, collisionOverrides, ...) of the
+authored map with the same name; copy one into client/public/maps to use it.
 
 Unified tileset layout (firstgid=1):
   Rows  0-5  (IDs   1- 48): Hedge wall canopy auto-tiles
@@ -26,10 +32,15 @@ Auto-tiling:
   tilesets. Theme offset applied: resolved = spriteIndex + 1 + WALL_THEME_OFFSET[theme]
 
 Pseudo-3D depth:
-  3 tile layers render bottom-to-top: Ground -> WallFronts -> Walls.
+  4 tile layers render bottom-to-top: Ground -> Decorations -> WallFronts -> Walls.
   Front face tiles placed one row below wall canopy, creating south-facing 3D effect.
   Rocks use full 32x32 single-tile sprites (no front face).
 
+Decorations:
+  Decoration tiles (IDs 353-364, appended by append-decorations.py) are placed
+  with a grid-accelerated Poisson-disk sampler (Bridson) so they keep a minimum
+  spacing, then filtered to keep clear of walls, rocks and spawn points.
+
 Arena themes:
   - Hedge Garden: open corridors, scattered hedge clusters, Paran-favoring
   - Brick Fortress: chambered rooms, narrow doorways, Guardian-favoring
@@ -37,10 +48,15 @@ Arena themes:
 """
 
 from PIL import Image
+import numpy as np
 import json
+import math
 import os
 import random
 
+from tile_atlas import (DECORATION_MAX, DECORATION_MIN, ROCK_CANOPY_MAX, ROCK_CANOPY_MIN, THEME_OFFSETS,
+                        WALL_FRONT_OFFSET)
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 ASSETS_DIR = os.path.join(PROJECT_ROOT, "assets", "tilesets")
@@ -48,9 +64,7 @@ WALLS_DIR = os.path.join(ASSETS_DIR, "walls")
 OBSTACLES_DIR = os.path.join(ASSETS_DIR, "obstacles")
 TILESETS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "tilesets")
 MAPS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "maps")
-
-os.makedirs(TILESETS_DIR, exist_ok=True)
-os.makedirs(MAPS_DIR, exist_ok=True)
+GENERATED_MAPS_DIR = os.path.join(PROJECT_ROOT, "build", "generated-maps")
 
 TILE = 32
 TILE_HALF = 16
@@ -60,17 +74,6 @@ MAP_H = 38
 # Layout sentinel: walls are marked with this during layout, then auto-tiled
 WALL_ID = -1  # Sentinel resolved to themed auto-tile IDs after layout
 
-# Theme offsets (canopy tile ID = spriteIndex + 1 + offset)
-THEME_OFFSETS = {'hedge': 0, 'brick': 96, 'wood': 192}
-
-# Front face offsets
-WALL_FRONT_OFFSET = 48    # wall front ID = canopy ID + 48
-ROCK_FRONT_OFFSET = 8     # rock front ID = canopy ID + 8
-
-# Rock canopy IDs (289-296)
-ROCK_CANOPY_MIN = 289
-ROCK_CANOPY_MAX = 296
-
 # Rock tier mapping: {rock_id: hp}
 ROCK_TIER_HP = {
     289: 5, 290: 5, 291: 5,   # Heavy
@@ -86,6 +89,30 @@ LIGHT_ROCKS = [295, 296]
 # Obstacle canopy set for neighbor detection during auto-tiling
 OBSTACLE_IDS = set(range(ROCK_CANOPY_MIN, ROCK_CANOPY_MAX + 1))
 
+# Ground weight tables per theme: floor variants as (tile_id, weight) plus the
+# theme's deco tiles, Poisson-disk scattered deco_spacing tiles apart
+# (60/20/10/5 floors; a 3.5-tile spacing covers about 5% of cells with deco)
+GROUND_WEIGHTS = {
+    'hedge': {'floors': [(305, 60), (306, 20), (307, 10), (308, 5)],
+              'deco': [309, 310, 311, 312], 'deco_spacing': 3.5},
+    'brick': {'floors': [(313, 60), (314, 20), (315, 10), (316, 5)],
+              'deco': [317, 318, 319, 320], 'deco_spacing': 3.5},
+    'wood':  {'floors': [(321, 60), (322, 20), (323, 10), (324, 5)],
+              'deco': [325, 326, 327, 328], 'deco_spacing': 3.5},
+}
+
+# Coherent-noise ground mode tuning
+GROUND_NOISE_OCTAVES = 2        # Value-noise octaves (each half the lattice spacing)
+GROUND_NOISE_REF_SIZE = 128     # Reference window (tiles) used to derive variant thresholds
+
+# Decoration tile IDs (353-364, rows 44-45 appended by append-decorations.py)
+DECORATION_IDS = list(range(DECORATION_MIN, DECORATION_MAX + 1))
+
+# Decoration scatter tuning (in tiles)
+DECO_MIN_SPACING = 3.0     # Minimum distance between two decorations
+DECO_WALL_CLEARANCE = 1    # Keep this many tiles clear around walls and rocks
+DECO_SPAWN_CLEARANCE = 3   # Keep this many tiles clear around spawn points
+
 
 # ============================================================
 # Tile extraction helpers
@@ -159,10 +186,11 @@ def load_autotile_rules():
 # Unified tileset generation
 # ============================================================
 
-def create_unified_tileset(hedge_img, brick_img, wood_img, ground_img, rocks, output_path):
+def create_unified_tileset(hedge_img, brick_img, wood_img, ground_img, rocks, output_path=None):
     """
     Create a 256x1408 unified tileset (8 cols x 44 rows of 32x32 tiles).
     Contains all 3 wall themes, 8 rock variants, themed floors, plain colors, extra floors.
+    Saved to output_path when given; the image is returned either way.
     """
     composite = Image.new("RGBA", (8 * TILE, 44 * TILE), (0, 0, 0, 0))
 
@@ -261,8 +289,12 @@ def create_unified_tileset(hedge_img, brick_img, wood_img, ground_img, rocks, ou
         row = 42 + i // 8
         composite.paste(tile, (col * TILE, row * TILE))
 
-    composite.save(output_path)
-    print(f"  Created {output_path} ({composite.size[0]}x{composite.size[1]}, unified tileset)")
+    if output_path:
+        composite.save(output_path)
+        print(f"  Created {output_path} ({composite.size[0]}x{composite.size[1]}, unified tileset)")
+    else:
+        print(f"  Built unified tileset in memory ({composite.size[0]}x{composite.size[1]})")
+    return composite
 
 
 # ============================================================
@@ -362,36 +394,212 @@ def generate_front_faces(walls_data, w, h, theme_offset):
 # Map generation helpers
 # ============================================================
 
-def make_ground_layer(width, height, theme, seed=42):
-    """Generate ground layer with theme-specific floor and deco tile IDs."""
-    # Theme-specific tile IDs
-    floor_ids = {
-        'hedge': [305, 306, 307, 308],
-        'brick': [313, 314, 315, 316],
-        'wood': [321, 322, 323, 324],
-    }
-    deco_ids = {
-        'hedge': [309, 310, 311, 312],
-        'brick': [317, 318, 319, 320],
-        'wood': [325, 326, 327, 328],
-    }
-    floors = floor_ids[theme]
-    decos = deco_ids[theme]
+def _hash_uniform(xs, ys, seed, salt=0):
+    """
+    Counter-based uniform floats in [0, 1) for integer tile coords.
 
-    rng = random.Random(seed)
-    data = []
-    for _ in range(width * height):
-        r = rng.random()
-        if r < 0.60:
-            data.append(floors[0])   # 60% primary
-        elif r < 0.80:
-            data.append(floors[1])   # 20% secondary
-        elif r < 0.90:
-            data.append(floors[2])   # 10% tertiary
-        elif r < 0.95:
-            data.append(floors[3])   # 5% quaternary
+    Each value depends only on (seed, salt, x, y), never on map size or draw
+    order, so a larger map reproduces a smaller one in its top-left corner.
+    Uses SplitMix64-style mixing on uint64 arrays (wrapping arithmetic).
+    """
+    key = np.uint64((seed * 0x9E3779B1 + salt * 0x85EBCA77) % (1 << 64))
+    with np.errstate(over='ignore'):
+        h = xs.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        h ^= ys.astype(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F)
+        h ^= key
+        h ^= h >> np.uint64(30)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(27)
+        h *= np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+    return (h >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _value_noise(xs, ys, seed, scale, octaves=GROUND_NOISE_OCTAVES):
+    """Smooth value noise in [0, 1) from hashed lattice corners, summed over octaves."""
+    total = np.zeros(xs.shape, dtype=np.float64)
+    amplitude = 1.0
+    norm = 0.0
+    for octave in range(octaves):
+        gx = xs / scale
+        gy = ys / scale
+        x0 = np.floor(gx).astype(np.int64)
+        y0 = np.floor(gy).astype(np.int64)
+        fx = gx - x0
+        fy = gy - y0
+        # Smoothstep fade for C1-continuous patches
+        fx = fx * fx * (3 - 2 * fx)
+        fy = fy * fy * (3 - 2 * fy)
+
+        v00 = _hash_uniform(x0, y0, seed, salt=octave + 1)
+        v10 = _hash_uniform(x0 + 1, y0, seed, salt=octave + 1)
+        v01 = _hash_uniform(x0, y0 + 1, seed, salt=octave + 1)
+        v11 = _hash_uniform(x0 + 1, y0 + 1, seed, salt=octave + 1)
+        top = v00 + (v10 - v00) * fx
+        bottom = v01 + (v11 - v01) * fx
+        total += amplitude * (top + (bottom - top) * fy)
+
+        norm += amplitude
+        amplitude *= 0.5
+        scale = max(scale / 2.0, 1.0)
+    return total / norm
+
+
+def _noise_thresholds(seed, scale, cum_weights):
+    """
+    Noise levels that split the floor variants by their weights.
+
+    Quantiles are measured on a fixed reference window at the origin, so the
+    thresholds (and therefore the output) do not depend on the map size.
+    """
+    ys, xs = np.mgrid[0:GROUND_NOISE_REF_SIZE, 0:GROUND_NOISE_REF_SIZE]
+    ref = _value_noise(xs, ys, seed, scale)
+    return np.quantile(ref, cum_weights[:-1])
+
+
+def make_ground_layer(width, height, theme, seed=42, weights=None, noise_scale=None):
+    """
+    Generate ground layer with theme-specific floor tile IDs.
+
+    The whole layer is produced in one vectorized pass from GROUND_WEIGHTS
+    (or an explicit `weights` table of the same shape). With noise_scale=None
+    floor variants are white noise; with a noise_scale (lattice spacing in
+    tiles) they follow coherent value noise and form natural patches while
+    keeping their weighted proportions. Output is a function of (seed, x, y)
+    only. Deco tiles are placed afterwards by scatter_ground_deco().
+    """
+    table = weights or GROUND_WEIGHTS[theme]
+    floor_ids = np.array([tile_id for tile_id, _ in table['floors']], dtype=np.int64)
+    floor_w = np.array([w for _, w in table['floors']], dtype=np.float64)
+    cum_weights = np.cumsum(floor_w) / floor_w.sum()
+
+    ys, xs = np.mgrid[0:height, 0:width]
+
+    # Floor variant per cell
+    if noise_scale is None:
+        u = _hash_uniform(xs, ys, seed)
+        floor_idx = np.searchsorted(cum_weights, u, side='right')
+    else:
+        noise = _value_noise(xs, ys, seed, noise_scale)
+        floor_idx = np.searchsorted(_noise_thresholds(seed, noise_scale, cum_weights), noise, side='right')
+    data = floor_ids[np.minimum(floor_idx, len(floor_ids) - 1)]
+    return data.reshape(-1).tolist()
+
+
+def poisson_disk_sample(width, height, min_dist, rng, k=30):
+    """
+    Bridson's Poisson-disk sampling over the continuous area [0, width) x [0, height).
+
+    A background grid with cell size min_dist / sqrt(2) holds at most one sample
+    per cell, so each candidate only checks a 5x5 cell neighborhood and the whole
+    pass is O(n) in the number of samples. Returns a list of (x, y) floats.
+    """
+    cell = min_dist / math.sqrt(2)
+    grid_w = int(math.ceil(width / cell))
+    grid_h = int(math.ceil(height / cell))
+    grid = [None] * (grid_w * grid_h)
+    min_dist_sq = min_dist * min_dist
+
+    def fits(x, y):
+        gx, gy = int(x / cell), int(y / cell)
+        for ny in range(max(0, gy - 2), min(grid_h, gy + 3)):
+            for nx in range(max(0, gx - 2), min(grid_w, gx + 3)):
+                other = grid[ny * grid_w + nx]
+                if other is not None:
+                    dx, dy = other[0] - x, other[1] - y
+                    if dx * dx + dy * dy < min_dist_sq:
+                        return False
+        return True
+
+    def add(x, y):
+        samples.append((x, y))
+        grid[int(y / cell) * grid_w + int(x / cell)] = (x, y)
+        active.append((x, y))
+
+    samples = []
+    active = []
+    add(rng.uniform(0, width), rng.uniform(0, height))
+
+    while active:
+        i = rng.randrange(len(active))
+        px, py = active[i]
+        for _ in range(k):
+            # Uniform candidate in the annulus [min_dist, 2 * min_dist)
+            angle = rng.uniform(0, 2 * math.pi)
+            radius = min_dist * math.sqrt(rng.uniform(1, 4))
+            x = px + radius * math.cos(angle)
+            y = py + radius * math.sin(angle)
+            if 0 <= x < width and 0 <= y < height and fits(x, y):
+                add(x, y)
+                break
         else:
-            data.append(rng.choice(decos))  # 5% decoration
+            # No candidate fit: retire this point (swap-remove)
+            active[i] = active[-1]
+            active.pop()
+
+    return samples
+
+
+def scatter_ground_deco(ground_data, width, height, theme, seed=42, weights=None):
+    """
+    Overlay the theme's deco tiles on a ground layer with Poisson-disk spacing.
+
+    Uses the same sampler as the Decorations layer at the table's deco_spacing,
+    so deco tiles neither clump together nor leave large bare patches. Seeded
+    separately from the Decorations layer. Returns a new data list.
+    """
+    table = weights or GROUND_WEIGHTS[theme]
+    data = list(ground_data)
+    if not table['deco']:
+        return data
+    rng = random.Random(f"ground-deco-{seed}")
+    for x, y in poisson_disk_sample(width, height, table['deco_spacing'], rng):
+        data[int(y) * width + int(x)] = rng.choice(table['deco'])
+    return data
+
+
+def dilate(mask, radius):
+    """Grow a boolean (h, w) mask by `radius` tiles in every direction (square neighborhood)."""
+    # Separable: OR shifted slices along rows, then along columns
+    rows = mask.copy()
+    for d in range(1, radius + 1):
+        rows[d:] |= mask[:-d]
+        rows[:-d] |= mask[d:]
+    out = rows.copy()
+    for d in range(1, radius + 1):
+        out[:, d:] |= rows[:, :-d]
+        out[:, :-d] |= rows[:, d:]
+    return out
+
+
+def make_decorations_layer(walls_data, width, height, spawns=(), seed=42,
+                           min_spacing=DECO_MIN_SPACING):
+    """
+    Generate the Decorations layer with Poisson-disk spaced decoration tiles.
+
+    Samples are snapped to tiles and dropped if within DECO_WALL_CLEARANCE tiles
+    of a wall or rock, or within DECO_SPAWN_CLEARANCE tiles of a spawn point
+    (spawns given in pixel coords). Seeded, so output is reproducible.
+    """
+    # Clearance around solid tiles (walls + rocks)
+    solid = np.asarray(walls_data).reshape(height, width) != 0
+    blocked = dilate(solid, DECO_WALL_CLEARANCE)
+
+    # Clearance around spawn points
+    spawn_tiles = np.zeros((height, width), dtype=bool)
+    for px, py in spawns:
+        sx, sy = int(px) // TILE, int(py) // TILE
+        if 0 <= sx < width and 0 <= sy < height:
+            spawn_tiles[sy, sx] = True
+    blocked |= dilate(spawn_tiles, DECO_SPAWN_CLEARANCE)
+    blocked = blocked.reshape(-1)
+
+    rng = random.Random(seed)
+    data = [0] * (width * height)
+    for x, y in poisson_disk_sample(width, height, min_spacing, rng):
+        idx = int(y) * width + int(x)
+        if not blocked[idx]:
+            data[idx] = rng.choice(DECORATION_IDS)
     return data
 
 
@@ -701,9 +909,35 @@ def layout_timber_yard(data, w, h, rc):
 # Map JSON generation
 # ============================================================
 
+def map_properties(map_path):
+    """Custom properties of an existing map JSON (empty if the map does not exist yet)."""
+    try:
+        with open(map_path) as f:
+            return json.load(f).get("properties", [])
+    except FileNotFoundError:
+        return []
+
+
+def spawn_points(properties):
+    """Pixel coords of every spawn in a map's spawnPoints property (paran + guardians)."""
+    for prop in properties:
+        if prop["name"] == "spawnPoints":
+            spawns = json.loads(prop["value"])
+            points = [spawns["paran"]] + spawns.get("guardians", [])
+            return [(p["x"], p["y"]) for p in points]
+    return []
+
+
 def generate_map_json(theme, layout_fn, output_path, rules, seed=42, rock_seed=1):
-    """Generate a 3-layer Tiled-compatible map JSON file with unified tileset."""
+    """
+    Generate a 4-layer Tiled-compatible map JSON file with unified tileset.
+
+    The authored map of the same name in MAPS_DIR supplies the custom
+    properties, and decorations keep clear of its spawnPoints.
+    """
     theme_offset = THEME_OFFSETS[theme]
+    properties = map_properties(os.path.join(MAPS_DIR, os.path.basename(output_path)))
+    spawns = spawn_points(properties)
 
     # Choose rock variants for this map (different per map for variety)
     rng = random.Random(rock_seed)
@@ -722,8 +956,12 @@ def generate_map_json(theme, layout_fn, output_path, rules, seed=42, rock_seed=1
     # Generate front faces layer from resolved walls
     fronts_data = generate_front_faces(walls_data, MAP_W, MAP_H, theme_offset)
 
-    # Generate ground layer with theme-specific floor tiles
+    # Generate ground layer with theme-specific floor tiles, then spaced deco tiles
     ground_data = make_ground_layer(MAP_W, MAP_H, theme, seed=seed)
+    ground_data = scatter_ground_deco(ground_data, MAP_W, MAP_H, theme, seed=seed)
+
+    # Scatter decorations clear of walls, rocks and spawn points
+    deco_data = make_decorations_layer(walls_data, MAP_W, MAP_H, spawns=spawns, seed=seed)
 
     # Ground terrain shows through transparent parts of wall/rock sprites
 
@@ -739,7 +977,7 @@ def generate_map_json(theme, layout_fn, output_path, rules, seed=42, rock_seed=1
         "type": "map",
         "version": "1.10",
         "infinite": False,
-        "nextlayerid": 4,
+        "nextlayerid": 5,
         "nextobjectid": 1,
         "tilesets": [
             {
@@ -769,6 +1007,18 @@ def generate_map_json(theme, layout_fn, output_path, rules, seed=42, rock_seed=1
                 "x": 0,
                 "y": 0
             },
+            {
+                "data": deco_data,
+                "height": MAP_H,
+                "id": 4,
+                "name": "Decorations",
+                "opacity": 1,
+                "type": "tilelayer",
+                "visible": True,
+                "width": MAP_W,
+                "x": 0,
+                "y": 0
+            },
             {
                 "data": fronts_data,
                 "height": MAP_H,
@@ -795,6 +1045,8 @@ def generate_map_json(theme, layout_fn, output_path, rules, seed=42, rock_seed=1
             }
         ]
     }
+    if properties:
+        map_json["properties"] = properties
 
     with open(output_path, "w") as f:
         json.dump(map_json, f, indent=2)
@@ -806,10 +1058,19 @@ def generate_map_json(theme, layout_fn, output_path, rules, seed=42, rock_seed=1
     obstacle_count = sum(1 for t in walls_data if t in OBSTACLE_IDS)
     front_count = sum(1 for t in fronts_data if t != 0)
     empty_count = sum(1 for t in walls_data if t == 0)
-    print(f"  Created {output_path} ({MAP_W}x{MAP_H}, walls={wall_count}, obstacles={obstacle_count}, fronts={front_count}, open={empty_count})")
+    deco_count = sum(1 for t in deco_data if t != 0)
+    print(f"  Created {output_path} ({MAP_W}x{MAP_H}, walls={wall_count}, obstacles={obstacle_count}, fronts={front_count}, decorations={deco_count}, open={empty_count})")
     print(f"    Rock choices: heavy={rock_choices['heavy']}, medium={rock_choices['medium']}, light={rock_choices['light']}")
 
 
+def get_layer_data(map_json, layer_name):
+    """Return the data array of a named tile layer in a map JSON."""
+    for layer in map_json["layers"]:
+        if layer["name"] == layer_name:
+            return layer["data"]
+    raise KeyError(f"Layer {layer_name!r} not found")
+
+
 def verify_no_sealed_rooms(data, w, h):
     """
     Verify all open spaces are reachable from each other using flood fill.
@@ -927,10 +1188,10 @@ def validate_spawns():
 
     all_pass = True
     for map_name, roles in map_spawns.items():
-        map_path = os.path.join(MAPS_DIR, f"{map_name}.json")
+        map_path = os.path.join(GENERATED_MAPS_DIR, f"{map_name}.json")
         with open(map_path) as f:
             d = json.load(f)
-        walls = d["layers"][2]["data"]
+        walls = get_layer_data(d, "Walls")
         w = d["width"]
         h = d["height"]
 
@@ -973,10 +1234,20 @@ def validate_spawns():
 # Main
 # ============================================================
 
-if __name__ == "__main__":
+def main(write_tileset=True):
+    """
+    Build the unified tileset and the three arena maps.
+
+    Returns the 8x44 tileset image. With write_tileset=False it is only kept
+    in memory, for a pipeline that appends decorations and extrudes it
+    before anything is written.
+    """
     print("Generating arena assets (unified tileset)...")
     print()
 
+    os.makedirs(TILESETS_DIR, exist_ok=True)
+    os.makedirs(GENERATED_MAPS_DIR, exist_ok=True)
+
     print("[1/3] Loading source images + auto-tile rules...")
     ground_img, hedge_img, brick_img, wood_img, rocks = load_source_images()
     rules = load_autotile_rules()
@@ -988,38 +1259,37 @@ if __name__ == "__main__":
     print()
     print("[2/3] Generating unified tileset (256x1408, 8x44 grid)...")
     print()
-    create_unified_tileset(
+    tileset = create_unified_tileset(
         hedge_img, brick_img, wood_img, ground_img, rocks,
-        os.path.join(TILESETS_DIR, "arena_unified.png")
+        os.path.join(TILESETS_DIR, "arena_unified.png") if write_tileset else None
     )
 
     print()
-    print("[3/3] Generating 3-layer map JSONs (Ground + WallFronts + Walls)...")
+    print("[3/3] Generating 4-layer map JSONs (Ground + Decorations + WallFronts + Walls)...")
     print()
     generate_map_json(
         "hedge", layout_hedge_garden,
-        os.path.join(MAPS_DIR, "hedge_garden.json"),
+        os.path.join(GENERATED_MAPS_DIR, "hedge_garden.json"),
         rules, seed=100, rock_seed=10
     )
     generate_map_json(
         "brick", layout_brick_fortress,
-        os.path.join(MAPS_DIR, "brick_fortress.json"),
+        os.path.join(GENERATED_MAPS_DIR, "brick_fortress.json"),
         rules, seed=200, rock_seed=20
     )
     generate_map_json(
         "wood", layout_timber_yard,
-        os.path.join(MAPS_DIR, "timber_yard.json"),
+        os.path.join(GENERATED_MAPS_DIR, "timber_yard.json"),
         rules, seed=300, rock_seed=30
     )
 
     print()
     print("  --- Verifying map connectivity ---")
     for map_name in ["hedge_garden", "brick_fortress", "timber_yard"]:
-        map_path = os.path.join(MAPS_DIR, f"{map_name}.json")
+        map_path = os.path.join(GENERATED_MAPS_DIR, f"{map_name}.json")
         with open(map_path) as f:
             d = json.load(f)
-        # Walls layer is the 3rd layer (index 2)
-        walls = d["layers"][2]["data"]
+        walls = get_layer_data(d, "Walls")
         ok = verify_no_sealed_rooms(walls, MAP_W, MAP_H)
         print(f"  {map_name}: {'PASS - all areas reachable' if ok else 'FAIL - sealed rooms found'}")
 
@@ -1029,3 +1299,8 @@ if __name__ == "__main__":
 
     print()
     print("All arena assets generated successfully!")
+    return tileset
+
+
+if __name__ == "__main__":
+    main()
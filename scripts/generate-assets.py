@@ -8,9 +8,20 @@ Produces: 3 character spritesheets (64x64 frames, 36 frames each),
 
 Characters are 2x resolution with richer detail (shading, limbs, eyes).
 Tilesets stay at 1x (camera zoom=2 handles visual upscaling).
+
+Character, projectile and particle recipes are drawn on the 2x design grid
+and scaled to every density in DENSITIES: 2x is written to the usual paths
+(paran.png, ...), other densities get an @<n>x suffix (paran@1x.png,
+paran@3x.png), and sprites/densities.json lists every sheet and frame size
+per density so the client can pick one at boot.
+
+Drawing goes to an array-backed Canvas (NumPy); PIL only encodes the PNGs.
 """
 
 from PIL import Image, ImageDraw
+import numpy as np
+import functools
+import json
 import os
 import math
 
@@ -19,15 +30,54 @@ PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 SPRITES_DIR = os.path.join(PROJECT_ROOT, "client", "public", "sprites")
 TILESETS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "tilesets")
 
-os.makedirs(SPRITES_DIR, exist_ok=True)
-os.makedirs(TILESETS_DIR, exist_ok=True)
-
 # ============================================================
 # Frame size constants
 # ============================================================
-FRAME_SIZE = 64  # Character frame size (2x)
-PROJ_SIZE = 16   # Projectile frame size (2x)
-TILE_SIZE = 32   # Tileset tile size (stays 1x)
+DESIGN_FRAME_SIZE = 64  # Character frame size on the 2x design grid
+DESIGN_PROJ_SIZE = 16   # Projectile frame size on the 2x design grid
+TILE_SIZE = 32          # Tileset tile size (stays 1x)
+
+# ============================================================
+# Output density
+# ============================================================
+# Drawing recipes use 2x design-grid coordinates. SCALE maps them to the
+# density being generated (0.5 for 1x, 1.0 for 2x, 1.5 for 3x); at 2x the
+# mapping is the identity. Use set_density() to switch.
+DESIGN_DENSITY = 2
+DENSITIES = [1, 2, 3]
+
+SCALE = 1.0
+FRAME_SIZE = DESIGN_FRAME_SIZE  # Character frame size at the current density
+PROJ_SIZE = DESIGN_PROJ_SIZE    # Projectile/particle size at the current density
+
+
+def set_density(density):
+    """Scale all following sprite drawing to `density` (1 = 1x, 2 = the design grid, 3 = 3x)."""
+    global SCALE, FRAME_SIZE, PROJ_SIZE
+    SCALE = density / DESIGN_DENSITY
+    FRAME_SIZE = max(1, math.floor(DESIGN_FRAME_SIZE * SCALE))
+    PROJ_SIZE = max(1, math.floor(DESIGN_PROJ_SIZE * SCALE))
+
+
+def density_suffix(density):
+    """Filename suffix for a density: none for the design density, '@<n>x' otherwise."""
+    return "" if density == DESIGN_DENSITY else f"@{density}x"
+
+
+def scale_span(a, b):
+    """
+    Map an inclusive design-grid span [a, b] to output pixels.
+
+    Spans keep at least one pixel when downscaled, so thin details
+    (outlines, 1px highlights) do not vanish at 1x.
+    """
+    if SCALE == 1.0:
+        return a, b
+    lo = math.floor(a * SCALE)
+    hi = math.floor((b + 1) * SCALE) - 1
+    if b >= a:
+        hi = max(hi, lo)
+    return lo, hi
 
 # ============================================================
 # Color palette
@@ -61,31 +111,191 @@ EYE_PUPIL = (20, 20, 30, 255)
 SKIN_TONE = (220, 180, 140, 255)
 
 
+# ============================================================
+# Canvas
+# ============================================================
+class Canvas:
+    """
+    Array-backed RGBA drawing surface.
+
+    Pixels live in an (h, w, 4) uint8 array (`px`) with a (h, w) uint32 view of
+    the same memory (`px32`, one packed RGBA value per pixel), so fills are
+    single scalar slice assignments. PIL is only involved at save time
+    (to_image/save). Like ImageDraw on an RGBA image, every primitive
+    overwrites pixels instead of blending.
+    """
+
+    def __init__(self, width, height, color=TRANSPARENT, px=None):
+        if px is None:
+            px = np.zeros((height, width, 4), dtype=np.uint8)
+            if color != TRANSPARENT:
+                px[:] = color
+        self.set_pixels(px)
+
+    def set_pixels(self, px):
+        """Replace the pixel buffer with a C-contiguous (h, w, 4) uint8 array."""
+        self.px = np.ascontiguousarray(px, dtype=np.uint8)
+        self.px32 = self.px.view(np.uint32)[:, :, 0]
+
+    @property
+    def width(self):
+        return self.px.shape[1]
+
+    @property
+    def height(self):
+        return self.px.shape[0]
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    def copy(self):
+        return Canvas(0, 0, px=self.px.copy())
+
+    def transpose(self, method):
+        """Mirror the canvas; only Image.FLIP_LEFT_RIGHT is supported."""
+        if method != Image.FLIP_LEFT_RIGHT:
+            raise ValueError(f"Unsupported transpose: {method}")
+        return Canvas(0, 0, px=self.px[:, ::-1].copy())
+
+    def fill(self, x1, y1, x2, y2, color, mask=None):
+        """
+        Fill the inclusive rect (x1, y1)-(x2, y2), clipped to the canvas.
+
+        With a boolean mask shaped like the unclipped rect, only masked pixels are set.
+        """
+        h, w = self.px32.shape
+        cx1 = x1 if x1 > 0 else 0
+        cy1 = y1 if y1 > 0 else 0
+        cx2 = x2 if x2 < w else w - 1
+        cy2 = y2 if y2 < h else h - 1
+        if cx1 > cx2 or cy1 > cy2:
+            return
+        region = self.px32[cy1:cy2 + 1, cx1:cx2 + 1]
+        if mask is None:
+            region[:] = pack_color(color)
+        else:
+            np.copyto(region, pack_color(color), where=mask[cy1 - y1:cy2 - y1 + 1, cx1 - x1:cx2 - x1 + 1])
+
+    def paste(self, other, xy):
+        """Copy another canvas in at (x, y)."""
+        x, y = xy
+        self.px[y:y + other.height, x:x + other.width] = other.px
+
+    def pixels32(self):
+        """Flat view of px32 (for scatter writes)."""
+        return self.px32.reshape(-1)
+
+    def to_image(self):
+        return Image.fromarray(self.px, "RGBA")
+
+    def save(self, path):
+        self.to_image().save(path)
+
+
+@functools.lru_cache(maxsize=None)
+def pack_color(color):
+    """Pack an RGBA tuple into the uint32 layout of Canvas.px32."""
+    return np.array(color, dtype=np.uint8).view(np.uint32)[0]
+
+
+@functools.lru_cache(maxsize=None)
+def ellipse_mask(width, height):
+    """Boolean coverage of a filled ellipse spanning a width x height box, as PIL rasterizes it."""
+    mask = Image.new("L", (width, height), 0)
+    ImageDraw.Draw(mask).ellipse([0, 0, width - 1, height - 1], fill=255)
+    return np.asarray(mask) > 0
+
+
 # ============================================================
 # Drawing helpers
 # ============================================================
 def draw_pixel(img, x, y, color):
-    """Draw a single pixel (safe bounds check)."""
-    if 0 <= x < img.width and 0 <= y < img.height:
-        img.putpixel((x, y), color)
+    """Draw a single design-grid pixel (safe bounds check)."""
+    h, w = img.px32.shape
+    if SCALE == 1.0:
+        if 0 <= x < w and 0 <= y < h:
+            img.px32[y, x] = pack_color(color)
+        return
+    x1, x2 = scale_span(x, x)
+    y1, y2 = scale_span(y, y)
+    if 0 <= x1 < w and 0 <= y1 < h:
+        img.fill(x1, y1, x2, y2, color)
+
+
+def scatter_pixels(img, strokes):
+    """
+    Draw many design-grid pixels at once.
+
+    `strokes` is a list of (xs, ys, colors, mask) tuples over the same n
+    points: colors is one RGBA tuple or an (n, 4) array, and mask (or None)
+    selects the points a stroke draws. Pixels land point by point, strokes in
+    list order, exactly as the equivalent nested draw_pixel loop would draw them.
+    """
+    h, w = img.px.shape[:2]
+    n_strokes = len(strokes)
+    xs_all, ys_all, keys_all, colors_all = [], [], [], []
+    for s, (xs, ys, colors, mask) in enumerate(strokes):
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        colors = np.broadcast_to(np.asarray(colors, dtype=np.uint8), (len(xs), 4))
+        keys = np.arange(len(xs)) * n_strokes + s
+        if mask is not None:
+            xs, ys, colors, keys = xs[mask], ys[mask], colors[mask], keys[mask]
+        xs_all.append(xs)
+        ys_all.append(ys)
+        keys_all.append(keys)
+        colors_all.append(np.ascontiguousarray(colors).view(np.uint32).reshape(-1))
+
+    xs = np.concatenate(xs_all)
+    ys = np.concatenate(ys_all)
+    keys = np.concatenate(keys_all)
+    values = np.concatenate(colors_all)
+
+    # Design pixel -> inclusive output span (at least one pixel), as scale_span does
+    x1 = np.floor(xs * SCALE).astype(np.int64)
+    y1 = np.floor(ys * SCALE).astype(np.int64)
+    x2 = np.maximum(np.floor((xs + 1) * SCALE).astype(np.int64) - 1, x1)
+    y2 = np.maximum(np.floor((ys + 1) * SCALE).astype(np.int64) - 1, y1)
+    inside = (x1 >= 0) & (x1 < w) & (y1 >= 0) & (y1 < h)
+
+    out_x, out_y, out_keys, out_values = [], [], [], []
+    for dy in range(int((y2 - y1).max(initial=0)) + 1):
+        for dx in range(int((x2 - x1).max(initial=0)) + 1):
+            sel = inside & (x1 + dx <= np.minimum(x2, w - 1)) & (y1 + dy <= np.minimum(y2, h - 1))
+            out_x.append(x1[sel] + dx)
+            out_y.append(y1[sel] + dy)
+            out_keys.append(keys[sel])
+            out_values.append(values[sel])
+    keys = np.concatenate(out_keys)
+    order = np.argsort(keys, kind="stable")
+    flat = (np.concatenate(out_y) * w + np.concatenate(out_x))[order]
+    img.pixels32()[flat] = np.concatenate(out_values)[order]
 
 
 def draw_rect(img, x1, y1, x2, y2, color):
     """Draw filled rectangle (x2, y2 inclusive)."""
-    draw = ImageDraw.Draw(img)
-    draw.rectangle([x1, y1, x2, y2], fill=color)
+    x1, x2 = scale_span(x1, x2)
+    y1, y2 = scale_span(y1, y2)
+    img.fill(x1, y1, x2, y2, color)
 
 
 def draw_ellipse(img, x1, y1, x2, y2, color):
     """Draw filled ellipse."""
-    draw = ImageDraw.Draw(img)
-    draw.ellipse([x1, y1, x2, y2], fill=color)
+    x1, x2 = scale_span(x1, x2)
+    y1, y2 = scale_span(y1, y2)
+    if x2 < x1 or y2 < y1:
+        return
+    img.fill(x1, y1, x2, y2, color, ellipse_mask(x2 - x1 + 1, y2 - y1 + 1))
 
 
 def draw_line(img, x1, y1, x2, y2, color):
-    """Draw a line between two points."""
-    draw = ImageDraw.Draw(img)
-    draw.line([(x1, y1), (x2, y2)], fill=color, width=1)
+    """Draw a line between two points (rasterized by PIL; only the tilesets use lines)."""
+    def pt(v):
+        return math.floor((v + 0.5) * SCALE)
+    image = img.to_image()
+    ImageDraw.Draw(image).line([(pt(x1), pt(y1)), (pt(x2), pt(y2))], fill=color, width=max(1, round(SCALE)))
+    img.set_pixels(np.array(image))
 
 
 def fill_gradient_v(img, x1, y1, x2, y2, color_top, color_bottom):
@@ -93,23 +303,80 @@ def fill_gradient_v(img, x1, y1, x2, y2, color_top, color_bottom):
     h = y2 - y1
     if h <= 0:
         return
-    for dy in range(h + 1):
-        t = dy / max(h, 1)
-        r = int(color_top[0] + (color_bottom[0] - color_top[0]) * t)
-        g = int(color_top[1] + (color_bottom[1] - color_top[1]) * t)
-        b = int(color_top[2] + (color_bottom[2] - color_top[2]) * t)
-        a = int(color_top[3] + (color_bottom[3] - color_top[3]) * t)
-        draw_rect(img, x1, y1 + dy, x2, y1 + dy, (r, g, b, a))
+    colors = blend_color(color_top, color_bottom, np.arange(h + 1) / max(h, 1))
+
+    # Each design row covers [lo, hi] output rows; where spans overlap the later row wins
+    design_rows = y1 + np.arange(h + 1)
+    lo = np.floor(design_rows * SCALE).astype(np.int64)
+    hi = np.maximum(np.floor((design_rows + 1) * SCALE).astype(np.int64) - 1, lo)
+    ry1 = max(int(lo[0]), 0)
+    ry2 = min(int(hi[-1]), img.height - 1)
+    cx1, cx2 = scale_span(x1, x2)
+    cx1 = max(cx1, 0)
+    cx2 = min(cx2, img.width - 1)
+    if ry1 > ry2 or cx1 > cx2:
+        return
+    src = np.searchsorted(lo, np.arange(ry1, ry2 + 1), side="right") - 1
+    img.px[ry1:ry2 + 1, cx1:cx2 + 1] = colors[src][:, None, :]
 
 
-def create_frame(size=FRAME_SIZE):
-    """Create a blank RGBA frame."""
-    return Image.new("RGBA", (size, size), TRANSPARENT)
+def dissolve_grid(step, size=DESIGN_FRAME_SIZE):
+    """Design-grid points (0, 0), (0, step), ... of a death dissolve, flattened x-major like nested x/y loops."""
+    px, py = np.meshgrid(np.arange(0, size, step), np.arange(0, size, step), indexing="ij")
+    return px.ravel(), py.ravel()
+
+
+def create_frame(size=None):
+    """Create a blank RGBA frame (FRAME_SIZE at the current density by default)."""
+    size = size or FRAME_SIZE
+    return Canvas(size, size)
 
 
 def blend_color(c1, c2, t):
-    """Blend two RGBA colors by factor t (0=c1, 1=c2)."""
-    return tuple(int(c1[i] + (c2[i] - c1[i]) * t) for i in range(4))
+    """
+    Blend two RGBA colors by factor t (0=c1, 1=c2).
+
+    With an array of factors, returns an (n, 4) uint8 array of colors.
+    """
+    c1 = np.asarray(c1, dtype=np.float64)
+    c2 = np.asarray(c2, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+    out = (c1 + (c2 - c1) * t[..., None]).astype(np.int64)  # Truncates like int()
+    if out.ndim == 1:
+        return tuple(int(v) for v in out)
+    return out.astype(np.uint8)
+
+
+# ============================================================
+# Layer cache
+# ============================================================
+# Body and leg layers repeat across most of a character's 36 frames.
+# draw_layer() rasterizes each distinct (draw function, arguments, density)
+# combination once on a blank frame and pastes it into later frames.
+_LAYER_CACHE = {}
+
+
+def cached_layer(draw_fn, **kwargs):
+    """
+    Return (pixel indices, packed RGBA values) covered by draw_fn on a blank frame.
+
+    Each layer is rasterized once per density.
+    """
+    key = (draw_fn.__name__, SCALE, FRAME_SIZE, tuple(sorted(kwargs.items())))
+    if key not in _LAYER_CACHE:
+        layer = create_frame()
+        draw_fn(layer, **kwargs)
+        # Primitives overwrite rather than blend, and layer colors are never fully
+        # transparent, so every covered pixel replaces whatever is below it
+        covered = np.flatnonzero(layer.px[:, :, 3])
+        _LAYER_CACHE[key] = (covered, layer.pixels32()[covered])
+    return _LAYER_CACHE[key]
+
+
+def draw_layer(frame, draw_fn, **kwargs):
+    """Same result as draw_fn(frame, **kwargs), served from the layer cache."""
+    covered, values = cached_layer(draw_fn, **kwargs)
+    frame.pixels32()[covered] = values
 
 
 # ============================================================
@@ -209,8 +476,8 @@ def generate_paran_frames():
     for i in range(6):
         f = create_frame()
         mouth = (i % 3) == 1  # mouth opens on some frames
-        draw_paran_body(f, y_off=0, mouth_open=mouth, facing="down")
-        draw_paran_legs(f, leg_phase=i)
+        draw_layer(f, draw_paran_body, y_off=0, mouth_open=mouth, facing="down")
+        draw_layer(f, draw_paran_legs, leg_phase=i)
         if i in (2, 3, 4):
             draw_paran_speed_streaks(f, "down", intensity=1)
         frames.append(f)
@@ -218,8 +485,8 @@ def generate_paran_frames():
     # Walk Up: frames 6-11 (6 frames)
     for i in range(6):
         f = create_frame()
-        draw_paran_body(f, y_off=0, facing="up")
-        draw_paran_legs(f, leg_phase=i)
+        draw_layer(f, draw_paran_body, y_off=0, facing="up")
+        draw_layer(f, draw_paran_legs, leg_phase=i)
         if i in (2, 3, 4):
             draw_paran_speed_streaks(f, "up", intensity=1)
         frames.append(f)
@@ -227,8 +494,8 @@ def generate_paran_frames():
     # Walk Right: frames 12-17 (6 frames)
     for i in range(6):
         f = create_frame()
-        draw_paran_body(f, y_off=0, facing="right")
-        draw_paran_legs(f, leg_phase=i)
+        draw_layer(f, draw_paran_body, y_off=0, facing="right")
+        draw_layer(f, draw_paran_legs, leg_phase=i)
         if i in (2, 3, 4):
             draw_paran_speed_streaks(f, "right", intensity=1)
         frames.append(f)
@@ -241,35 +508,35 @@ def generate_paran_frames():
     # Idle: frames 24-26 (3 frames, breathing/bobbing)
     # Frame 24: neutral
     f = create_frame()
-    draw_paran_body(f, y_off=0, facing="idle")
-    draw_paran_legs(f, leg_phase=0)
+    draw_layer(f, draw_paran_body, y_off=0, facing="idle")
+    draw_layer(f, draw_paran_legs, leg_phase=0)
     frames.append(f)
 
     # Frame 25: body up 1-2px (inhale)
     f = create_frame()
-    draw_paran_body(f, y_off=-2, facing="idle")
-    draw_paran_legs(f, leg_phase=0, y_off=0)
+    draw_layer(f, draw_paran_body, y_off=-2, facing="idle")
+    draw_layer(f, draw_paran_legs, leg_phase=0, y_off=0)
     frames.append(f)
 
     # Frame 26: neutral/down (exhale)
     f = create_frame()
-    draw_paran_body(f, y_off=1, facing="idle")
-    draw_paran_legs(f, leg_phase=0, y_off=1)
+    draw_layer(f, draw_paran_body, y_off=1, facing="idle")
+    draw_layer(f, draw_paran_legs, leg_phase=0, y_off=1)
     frames.append(f)
 
     # Shoot: frames 27-29 (3 frames, energy emanation)
     # Frame 27: windup
     f = create_frame()
-    draw_paran_body(f, y_off=0, facing="down")
-    draw_paran_legs(f, leg_phase=0)
+    draw_layer(f, draw_paran_body, y_off=0, facing="down")
+    draw_layer(f, draw_paran_legs, leg_phase=0)
     # Small energy at mouth
     draw_rect(f, 28, 6, 36, 10, PARAN_ACCENT)
     frames.append(f)
 
     # Frame 28: energy burst
     f = create_frame()
-    draw_paran_body(f, y_off=0, facing="down")
-    draw_paran_legs(f, leg_phase=0)
+    draw_layer(f, draw_paran_body, y_off=0, facing="down")
+    draw_layer(f, draw_paran_legs, leg_phase=0)
     # Big energy flash
     draw_ellipse(f, 22, 0, 42, 12, (255, 240, 150, 255))
     draw_ellipse(f, 26, 2, 38, 8, (255, 255, 220, 255))
@@ -277,8 +544,8 @@ def generate_paran_frames():
 
     # Frame 29: energy dissipate
     f = create_frame()
-    draw_paran_body(f, y_off=0, facing="down")
-    draw_paran_legs(f, leg_phase=0)
+    draw_layer(f, draw_paran_body, y_off=0, facing="down")
+    draw_layer(f, draw_paran_legs, leg_phase=0)
     draw_ellipse(f, 24, 0, 40, 8, (255, 230, 100, 180))
     frames.append(f)
 
@@ -306,12 +573,12 @@ def generate_paran_frames():
         else:
             # Scattered pixel dissolution
             step = 3 + i
-            for px in range(0, 64, step):
-                for py in range(0, 64, step):
-                    c = body_c if (px + py) % 2 == 0 else accent_c
-                    draw_pixel(f, px + (i % 3), py + (i % 2), c)
-                    if (px + py) % 4 == 0:
-                        draw_pixel(f, px + 1, py + 1, light_c)
+            px, py = dissolve_grid(step)
+            colors = np.where(((px + py) % 2 == 0)[:, None], body_c, accent_c)
+            scatter_pixels(f, [
+                (px + (i % 3), py + (i % 2), colors, None),
+                (px + 1, py + 1, light_c, (px + py) % 4 == 0),
+            ])
         frames.append(f)
 
     return frames
@@ -401,22 +668,22 @@ def generate_faran_frames():
     # Walk Down: frames 0-5
     for i in range(6):
         f = create_frame()
-        draw_faran_body(f, facing="down")
-        draw_faran_legs(f, leg_phase=i)
+        draw_layer(f, draw_faran_body, facing="down")
+        draw_layer(f, draw_faran_legs, leg_phase=i)
         frames.append(f)
 
     # Walk Up: frames 6-11
     for i in range(6):
         f = create_frame()
-        draw_faran_body(f, facing="up")
-        draw_faran_legs(f, leg_phase=i)
+        draw_layer(f, draw_faran_body, facing="up")
+        draw_layer(f, draw_faran_legs, leg_phase=i)
         frames.append(f)
 
     # Walk Right: frames 12-17
     for i in range(6):
         f = create_frame()
-        draw_faran_body(f, facing="right")
-        draw_faran_legs(f, leg_phase=i)
+        draw_layer(f, draw_faran_body, facing="right")
+        draw_layer(f, draw_faran_legs, leg_phase=i)
         frames.append(f)
 
     # Walk Left: frames 18-23 - mirror of right
@@ -427,33 +694,33 @@ def generate_faran_frames():
     # Idle: frames 24-26 (breathing)
     # Frame 24: neutral
     f = create_frame()
-    draw_faran_body(f, facing="idle")
-    draw_faran_legs(f, leg_phase=0)
+    draw_layer(f, draw_faran_body, facing="idle")
+    draw_layer(f, draw_faran_legs, leg_phase=0)
     frames.append(f)
 
     # Frame 25: up (inhale)
     f = create_frame()
-    draw_faran_body(f, y_off=-2, facing="idle")
-    draw_faran_legs(f, leg_phase=0, y_off=0)
+    draw_layer(f, draw_faran_body, y_off=-2, facing="idle")
+    draw_layer(f, draw_faran_legs, leg_phase=0, y_off=0)
     frames.append(f)
 
     # Frame 26: down (exhale)
     f = create_frame()
-    draw_faran_body(f, y_off=1, facing="idle")
-    draw_faran_legs(f, leg_phase=0, y_off=1)
+    draw_layer(f, draw_faran_body, y_off=1, facing="idle")
+    draw_layer(f, draw_faran_legs, leg_phase=0, y_off=1)
     frames.append(f)
 
     # Shoot: frames 27-29 (arm extension / dart throw)
     # Frame 27: windup - arm back
     f = create_frame()
-    draw_faran_body(f, facing="down", arm_extend=-3)
-    draw_faran_legs(f, leg_phase=0)
+    draw_layer(f, draw_faran_body, facing="down", arm_extend=-3)
+    draw_layer(f, draw_faran_legs, leg_phase=0)
     frames.append(f)
 
     # Frame 28: throw - arm forward with energy
     f = create_frame()
-    draw_faran_body(f, facing="down", arm_extend=4)
-    draw_faran_legs(f, leg_phase=0)
+    draw_layer(f, draw_faran_body, facing="down", arm_extend=4)
+    draw_layer(f, draw_faran_legs, leg_phase=0)
     # Dart/energy at top
     draw_rect(f, 28, 0, 36, 6, FARAN_ACCENT)
     draw_rect(f, 30, 2, 34, 4, (255, 180, 180, 255))
@@ -461,8 +728,8 @@ def generate_faran_frames():
 
     # Frame 29: follow through
     f = create_frame()
-    draw_faran_body(f, facing="down", arm_extend=2)
-    draw_faran_legs(f, leg_phase=0)
+    draw_layer(f, draw_faran_body, facing="down", arm_extend=2)
+    draw_layer(f, draw_faran_legs, leg_phase=0)
     draw_rect(f, 29, 0, 35, 4, (255, 120, 120, 180))
     frames.append(f)
 
@@ -492,12 +759,12 @@ def generate_faran_frames():
         else:
             # Smoke/scatter
             step = 3 + i
-            for px in range(0, 64, step):
-                for py in range(0, 64, step):
-                    c = body_c if (px + py) % 3 == 0 else accent_c
-                    draw_pixel(f, px + (i % 3), py + (i % 2), c)
-                    if (px + py) % 5 == 0:
-                        draw_pixel(f, px + 1, py, dark_c)
+            px, py = dissolve_grid(step)
+            colors = np.where(((px + py) % 3 == 0)[:, None], body_c, accent_c)
+            scatter_pixels(f, [
+                (px + (i % 3), py + (i % 2), colors, None),
+                (px + 1, py, dark_c, (px + py) % 5 == 0),
+            ])
         frames.append(f)
 
     return frames
@@ -595,22 +862,22 @@ def generate_baran_frames():
     # Walk Down: frames 0-5
     for i in range(6):
         f = create_frame()
-        draw_baran_body(f, facing="down")
-        draw_baran_legs(f, leg_phase=i)
+        draw_layer(f, draw_baran_body, facing="down")
+        draw_layer(f, draw_baran_legs, leg_phase=i)
         frames.append(f)
 
     # Walk Up: frames 6-11
     for i in range(6):
         f = create_frame()
-        draw_baran_body(f, facing="up")
-        draw_baran_legs(f, leg_phase=i)
+        draw_layer(f, draw_baran_body, facing="up")
+        draw_layer(f, draw_baran_legs, leg_phase=i)
         frames.append(f)
 
     # Walk Right: frames 12-17
     for i in range(6):
         f = create_frame()
-        draw_baran_body(f, facing="right")
-        draw_baran_legs(f, leg_phase=i)
+        draw_layer(f, draw_baran_body, facing="right")
+        draw_layer(f, draw_baran_legs, leg_phase=i)
         frames.append(f)
 
     # Walk Left: frames 18-23 - mirror of right
@@ -620,31 +887,31 @@ def generate_baran_frames():
 
     # Idle: frames 24-26 (breathing)
     f = create_frame()
-    draw_baran_body(f, facing="idle")
-    draw_baran_legs(f, leg_phase=0)
+    draw_layer(f, draw_baran_body, facing="idle")
+    draw_layer(f, draw_baran_legs, leg_phase=0)
     frames.append(f)
 
     f = create_frame()
-    draw_baran_body(f, y_off=-2, facing="idle")
-    draw_baran_legs(f, leg_phase=0, y_off=0)
+    draw_layer(f, draw_baran_body, y_off=-2, facing="idle")
+    draw_layer(f, draw_baran_legs, leg_phase=0, y_off=0)
     frames.append(f)
 
     f = create_frame()
-    draw_baran_body(f, y_off=1, facing="idle")
-    draw_baran_legs(f, leg_phase=0, y_off=1)
+    draw_layer(f, draw_baran_body, y_off=1, facing="idle")
+    draw_layer(f, draw_baran_legs, leg_phase=0, y_off=1)
     frames.append(f)
 
     # Shoot: frames 27-29 (arm raise + energy blast)
     # Frame 27: arms raising
     f = create_frame()
-    draw_baran_body(f, facing="down", arm_raise=3)
-    draw_baran_legs(f, leg_phase=0)
+    draw_layer(f, draw_baran_body, facing="down", arm_raise=3)
+    draw_layer(f, draw_baran_legs, leg_phase=0)
     frames.append(f)
 
     # Frame 28: energy burst above
     f = create_frame()
-    draw_baran_body(f, facing="down", arm_raise=6)
-    draw_baran_legs(f, leg_phase=0)
+    draw_layer(f, draw_baran_body, facing="down", arm_raise=6)
+    draw_layer(f, draw_baran_legs, leg_phase=0)
     # Green energy burst
     draw_ellipse(f, 22, 0, 42, 10, (100, 240, 130, 255))
     draw_ellipse(f, 26, 2, 38, 7, (180, 255, 200, 255))
@@ -652,8 +919,8 @@ def generate_baran_frames():
 
     # Frame 29: energy dissipate
     f = create_frame()
-    draw_baran_body(f, facing="down", arm_raise=2)
-    draw_baran_legs(f, leg_phase=0)
+    draw_layer(f, draw_baran_body, facing="down", arm_raise=2)
+    draw_layer(f, draw_baran_legs, leg_phase=0)
     draw_ellipse(f, 24, 0, 40, 6, (100, 230, 130, 160))
     frames.append(f)
 
@@ -684,12 +951,12 @@ def generate_baran_frames():
         else:
             # Scattered dissolution
             step = 3 + i
-            for px in range(0, 64, step):
-                for py in range(0, 64, step):
-                    c = body_c if (px + py) % 2 == 0 else accent_c
-                    draw_pixel(f, px + (i % 2), py + (i % 3), c)
-                    if (px * py) % 7 == 0:
-                        draw_pixel(f, px + 1, py + 1, dark_c)
+            px, py = dissolve_grid(step)
+            colors = np.where(((px + py) % 2 == 0)[:, None], body_c, accent_c)
+            scatter_pixels(f, [
+                (px + (i % 2), py + (i % 3), colors, None),
+                (px + 1, py + 1, dark_c, (px * py) % 7 == 0),
+            ])
         frames.append(f)
 
     return frames
@@ -698,26 +965,33 @@ def generate_baran_frames():
 # ============================================================
 # SPRITESHEET ASSEMBLY
 # ============================================================
-def assemble_spritesheet(frames, name, frame_size=FRAME_SIZE):
-    """Assemble frames into a horizontal strip spritesheet."""
+def assemble_spritesheet(frames, name, frame_size=None, density=DESIGN_DENSITY):
+    """Assemble frames into a horizontal strip spritesheet. Returns its densities.json entry."""
+    frame_size = frame_size or FRAME_SIZE
     count = len(frames)
-    sheet = Image.new("RGBA", (count * frame_size, frame_size), TRANSPARENT)
+    sheet = Canvas(count * frame_size, frame_size)
     for i, frame in enumerate(frames):
         sheet.paste(frame, (i * frame_size, 0))
-    path = os.path.join(SPRITES_DIR, f"{name}.png")
+    filename = f"{name}{density_suffix(density)}.png"
+    path = os.path.join(SPRITES_DIR, filename)
     sheet.save(path)
     print(f"  Created {path} ({count} frames, {count * frame_size}x{frame_size})")
+    return {"image": filename, "frameWidth": frame_size, "frameHeight": frame_size, "frameCount": count}
 
 
 # ============================================================
 # PROJECTILE SPRITESHEET - 3 frames at 16x16
 # ============================================================
-def generate_projectiles():
-    """Generate projectile spritesheet: paran(gold teardrop), faran(red dart), baran(green bolt)."""
-    sheet = Image.new("RGBA", (PROJ_SIZE * 3, PROJ_SIZE), TRANSPARENT)
+def generate_projectiles(density=DESIGN_DENSITY):
+    """
+    Generate projectile spritesheet: paran(gold teardrop), faran(red dart), baran(green bolt).
+
+    Returns its densities.json entry.
+    """
+    sheet = Canvas(PROJ_SIZE * 3, PROJ_SIZE)
 
     # Frame 0: Paran - gold energy teardrop
-    f0 = Image.new("RGBA", (PROJ_SIZE, PROJ_SIZE), TRANSPARENT)
+    f0 = Canvas(PROJ_SIZE, PROJ_SIZE)
     # Outer glow
     draw_ellipse(f0, 2, 1, 13, 14, (255, 200, 50, 150))
     # Main teardrop body
@@ -732,7 +1006,7 @@ def generate_projectiles():
     sheet.paste(f0, (0, 0))
 
     # Frame 1: Faran - red dart/shuriken
-    f1 = Image.new("RGBA", (PROJ_SIZE, PROJ_SIZE), TRANSPARENT)
+    f1 = Canvas(PROJ_SIZE, PROJ_SIZE)
     # Outer glow
     draw_ellipse(f1, 2, 2, 13, 13, (255, 68, 68, 120))
     # Elongated dart body
@@ -750,7 +1024,7 @@ def generate_projectiles():
     sheet.paste(f1, (PROJ_SIZE, 0))
 
     # Frame 2: Baran - green energy bolt
-    f2 = Image.new("RGBA", (PROJ_SIZE, PROJ_SIZE), TRANSPARENT)
+    f2 = Canvas(PROJ_SIZE, PROJ_SIZE)
     # Outer glow
     draw_ellipse(f2, 2, 2, 13, 13, (68, 204, 102, 120))
     # Square-ish bolt body
@@ -771,35 +1045,43 @@ def generate_projectiles():
     draw_rect(f2, 0, 7, 1, 8, (68, 204, 102, 60))
     sheet.paste(f2, (PROJ_SIZE * 2, 0))
 
-    path = os.path.join(SPRITES_DIR, "projectiles.png")
+    filename = f"projectiles{density_suffix(density)}.png"
+    path = os.path.join(SPRITES_DIR, filename)
     sheet.save(path)
     print(f"  Created {path} (3 frames, {PROJ_SIZE * 3}x{PROJ_SIZE})")
+    return {"image": filename, "frameWidth": PROJ_SIZE, "frameHeight": PROJ_SIZE, "frameCount": 3}
 
 
 # ============================================================
 # PARTICLE TEXTURE - 16x16 soft circle gradient
 # ============================================================
-def generate_particle():
-    """Generate 16x16 white circle particle with soft gradient edge."""
-    img = Image.new("RGBA", (PROJ_SIZE, PROJ_SIZE), TRANSPARENT)
+def generate_particle(density=DESIGN_DENSITY):
+    """
+    Generate a PROJ_SIZE white circle particle with soft gradient edge (16x16 at 2x).
+
+    Returns its densities.json entry.
+    """
+    img = Canvas(PROJ_SIZE, PROJ_SIZE)
     cx, cy = PROJ_SIZE // 2, PROJ_SIZE // 2
     max_r = PROJ_SIZE // 2
 
-    for y in range(PROJ_SIZE):
-        for x in range(PROJ_SIZE):
-            dx = x - cx + 0.5
-            dy = y - cy + 0.5
-            dist = math.sqrt(dx * dx + dy * dy)
-            if dist < max_r:
-                # Smooth gradient: bright center, fading to transparent edge
-                t = dist / max_r
-                alpha = int(255 * (1 - t * t))  # quadratic falloff
-                brightness = int(255 * (1 - t * 0.3))
-                img.putpixel((x, y), (brightness, brightness, brightness, alpha))
-
-    path = os.path.join(SPRITES_DIR, "particle.png")
+    dy, dx = np.mgrid[0:PROJ_SIZE, 0:PROJ_SIZE].astype(np.float64)
+    dx += 0.5 - cx
+    dy += 0.5 - cy
+    dist = np.sqrt(dx * dx + dy * dy)
+    inside = dist < max_r
+    # Smooth gradient: bright center, fading to transparent edge
+    t = dist / max_r
+    alpha = (255 * (1 - t * t)).astype(np.int64)  # quadratic falloff
+    brightness = (255 * (1 - t * 0.3)).astype(np.int64)
+    rgba = np.stack([brightness, brightness, brightness, alpha], axis=-1)
+    img.px[inside] = rgba[inside]
+
+    filename = f"particle{density_suffix(density)}.png"
+    path = os.path.join(SPRITES_DIR, filename)
     img.save(path)
     print(f"  Created {path} ({PROJ_SIZE}x{PROJ_SIZE})")
+    return {"image": filename, "frameWidth": PROJ_SIZE, "frameHeight": PROJ_SIZE, "frameCount": 1}
 
 
 # ============================================================
@@ -819,7 +1101,7 @@ def draw_tileset_tile(img, col, row, color, detail_fn=None):
 
 def generate_tileset_ruins():
     """Solarpunk Ruins tileset -- stone, moss, cracks, ancient feel."""
-    img = Image.new("RGBA", (128, 64), TRANSPARENT)
+    img = Canvas(128, 64)
 
     # Tile 1 (0,0): Floor - weathered stone with moss spots
     draw_tileset_tile(img, 0, 0, (160, 155, 140, 255))
@@ -937,7 +1219,7 @@ def generate_tileset_ruins():
 
 def generate_tileset_living():
     """Solarpunk Living tileset -- grass, wood, leaves, organic."""
-    img = Image.new("RGBA", (128, 64), TRANSPARENT)
+    img = Canvas(128, 64)
 
     # Tile 1 (0,0): Floor - lush grass with dirt path
     draw_tileset_tile(img, 0, 0, (120, 160, 80, 255))
@@ -1049,7 +1331,7 @@ def generate_tileset_living():
 
 def generate_tileset_tech():
     """Solarpunk Tech tileset -- solar panels, crystals, circuit lines."""
-    img = Image.new("RGBA", (128, 64), TRANSPARENT)
+    img = Canvas(128, 64)
 
     # Tile 1 (0,0): Floor - solar panel walkway
     draw_tileset_tile(img, 0, 0, (60, 70, 90, 255))
@@ -1158,7 +1440,7 @@ def generate_tileset_tech():
 
 def generate_tileset_mixed():
     """Solarpunk Mixed tileset -- cobblestone, brick, vine, machinery."""
-    img = Image.new("RGBA", (128, 64), TRANSPARENT)
+    img = Canvas(128, 64)
 
     # Tile 1 (0,0): Floor - cobblestone with grass in cracks
     draw_tileset_tile(img, 0, 0, (150, 145, 130, 255))
@@ -1292,33 +1574,55 @@ def generate_tileset_mixed():
 # ============================================================
 # MAIN
 # ============================================================
-if __name__ == "__main__":
+def main():
+    os.makedirs(SPRITES_DIR, exist_ok=True)
+    os.makedirs(TILESETS_DIR, exist_ok=True)
+
     print("Generating Banger pixel art assets (HD / 2x resolution)...")
     print()
 
-    print("[1/7] Paran spritesheet (36 frames @ 64x64)")
-    paran_frames = generate_paran_frames()
-    assemble_spritesheet(paran_frames, "paran")
+    manifest = {"designDensity": DESIGN_DENSITY, "densities": {}}
+    for density in DENSITIES:
+        set_density(density)
+        size = FRAME_SIZE
+        label = f"{density}x"
+        sheets = {}
 
-    print("[2/7] Faran spritesheet (36 frames @ 64x64)")
-    faran_frames = generate_faran_frames()
-    assemble_spritesheet(faran_frames, "faran")
+        print(f"[1/7] Paran spritesheet (36 frames @ {size}x{size}, {label})")
+        sheets["paran"] = assemble_spritesheet(generate_paran_frames(), "paran", density=density)
 
-    print("[3/7] Baran spritesheet (36 frames @ 64x64)")
-    baran_frames = generate_baran_frames()
-    assemble_spritesheet(baran_frames, "baran")
+        print(f"[2/7] Faran spritesheet (36 frames @ {size}x{size}, {label})")
+        sheets["faran"] = assemble_spritesheet(generate_faran_frames(), "faran", density=density)
 
-    print("[4/7] Projectile spritesheet (3 frames @ 16x16)")
-    generate_projectiles()
+        print(f"[3/7] Baran spritesheet (36 frames @ {size}x{size}, {label})")
+        sheets["baran"] = assemble_spritesheet(generate_baran_frames(), "baran", density=density)
 
-    print("[5/7] Particle texture (16x16)")
-    generate_particle()
+        print(f"[4/7] Projectile spritesheet (3 frames @ {PROJ_SIZE}x{PROJ_SIZE}, {label})")
+        sheets["projectiles"] = generate_projectiles(density)
 
+        print(f"[5/7] Particle texture ({PROJ_SIZE}x{PROJ_SIZE}, {label})")
+        sheets["particle"] = generate_particle(density)
+
+        manifest["densities"][label] = {"scale": density / DESIGN_DENSITY, "sheets": sheets}
+        print()
+
+    # Tilesets are drawn at 1x on the unscaled grid
+    set_density(DESIGN_DENSITY)
     print("[6/7] Tilesets (4 maps @ 128x64, 32x32 tiles)")
     generate_tileset_ruins()
     generate_tileset_living()
     generate_tileset_tech()
     generate_tileset_mixed()
 
+    print("[7/7] Density manifest")
+    manifest_path = os.path.join(SPRITES_DIR, "densities.json")
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"  Created {manifest_path}")
+
     print()
     print("All assets generated successfully!")
+
+
+if __name__ == "__main__":
+    main()
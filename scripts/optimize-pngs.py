@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Losslessly re-encode client PNGs as small as possible.
+
+All sprites come from a few fixed palettes and the tilesets are pixel art, but
+PIL writes them as 32-bit RGBA with default settings. For every generated PNG
+matching OPTIMIZE_GLOBS this script:
+
+1. Counts the unique RGBA colors. With at most 256 the image becomes an
+   indexed PNG (bit depth 1/2/4/8) with a tRNS chunk, translucent palette
+   entries first so the tRNS chunk stays as short as possible. Otherwise it
+   stays truecolor (RGB when fully opaque, RGBA otherwise).
+2. Encodes the scanlines with its own zlib-based PNG writer. All five PNG row
+   filters are computed for the whole image at once with NumPy, plus an
+   adaptive per-row choice. The filters are ranked with a fast zlib pass,
+   the best ones are recompressed over more levels and zlib strategies, and
+   the smallest stream wins.
+3. Decodes the result and compares it pixel-for-pixel with the source.
+
+Only IHDR, PLTE, tRNS, IDAT and IEND are written, so outputs carry no
+timestamps or other metadata and are byte-for-byte reproducible. When the
+original file is still smaller, it is kept with its ancillary chunks stripped.
+Files are processed on a thread pool; zlib releases the GIL while compressing.
+
+Hand-made art that no script writes (icons/, the splash and portrait images,
+tilesets/placeholder.png) is left alone, so a build never rewrites it. Each
+result is cached in build/optimize-cache under the SHA-256 of the file it was
+made from (and of itself). The generators write byte-identical PNGs for
+unchanged inputs, so on the next build those files are restored from the
+cache instead of being searched again.
+
+Run this after the generators, as the last pipeline step.
+
+Input:  client/public/{sprites,tilesets,images/minimaps}/ PNGs written by the generators
+Output: the same files, rewritten in place
+
+Usage:
+    python3 scripts/optimize-pngs.py
+"""
+
+from PIL import Image
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+import glob
+import hashlib
+import io
+import os
+import struct
+import time
+import zlib
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+PUBLIC_DIR = os.path.join(PROJECT_ROOT, "client", "public")
+
+OPTIMIZE_CACHE_DIR = os.path.join(PROJECT_ROOT, "build", "optimize-cache")
+MAX_CACHE_BYTES = 64 << 20
+
+# PNGs (globs relative to client/public) written by the generator scripts
+OPTIMIZE_GLOBS = [
+    # generate-assets.py
+    "sprites/paran*.png", "sprites/faran*.png", "sprites/baran*.png",
+    "sprites/projectiles*.png", "sprites/particle*.png", "tilesets/solarpunk_*.png",
+    # recolor-variants.py, pack-atlas.py
+    "sprites/skins/*.png", "sprites/atlas/*.png",
+    # extrude-tileset.py, dedupe-tileset.py, recolor-variants.py
+    "tilesets/arena_unified*.png",
+    # build-map-atlases.py, bake-static-chunks.py, bake-shadow-overlay.py
+    "tilesets/compact/*.png", "tilesets/baked/**/*.png",
+    # render-minimaps.py
+    "images/minimaps/*.png",
+]
+
+MAX_PALETTE_COLORS = 256
+
+# Source modes that convert to RGBA without losing information
+LOSSLESS_MODES = {"1", "L", "LA", "P", "RGB", "RGBA"}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Chunks kept when stripping an existing file; everything else is metadata
+CRITICAL_CHUNKS = {b"IHDR", b"PLTE", b"tRNS", b"IDAT", b"IEND"}
+
+# PNG row filter types, plus ADAPTIVE for a per-row minimum-sum-of-absolutes choice
+FILTER_NONE = 0
+FILTER_SUB = 1
+FILTER_UP = 2
+FILTER_AVERAGE = 3
+FILTER_PAETH = 4
+FILTER_ADAPTIVE = 5
+FILTER_NAMES = ["none", "sub", "up", "average", "paeth", "adaptive"]
+
+# Compression search: every filter is ranked with a fast SCREEN_LEVEL pass, then the
+# best SEARCH_TOP_FILTERS filters are tried over every (level, strategy) pair.
+# Images whose raw scanlines exceed LARGE_RAW_BYTES (the splash screens) only try
+# the best filter at LARGE_SEARCH_LEVELS, which keeps the stage fast on every build.
+SCREEN_LEVEL = 1
+SEARCH_TOP_FILTERS = 2
+SEARCH_LEVELS = [6, 9]
+LARGE_RAW_BYTES = 1 << 20
+LARGE_SEARCH_LEVELS = [6]
+SEARCH_STRATEGIES = [
+    ("default", zlib.Z_DEFAULT_STRATEGY),
+    ("filtered", zlib.Z_FILTERED),
+    ("rle", zlib.Z_RLE),
+]
+
+MAX_WORKERS = os.cpu_count() or 4
+
+
+# ============================================================
+# Palette detection
+# ============================================================
+
+def exact_palette(rgba):
+    """
+    Find an exact palette for an (h, w, 4) uint8 array.
+
+    Returns (indices, palette) where indices is an (h, w) uint8 array and
+    palette is an (n, 4) uint8 array of RGBA entries with every translucent
+    entry ordered before the opaque ones. Returns None if the image has more
+    than MAX_PALETTE_COLORS unique colors.
+    """
+    packed = np.ascontiguousarray(rgba).view(np.uint32).reshape(rgba.shape[:2])
+    colors, inverse = np.unique(packed, return_inverse=True)
+    if len(colors) > MAX_PALETTE_COLORS:
+        return None
+
+    palette = colors.view(np.uint8).reshape(-1, 4)
+    # Stable sort: translucent entries (alpha < 255) first, opaque after
+    order = np.argsort(palette[:, 3] == 255, kind="stable")
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    indices = remap[inverse.reshape(rgba.shape[:2])].astype(np.uint8)
+    return indices, palette[order]
+
+
+# ============================================================
+# PNG encoding
+# ============================================================
+
+def png_chunk(tag, data):
+    """Serialize one PNG chunk (length, type, data, CRC)."""
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def pack_indices(indices, depth):
+    """Pack an (h, w) uint8 index array into (h, row_bytes) scanlines at 1/2/4/8 bits per pixel."""
+    if depth == 8:
+        return indices
+    h, w = indices.shape
+    per_byte = 8 // depth
+    row_bytes = -(-w // per_byte)
+    padded = np.zeros((h, row_bytes * per_byte), dtype=np.uint8)
+    padded[:, :w] = indices
+    groups = padded.reshape(h, row_bytes, per_byte)
+    shifts = (8 - depth * (np.arange(per_byte) + 1)).astype(np.uint8)
+    return np.bitwise_or.reduce(groups << shifts, axis=2).astype(np.uint8)
+
+
+def prepare_image(rgba):
+    """
+    Choose the color type for an (h, w, 4) array.
+
+    Returns (header fields, scanlines, bytes per pixel for filtering, extra
+    chunks placed before IDAT).
+    """
+    h, w = rgba.shape[:2]
+    result = exact_palette(rgba)
+    if result is not None:
+        indices, palette = result
+        depth = next(d for d in (1, 2, 4, 8) if len(palette) <= 1 << d)
+        chunks = [png_chunk(b"PLTE", palette[:, :3].tobytes())]
+        translucent = int(np.count_nonzero(palette[:, 3] < 255))
+        if translucent:
+            chunks.append(png_chunk(b"tRNS", palette[:translucent, 3].tobytes()))
+        return (w, h, depth, 3), pack_indices(indices, depth), 1, chunks
+
+    if (rgba[:, :, 3] == 255).all():
+        return (w, h, 8, 2), rgba[:, :, :3].reshape(h, w * 3), 3, []
+    return (w, h, 8, 6), rgba.reshape(h, w * 4), 4, []
+
+
+def filter_rows(lines, bpp):
+    """
+    Apply every PNG filter to all scanlines at once.
+
+    Returns a (6, h, row_bytes + 1) uint8 array: one filtered image per entry
+    in FILTER_NAMES, each row prefixed with its filter type byte.
+    """
+    x = lines.astype(np.int16)
+    left = np.zeros_like(x)
+    left[:, bpp:] = x[:, :-bpp]
+    up = np.zeros_like(x)
+    up[1:] = x[:-1]
+    up_left = np.zeros_like(x)
+    up_left[1:, bpp:] = x[:-1, :-bpp]
+
+    p = left + up - up_left
+    pa = np.abs(p - left)
+    pb = np.abs(p - up)
+    pc = np.abs(p - up_left)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+
+    filtered = np.stack([
+        x,
+        x - left,
+        x - up,
+        x - (left + up) // 2,
+        x - paeth,
+    ]).astype(np.uint8)  # Wraps modulo 256, as the PNG spec requires
+
+    # Adaptive: per row, the filter with the smallest sum of absolute signed bytes
+    scores = np.abs(filtered.view(np.int8).astype(np.int32)).sum(axis=2)
+    best = scores.argmin(axis=0)
+    adaptive = filtered[best, np.arange(len(best))]
+
+    h = lines.shape[0]
+    out = np.empty((6, h, lines.shape[1] + 1), dtype=np.uint8)
+    out[:5, :, 0] = np.arange(5, dtype=np.uint8)[:, None]
+    out[:5, :, 1:] = filtered
+    out[FILTER_ADAPTIVE, :, 0] = best
+    out[FILTER_ADAPTIVE, :, 1:] = adaptive
+    return out
+
+
+def deflate(raw, level, strategy):
+    """zlib-compress a byte string with an explicit level and strategy."""
+    comp = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+    return comp.compress(raw) + comp.flush()
+
+
+def encode_png(rgba):
+    """
+    Encode an (h, w, 4) array as the smallest PNG found by the compression search.
+
+    Returns (png bytes, description of the winning settings).
+    """
+    (w, h, depth, color_type), lines, bpp, extra_chunks = prepare_image(rgba)
+    raws = [f.tobytes() for f in filter_rows(lines, bpp)]
+
+    screened = sorted(
+        (len(deflate(raw, SCREEN_LEVEL, zlib.Z_DEFAULT_STRATEGY)), i) for i, raw in enumerate(raws)
+    )
+    if len(raws[0]) > LARGE_RAW_BYTES:
+        top_filters, levels = 1, LARGE_SEARCH_LEVELS
+    else:
+        top_filters, levels = SEARCH_TOP_FILTERS, SEARCH_LEVELS
+
+    best = None
+    for _size, filter_type in screened[:top_filters]:
+        for level in levels:
+            for strategy_name, strategy in SEARCH_STRATEGIES:
+                idat = deflate(raws[filter_type], level, strategy)
+                if best is None or len(idat) < len(best[0]):
+                    best = (idat, f"{FILTER_NAMES[filter_type]}, level {level}, {strategy_name}")
+
+    idat, settings = best
+    header = struct.pack(">IIBBBBB", w, h, depth, color_type, 0, 0, 0)
+    data = b"".join([
+        PNG_SIGNATURE,
+        png_chunk(b"IHDR", header),
+        *extra_chunks,
+        png_chunk(b"IDAT", idat),
+        png_chunk(b"IEND", b""),
+    ])
+    kind = {3: f"indexed {depth}-bit", 2: "RGB", 6: "RGBA"}[color_type]
+    return data, f"{kind}, {settings}"
+
+
+def strip_chunks(data):
+    """Drop every ancillary chunk (text, time, gamma, ...) from PNG bytes."""
+    out = [PNG_SIGNATURE]
+    pos = len(PNG_SIGNATURE)
+    while pos < len(data):
+        length = struct.unpack(">I", data[pos:pos + 4])[0]
+        tag = data[pos + 4:pos + 8]
+        end = pos + 12 + length
+        if tag in CRITICAL_CHUNKS:
+            out.append(data[pos:end])
+        pos = end
+    return b"".join(out)
+
+
+def decode_rgba(png_bytes):
+    """Decode PNG bytes to an (h, w, 4) uint8 array."""
+    return np.asarray(Image.open(io.BytesIO(png_bytes)).convert("RGBA"))
+
+
+# ============================================================
+# Optimization
+# ============================================================
+
+def cache_key(data):
+    """Cache entry name for PNG bytes; covers the search settings, so changing them invalidates the cache."""
+    settings = repr((SCREEN_LEVEL, SEARCH_TOP_FILTERS, SEARCH_LEVELS, LARGE_RAW_BYTES, LARGE_SEARCH_LEVELS,
+                     [strategy for _, strategy in SEARCH_STRATEGIES]))
+    return hashlib.sha256(settings.encode() + data).hexdigest() + ".png"
+
+
+def cache_store(key, data):
+    """Write a cache entry atomically (concurrent writers of one key are harmless)."""
+    path = os.path.join(OPTIMIZE_CACHE_DIR, key)
+    tmp = f"{path}.{os.getpid()}.{id(data)}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def prune_cache(max_bytes=MAX_CACHE_BYTES):
+    """Delete the least recently used cache entries until the cache fits max_bytes."""
+    if not os.path.isdir(OPTIMIZE_CACHE_DIR):
+        return
+    entries = []
+    for name in os.listdir(OPTIMIZE_CACHE_DIR):
+        st = os.stat(os.path.join(OPTIMIZE_CACHE_DIR, name))
+        entries.append((st.st_mtime_ns, st.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(os.path.join(OPTIMIZE_CACHE_DIR, name))
+        total -= size
+
+
+def optimize_png(path):
+    """
+    Re-encode one PNG in place.
+
+    Returns (status, bytes_before, bytes_after, detail) where status is one of
+    "encoded", "stripped" (the original was smaller; only metadata removed),
+    "cached" (the same bytes were optimized before; the result is reused)
+    or "skipped" (unsupported source mode).
+    """
+    with open(path, "rb") as f:
+        original = f.read()
+    before = len(original)
+
+    key = cache_key(original)
+    try:
+        with open(os.path.join(OPTIMIZE_CACHE_DIR, key), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        data = None
+    if data is not None:
+        os.utime(os.path.join(OPTIMIZE_CACHE_DIR, key))  # recency for prune_cache()
+        if data != original:
+            with open(path, "wb") as f:
+                f.write(data)
+        return "cached", before, len(data), "unchanged since the last optimization"
+
+    with Image.open(io.BytesIO(original)) as src:
+        if src.mode not in LOSSLESS_MODES:
+            return "skipped", before, before, src.mode
+        rgba = np.ascontiguousarray(src.convert("RGBA"))
+
+    data, detail = encode_png(rgba)
+    if not np.array_equal(decode_rgba(data), rgba):
+        raise RuntimeError(f"Re-encoding {path} does not round-trip")
+
+    status = "encoded"
+    if len(data) >= before:
+        status, data, detail = "stripped", strip_chunks(original), "original encoding"
+
+    if data != original:
+        with open(path, "wb") as f:
+            f.write(data)
+    # Keyed by the input and by the result, which re-encodes to itself
+    cache_store(key, data)
+    cache_store(cache_key(data), data)
+    return status, before, len(data), detail
+
+
+def find_pngs():
+    """List every PNG matching OPTIMIZE_GLOBS, sorted."""
+    paths = set()
+    for pattern in OPTIMIZE_GLOBS:
+        paths.update(glob.glob(os.path.join(PUBLIC_DIR, pattern), recursive=True))
+    return sorted(p for p in paths if os.path.isfile(p))
+
+
+def main():
+    print("Optimizing PNGs...")
+    print()
+
+    start = time.perf_counter()
+    paths = find_pngs()
+    os.makedirs(OPTIMIZE_CACHE_DIR, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        results = list(pool.map(optimize_png, paths))
+    prune_cache()
+
+    total_before = 0
+    total_after = 0
+    for path, (status, before, after, detail) in zip(paths, results):
+        total_before += before
+        total_after += after
+        rel_path = os.path.relpath(path, PUBLIC_DIR)
+        saved = before - after
+        pct = saved * 100 / before if before else 0.0
+        print(f"  {status.capitalize()} {rel_path}: {before} -> {after} bytes (-{saved}, {pct:.1f}%; {detail})")
+
+    elapsed = time.perf_counter() - start
+    print()
+    saved = total_before - total_after
+    pct = saved * 100 / total_before if total_before else 0.0
+    cached = sum(1 for status, *_ in results if status == "cached")
+    print(f"  Total: {total_before} -> {total_after} bytes (-{saved}, {pct:.1f}%) in {elapsed:.1f}s "
+          f"({cached} of {len(paths)} from cache)")
+    print()
+    print("PNG optimization complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,780 @@
+#!/usr/bin/env python3
+"""
+Pack character sprites, projectiles, particles and UI icons into texture atlas pages.
+
+Every frame is sliced from its source sheet, trimmed to the bounding box of its
+non-transparent pixels, and packed with the MaxRects algorithm (best short side
+fit) into power-of-two pages of at most MAX_PAGE_SIZE. The result is a Phaser 3
+multiatlas JSON with trim offsets (spriteSourceSize/sourceSize) and a centered
+pivot per frame, so one texture bind and one request replace the individual
+spritesheets and icon images loaded in BootScene. Sheets and their frame
+sizes come from the sprites/densities.json that generate-assets.py writes, and
+any sheet that BootScene.ts loads with a different frame size is reported.
+
+Frames are deduplicated before packing by hashing their pixel buffers: exact
+duplicates become extra frame names on the same atlas rect, and horizontal
+mirrors (walk-left is FLIP_LEFT_RIGHT of walk-right) are not packed at all.
+An animation sidecar lists every animation with the shared frame each step
+uses and a flipX flag for mirrored steps.
+
+Aseprite sources are read natively, with no export step. Every frame of
+assets/aseprite/<name>.aseprite is flattened (visible layers, normal blending,
+cel and layer opacity) and packed as "aseprite/<name>_<frame>". Every tag
+becomes an animation "aseprite/<name>-<tag>" that keeps the tag's direction,
+repeat count and per-frame durations. The file is parsed chunk by chunk, and
+cel pixel data stays compressed until a frame is rendered. Rendered frames
+are cached in build/aseprite-cache by a hash of everything the frame depends
+on (canvas, layers, palette and its own cel chunks), so after an edit only
+the frames whose cels changed are inflated and composited again.
+
+Input:  client/public/sprites/{paran,faran,baran,projectiles,particle}.png
+        client/public/sprites/densities.json (frame sizes, from generate-assets.py)
+        client/public/icons/*.png
+        assets/aseprite/*.aseprite
+Output: client/public/sprites/atlas/game_atlas-<page>.png
+        client/public/sprites/atlas/game_atlas.json
+        client/public/sprites/atlas/game_atlas.anims.json
+
+Client usage:
+    this.load.multiatlas('game', 'sprites/atlas/game_atlas.json', 'sprites/atlas/');
+
+Usage:
+    python3 scripts/pack-atlas.py
+"""
+
+from PIL import Image
+import hashlib
+import json
+import os
+import re
+import struct
+import zlib
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+PUBLIC_DIR = os.path.join(PROJECT_ROOT, "client", "public")
+ATLAS_DIR = os.path.join(PUBLIC_DIR, "sprites", "atlas")
+ASEPRITE_DIR = os.path.join(PROJECT_ROOT, "assets", "aseprite")
+ASEPRITE_CACHE_DIR = os.path.join(PROJECT_ROOT, "build", "aseprite-cache")
+
+ATLAS_NAME = "game_atlas"
+MAX_PAGE_SIZE = 2048   # Largest page edge (power of two)
+MIN_PAGE_SIZE = 64     # Smallest page edge tried
+PADDING = 2            # Transparent gap between packed frames
+
+# Sheet list written by generate-assets.py: image and frame size of every sheet
+# at every density. The design-density entry is packed; a sheet with one frame
+# (particle) becomes a single frame named after the sheet.
+DENSITIES_PATH = os.path.join(PUBLIC_DIR, "sprites", "densities.json")
+
+# Spritesheet configs the client loads, checked against the packed frame sizes
+BOOTSCENE_PATH = os.path.join(PROJECT_ROOT, "client", "src", "scenes", "BootScene.ts")
+BOOTSCENE_SPRITESHEET = re.compile(
+    r"load\.spritesheet\(\s*'[^']*'\s*,\s*'([^']+)'\s*,\s*\{\s*frameWidth:\s*(\d+),\s*frameHeight:\s*(\d+)")
+
+# Every PNG in this directory is packed as one frame named after its file stem
+ICONS_DIR = "icons"
+
+# Animations over generate-assets.py's 36-frame character layout:
+# key -> (frame prefix, frame indices, frameRate, repeat)
+ANIMATIONS = {}
+for _role in ("paran", "faran", "baran"):
+    ANIMATIONS.update({
+        f"{_role}-walk-down": (_role, list(range(0, 6)), 10, -1),
+        f"{_role}-walk-up": (_role, list(range(6, 12)), 10, -1),
+        f"{_role}-walk-right": (_role, list(range(12, 18)), 10, -1),
+        f"{_role}-walk-left": (_role, list(range(18, 24)), 10, -1),
+        f"{_role}-idle": (_role, list(range(24, 27)), 3, -1),
+        f"{_role}-shoot": (_role, list(range(27, 30)), 10, 0),
+        f"{_role}-death": (_role, list(range(30, 36)), 10, 0),
+    })
+
+# Aseprite file format (https://github.com/aseprite/aseprite/blob/main/docs/ase-file-specs.md)
+ASE_HEADER = struct.Struct("<IHHHHHIH8xB3xHBBhhHH84x")   # 128 bytes
+ASE_FRAME_HEADER = struct.Struct("<IHHH2xI")              # 16 bytes
+ASE_CHUNK_HEADER = struct.Struct("<IH")                   # 6 bytes
+ASE_MAGIC = 0xA5E0
+ASE_FRAME_MAGIC = 0xF1FA
+
+CHUNK_OLD_PALETTE = 0x0004
+CHUNK_LAYER = 0x2004
+CHUNK_CEL = 0x2005
+CHUNK_TAGS = 0x2018
+CHUNK_PALETTE = 0x2019
+
+LAYER_VISIBLE = 1
+LAYER_BACKGROUND = 8
+LAYER_REFERENCE = 64
+LAYER_GROUP = 1
+HEADER_LAYER_OPACITY = 1  # header flag: layer opacity fields are valid
+
+CEL_RAW = 0
+CEL_LINKED = 1
+CEL_COMPRESSED = 2
+
+# Tag directions -> step order over the frames from..to
+ASE_DIRECTIONS = {0: "forward", 1: "reverse", 2: "pingpong", 3: "pingpong_reverse"}
+
+ASEPRITE_PREFIX = "aseprite/"
+
+
+# ============================================================
+# Aseprite sources
+# ============================================================
+
+def read_ase_string(data, pos):
+    """Read an Aseprite STRING (WORD length + UTF-8 bytes). Returns (str, new position)."""
+    (length,) = struct.unpack_from("<H", data, pos)
+    return data[pos + 2:pos + 2 + length].decode("utf-8"), pos + 2 + length
+
+
+def iter_ase_chunks(f):
+    """
+    Stream an .aseprite file chunk by chunk.
+
+    Yields ("header", fields) once, then ("frame", duration ms) at the start
+    of every frame and ("chunk", chunk type, chunk data) for each of its
+    chunks. Only one chunk is held in memory at a time.
+    """
+    data = f.read(ASE_HEADER.size)
+    (_size, magic, frame_count, width, height, depth, flags, _speed, transparent,
+     colors, _pw, _ph, _gx, _gy, _gw, _gh) = ASE_HEADER.unpack(data)
+    if magic != ASE_MAGIC:
+        raise ValueError(f"not an Aseprite file (magic {magic:#06x})")
+    yield "header", {"frames": frame_count, "width": width, "height": height, "depth": depth,
+                     "flags": flags, "transparent": transparent, "colors": colors or 256}
+
+    for index in range(frame_count):
+        _bytes, magic, old_chunks, duration, new_chunks = ASE_FRAME_HEADER.unpack(f.read(ASE_FRAME_HEADER.size))
+        if magic != ASE_FRAME_MAGIC:
+            raise ValueError(f"frame {index}: bad frame magic {magic:#06x}")
+        yield "frame", duration
+        for _ in range(new_chunks or old_chunks):
+            size, chunk_type = ASE_CHUNK_HEADER.unpack(f.read(ASE_CHUNK_HEADER.size))
+            yield "chunk", chunk_type, f.read(size - ASE_CHUNK_HEADER.size)
+
+
+def parse_layer(data, header):
+    flags, layer_type, child_level, _w, _h, blend, opacity = struct.unpack_from("<HHHHHHB", data, 0)
+    name, _ = read_ase_string(data, 16)
+    if not header["flags"] & HEADER_LAYER_OPACITY:
+        opacity = 255
+    return {"name": name, "flags": flags, "type": layer_type, "level": child_level,
+            "blend": blend, "opacity": opacity}
+
+
+def parse_cel(data, frame):
+    """Cel header fields plus its still-compressed pixel payload."""
+    layer, x, y, opacity, cel_type, z_index = struct.unpack_from("<HhhBHh", data, 0)
+    cel = {"layer": layer, "x": x, "y": y, "opacity": opacity, "type": cel_type, "z": z_index,
+           "frame": frame, "chunk": data}
+    body = 16
+    if cel_type == CEL_LINKED:
+        (cel["link"],) = struct.unpack_from("<H", data, body)
+    elif cel_type in (CEL_RAW, CEL_COMPRESSED):
+        cel["w"], cel["h"] = struct.unpack_from("<HH", data, body)
+        cel["pixels"] = data[body + 4:]
+    else:
+        raise ValueError(f"frame {frame}: cel type {cel_type} (tilemap) is not supported")
+    return cel
+
+
+def parse_palette(data, palette):
+    """Apply a palette chunk (0x2019) to a list of RGBA tuples in place."""
+    _size, first, last = struct.unpack_from("<III", data, 0)
+    pos = 20
+    for index in range(first, last + 1):
+        entry_flags, r, g, b, a = struct.unpack_from("<HBBBB", data, pos)
+        pos += 6
+        if entry_flags & 1:
+            _name, pos = read_ase_string(data, pos)
+        palette[index] = (r, g, b, a)
+
+
+def parse_old_palette(data, palette):
+    """Apply an old palette chunk (0x0004, RGB packets) to a list of RGBA tuples in place."""
+    (packets,) = struct.unpack_from("<H", data, 0)
+    pos = 2
+    index = 0
+    for _ in range(packets):
+        skip, count = data[pos], data[pos + 1] or 256
+        pos += 2
+        index += skip
+        for _ in range(count):
+            palette[index] = (data[pos], data[pos + 1], data[pos + 2], 255)
+            index += 1
+            pos += 3
+
+
+def parse_tags(data):
+    (count,) = struct.unpack_from("<H", data, 0)
+    pos = 10
+    tags = []
+    for _ in range(count):
+        start, end, direction, repeat = struct.unpack_from("<HHBH", data, pos)
+        name, pos = read_ase_string(data, pos + 17)
+        tags.append({"name": name, "from": start, "to": end,
+                     "direction": ASE_DIRECTIONS.get(direction, "forward"), "repeat": repeat})
+    return tags
+
+
+def read_aseprite(path):
+    """
+    Parse an .aseprite file without decoding any pixels.
+
+    Returns a dict with the canvas header, layers, RGBA palette, tags and,
+    per frame, its duration and cels (linked cels resolved to their source).
+    """
+    doc = {"layers": [], "tags": [], "frames": []}
+    palette = [(0, 0, 0, 0)] * 256
+    has_new_palette = False
+    with open(path, "rb") as f:
+        for event in iter_ase_chunks(f):
+            if event[0] == "header":
+                doc["header"] = event[1]
+                continue
+            if event[0] == "frame":
+                doc["frames"].append({"duration": event[1], "cels": {}})
+                continue
+            _, chunk_type, data = event
+            index = len(doc["frames"]) - 1
+            if chunk_type == CHUNK_LAYER:
+                doc["layers"].append(parse_layer(data, doc["header"]))
+            elif chunk_type == CHUNK_CEL:
+                cel = parse_cel(data, index)
+                doc["frames"][index]["cels"][cel["layer"]] = cel
+            elif chunk_type == CHUNK_PALETTE:
+                parse_palette(data, palette)
+                has_new_palette = True
+            elif chunk_type == CHUNK_OLD_PALETTE and not has_new_palette:
+                parse_old_palette(data, palette)
+            elif chunk_type == CHUNK_TAGS:
+                doc["tags"] = parse_tags(data)
+
+    for frame in doc["frames"]:
+        for layer, cel in frame["cels"].items():
+            if cel["type"] == CEL_LINKED:
+                source = doc["frames"][cel["link"]]["cels"][layer]
+                frame["cels"][layer] = dict(source, x=cel["x"], y=cel["y"], opacity=cel["opacity"],
+                                            z=cel["z"], frame=cel["frame"])
+    doc["palette"] = palette
+    return doc
+
+
+def visible_layers(layers):
+    """Indices of drawable layers: visible themselves and inside visible groups, not reference layers."""
+    drawable = set()
+    hidden_from = None  # child level under which everything is hidden
+    for i, layer in enumerate(layers):
+        if hidden_from is not None and layer["level"] > hidden_from:
+            continue
+        hidden_from = None
+        if not layer["flags"] & LAYER_VISIBLE:
+            hidden_from = layer["level"]
+            continue
+        if layer["type"] == LAYER_GROUP or layer["flags"] & LAYER_REFERENCE:
+            continue
+        drawable.add(i)
+    return drawable
+
+
+def frame_cache_key(doc, index):
+    """Hash of everything frame `index` renders from: canvas, layers, palette and its cel chunks."""
+    header = doc["header"]
+    h = hashlib.sha1(f"{header['width']}x{header['height']}x{header['depth']}:{header['transparent']}".encode())
+    h.update(json.dumps(doc["layers"], sort_keys=True).encode())
+    if header["depth"] == 8:
+        h.update(bytes(c for color in doc["palette"] for c in color))
+    for layer, cel in sorted(doc["frames"][index]["cels"].items()):
+        h.update(struct.pack("<HhhBh", layer, cel["x"], cel["y"], cel["opacity"], cel["z"]))
+        h.update(hashlib.sha1(cel["chunk"]).digest())
+    return h.hexdigest()
+
+
+def decode_cel(doc, cel, layer):
+    """Inflate a cel's pixels into an RGBA Image."""
+    header = doc["header"]
+    pixels = cel["pixels"]
+    if cel["type"] == CEL_COMPRESSED:
+        pixels = zlib.decompress(pixels)
+    size = (cel["w"], cel["h"])
+    if header["depth"] == 32:
+        return Image.frombytes("RGBA", size, pixels)
+    if header["depth"] == 16:
+        return Image.frombytes("LA", size, pixels).convert("RGBA")
+    img = Image.frombytes("P", size, pixels)
+    palette = list(doc["palette"])
+    if not layer["flags"] & LAYER_BACKGROUND:
+        palette[header["transparent"]] = (0, 0, 0, 0)
+    img.putpalette(bytes(c for color in palette for c in color), rawmode="RGBA")
+    return img.convert("RGBA")
+
+
+def render_frame(doc, index):
+    """Composite the drawable layers of one frame (normal blending) into a canvas-sized RGBA Image."""
+    header = doc["header"]
+    canvas = Image.new("RGBA", (header["width"], header["height"]), (0, 0, 0, 0))
+    drawable = visible_layers(doc["layers"])
+    cels = doc["frames"][index]["cels"]
+    # Aseprite draws cels by layer index + z-index, ties broken by z-index
+    for layer_index in sorted(cels, key=lambda i: (i + cels[i]["z"], cels[i]["z"])):
+        if layer_index not in drawable:
+            continue
+        layer = doc["layers"][layer_index]
+        cel = cels[layer_index]
+        img = decode_cel(doc, cel, layer)
+        opacity = cel["opacity"] * layer["opacity"] // 255
+        if opacity < 255:
+            img.putalpha(img.getchannel("A").point(lambda a: a * opacity // 255))
+
+        # Clip the cel to the canvas (cels may start at negative offsets)
+        left, top = max(cel["x"], 0), max(cel["y"], 0)
+        right = min(cel["x"] + img.width, canvas.width)
+        bottom = min(cel["y"] + img.height, canvas.height)
+        if right <= left or bottom <= top:
+            continue
+        img = img.crop((left - cel["x"], top - cel["y"], right - cel["x"], bottom - cel["y"]))
+        canvas.alpha_composite(img, (left, top))
+    return canvas
+
+
+def cached_frame(doc, index, stats):
+    """Render a frame, reusing the cached raster when its cel chunks are unchanged."""
+    header = doc["header"]
+    size = (header["width"], header["height"])
+    path = os.path.join(ASEPRITE_CACHE_DIR, f"{frame_cache_key(doc, index)}.rgba")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) == size[0] * size[1] * 4:
+            stats["cached"] += 1
+            return Image.frombytes("RGBA", size, data)
+
+    img = render_frame(doc, index)
+    os.makedirs(ASEPRITE_CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(img.tobytes())
+    os.replace(tmp, path)
+    stats["decoded"] += 1
+    return img
+
+
+def tag_steps(tag):
+    """Frame indices of one pass through a tag, following its direction."""
+    forward = list(range(tag["from"], tag["to"] + 1))
+    if tag["direction"] == "reverse":
+        return forward[::-1]
+    if tag["direction"] == "pingpong":
+        return forward + forward[-2:0:-1]
+    if tag["direction"] == "pingpong_reverse":
+        backward = forward[::-1]
+        return backward + backward[-2:0:-1]
+    return forward
+
+
+def tag_key(stem, name):
+    """Animation key for a tag: 'Run north' in baran-arena -> 'aseprite/baran-arena-run-north'."""
+    slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+    return f"{ASEPRITE_PREFIX}{stem}-{slug}"
+
+
+def collect_aseprite_frames():
+    """
+    Render every frame of every .aseprite source.
+
+    Returns (frames, anims, stats): [(name, Image)], {anim key: {"frames": [frame
+    names], "durations": [ms], "repeat": n}} and decoded/cached frame counts.
+    """
+    frames = []
+    anims = {}
+    stats = {"files": 0, "decoded": 0, "cached": 0}
+    if not os.path.isdir(ASEPRITE_DIR):
+        return frames, anims, stats
+
+    for filename in sorted(os.listdir(ASEPRITE_DIR)):
+        if not filename.endswith(".aseprite"):
+            continue
+        stem = os.path.splitext(filename)[0]
+        doc = read_aseprite(os.path.join(ASEPRITE_DIR, filename))
+        stats["files"] += 1
+        for index in range(len(doc["frames"])):
+            frames.append((f"{ASEPRITE_PREFIX}{stem}_{index}", cached_frame(doc, index, stats)))
+        for tag in doc["tags"]:
+            steps = tag_steps(tag)
+            anims[tag_key(stem, tag["name"])] = {
+                "frames": [f"{ASEPRITE_PREFIX}{stem}_{i}" for i in steps],
+                "durations": [doc["frames"][i]["duration"] for i in steps],
+                # Aseprite: 0 = loop forever, n = play n times
+                "repeat": tag["repeat"] - 1 if tag["repeat"] else -1,
+            }
+    return frames, anims, stats
+
+
+# ============================================================
+# Frame collection + trimming
+# ============================================================
+
+def load_sheets():
+    """
+    Design-density sheets from densities.json.
+
+    Returns [(frame prefix, path relative to client/public, frame width, frame height, frame count)].
+    """
+    if not os.path.exists(DENSITIES_PATH):
+        raise FileNotFoundError(f"{DENSITIES_PATH} not found; run generate-assets.py first")
+    with open(DENSITIES_PATH) as f:
+        manifest = json.load(f)
+    sheets = manifest["densities"][f"{manifest['designDensity']}x"]["sheets"]
+    return [(name, f"sprites/{entry['image']}", entry["frameWidth"], entry["frameHeight"], entry["frameCount"])
+            for name, entry in sorted(sheets.items())]
+
+
+def bootscene_mismatches(sheets):
+    """Sheets whose frame size differs from the spritesheet config BootScene.ts loads them with."""
+    if not os.path.exists(BOOTSCENE_PATH):
+        return []
+    with open(BOOTSCENE_PATH) as f:
+        loaded = {path: (int(w), int(h)) for path, w, h in BOOTSCENE_SPRITESHEET.findall(f.read())}
+    return [(rel_path, (fw, fh), loaded[rel_path]) for _, rel_path, fw, fh, _ in sheets
+            if rel_path in loaded and loaded[rel_path] != (fw, fh)]
+
+
+def collect_frames():
+    """Slice every source into named frames. Returns [(name, Image)] in source order."""
+    frames = []
+
+    for prefix, rel_path, fw, fh, count in load_sheets():
+        sheet = Image.open(os.path.join(PUBLIC_DIR, rel_path)).convert("RGBA")
+        cols = sheet.width // fw
+        if cols * (sheet.height // fh) < count:
+            raise ValueError(f"{rel_path} is {sheet.width}x{sheet.height}, too small for "
+                             f"{count} frames of {fw}x{fh} (see {os.path.basename(DENSITIES_PATH)})")
+        if count == 1:
+            frames.append((prefix, sheet.crop((0, 0, fw, fh))))
+            continue
+        for i in range(count):
+            x = (i % cols) * fw
+            y = (i // cols) * fh
+            frames.append((f"{prefix}_{i}", sheet.crop((x, y, x + fw, y + fh))))
+
+    icons_dir = os.path.join(PUBLIC_DIR, ICONS_DIR)
+    for filename in sorted(os.listdir(icons_dir)):
+        if filename.endswith(".png"):
+            img = Image.open(os.path.join(icons_dir, filename)).convert("RGBA")
+            frames.append((os.path.splitext(filename)[0], img))
+
+    return frames
+
+
+def trim_frame(img):
+    """
+    Crop a frame to its non-transparent bounding box.
+
+    Returns (trimmed Image, (offset_x, offset_y)). Fully transparent frames
+    collapse to a single transparent pixel so they still resolve on the client.
+    """
+    bbox = img.getchannel("A").getbbox()
+    if bbox is None:
+        return Image.new("RGBA", (1, 1), (0, 0, 0, 0)), (0, 0)
+    return img.crop(bbox), (bbox[0], bbox[1])
+
+
+# ============================================================
+# Frame deduplication
+# ============================================================
+
+def canonical_pixels(img):
+    """
+    Return an RGBA copy with every fully transparent pixel zeroed.
+
+    Invisible color data must not make two identical-looking frames hash
+    differently, and zeroing it also helps PNG compression.
+    """
+    alpha = img.getchannel("A")
+    visible = alpha.point(lambda a: 255 if a else 0)
+    out = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    out.paste(img, (0, 0), visible)
+    return out
+
+
+def pixel_hash(img):
+    """Hash an image's size and raw RGBA buffer."""
+    h = hashlib.sha1(f"{img.width}x{img.height}".encode())
+    h.update(img.tobytes())
+    return h.hexdigest()
+
+
+def dedupe_frames(frames):
+    """
+    Collapse identical and horizontally mirrored frames.
+
+    Returns (unique, aliases): `unique` is [(name, Image)] to pack, and
+    `aliases` maps every frame name to {"frame": packed name, "flipX": bool}.
+    """
+    by_hash = {}
+    unique = []
+    aliases = {}
+    for name, img in frames:
+        img = canonical_pixels(img)
+        digest = pixel_hash(img)
+        if digest in by_hash:
+            aliases[name] = {"frame": by_hash[digest], "flipX": False}
+            continue
+        mirror_digest = pixel_hash(img.transpose(Image.FLIP_LEFT_RIGHT))
+        if mirror_digest in by_hash:
+            aliases[name] = {"frame": by_hash[mirror_digest], "flipX": True}
+            continue
+        by_hash[digest] = name
+        unique.append((name, img))
+        aliases[name] = {"frame": name, "flipX": False}
+    return unique, aliases
+
+
+def build_animations(aliases, aseprite_anims=None):
+    """
+    Resolve ANIMATIONS and Aseprite tags to shared frames with flipX flags, for the anims sidecar.
+
+    Phaser adds a frame's "duration" on top of 1000 / frameRate, so a tag plays
+    at the rate of its shortest frame and longer frames carry the difference.
+    """
+    anims = {}
+    for key, (prefix, indices, frame_rate, repeat) in ANIMATIONS.items():
+        steps = []
+        for i in indices:
+            alias = aliases.get(f"{prefix}_{i}")
+            if alias is None:
+                break
+            steps.append(dict(alias))
+        else:
+            anims[key] = {"frames": steps, "frameRate": frame_rate, "repeat": repeat}
+
+    for key, anim in (aseprite_anims or {}).items():
+        shortest = min(anim["durations"])
+        steps = []
+        for name, duration in zip(anim["frames"], anim["durations"]):
+            step = dict(aliases[name])
+            if duration > shortest:
+                step["duration"] = duration - shortest
+            steps.append(step)
+        anims[key] = {"frames": steps, "frameRate": round(1000 / shortest, 3), "repeat": anim["repeat"]}
+    return anims
+
+
+# ============================================================
+# MaxRects bin packing
+# ============================================================
+
+class MaxRectsBin:
+    """MaxRects bin with best-short-side-fit placement (Jukka Jylanki, 2010)."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.free = [(0, 0, width, height)]
+
+    def insert(self, w, h):
+        """Place a w x h rect. Returns (x, y) or None if it does not fit."""
+        best = None
+        best_short = best_long = None
+        for fx, fy, fw, fh in self.free:
+            if w <= fw and h <= fh:
+                short_side = min(fw - w, fh - h)
+                long_side = max(fw - w, fh - h)
+                if best is None or (short_side, long_side) < (best_short, best_long):
+                    best = (fx, fy)
+                    best_short, best_long = short_side, long_side
+        if best is None:
+            return None
+        self._split(best[0], best[1], w, h)
+        return best
+
+    def _split(self, x, y, w, h):
+        """Split every free rect overlapping the placed rect, then prune contained ones."""
+        new_free = []
+        for fx, fy, fw, fh in self.free:
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                new_free.append((fx, fy, fw, fh))
+                continue
+            if x > fx:
+                new_free.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                new_free.append((x + w, fy, fx + fw - (x + w), fh))
+            if y > fy:
+                new_free.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                new_free.append((fx, y + h, fw, fy + fh - (y + h)))
+        self.free = [r for i, r in enumerate(new_free) if not self._contained(r, new_free, i)]
+
+    @staticmethod
+    def _contained(rect, rects, index):
+        """True if rect lies inside another free rect (ties keep the first copy)."""
+        x, y, w, h = rect
+        for j, (ox, oy, ow, oh) in enumerate(rects):
+            if j == index:
+                continue
+            if x >= ox and y >= oy and x + w <= ox + ow and y + h <= oy + oh:
+                if (x, y, w, h) != (ox, oy, ow, oh) or j < index:
+                    return True
+        return False
+
+
+def try_pack(sizes, width, height):
+    """Pack (index, w, h) items into one bin. Returns ({index: (x, y)}, leftover items)."""
+    bin_ = MaxRectsBin(width, height)
+    placed = {}
+    leftover = []
+    for item in sizes:
+        index, w, h = item
+        pos = bin_.insert(w + PADDING, h + PADDING)
+        if pos is None:
+            leftover.append(item)
+        else:
+            placed[index] = pos
+    return placed, leftover
+
+
+def page_sizes():
+    """Candidate power-of-two page sizes from smallest to largest area."""
+    sizes = []
+    edge = MIN_PAGE_SIZE
+    while edge <= MAX_PAGE_SIZE:
+        sizes.append((edge, edge))
+        if edge * 2 <= MAX_PAGE_SIZE:
+            sizes.append((edge * 2, edge))
+        edge *= 2
+    return sorted(sizes, key=lambda s: (s[0] * s[1], s[0]))
+
+
+def pack_pages(sizes):
+    """
+    Pack items into as few power-of-two pages as possible.
+
+    Each page uses the smallest size that holds all remaining items; when even
+    MAX_PAGE_SIZE is not enough, that page is filled and the rest spill over.
+    Returns [(width, height, {index: (x, y)})].
+    """
+    # Largest side first, then area -- the usual MaxRects ordering
+    remaining = sorted(sizes, key=lambda s: (max(s[1], s[2]), s[1] * s[2]), reverse=True)
+    pages = []
+    while remaining:
+        for width, height in page_sizes():
+            placed, leftover = try_pack(remaining, width, height)
+            if not leftover:
+                break
+        if not placed:
+            raise ValueError(f"Frame larger than {MAX_PAGE_SIZE}x{MAX_PAGE_SIZE} cannot be packed")
+        pages.append((width, height, placed))
+        remaining = leftover
+    return pages
+
+
+# ============================================================
+# Atlas output
+# ============================================================
+
+def build_atlas(frames, aliases=None):
+    """
+    Trim, pack and render frames. Returns (page Images, Phaser multiatlas dict).
+
+    Exact-duplicate names in `aliases` (flipX false, pointing at a packed frame)
+    get their own frame entry sharing the packed frame's rect.
+    """
+    trimmed = []
+    for name, img in frames:
+        cropped, offset = trim_frame(img)
+        trimmed.append((name, img.size, cropped, offset))
+
+    shared_names = {}
+    for alias_name, alias in (aliases or {}).items():
+        if alias_name != alias["frame"] and not alias["flipX"]:
+            shared_names.setdefault(alias["frame"], []).append(alias_name)
+
+    sizes = [(i, t[2].width, t[2].height) for i, t in enumerate(trimmed)]
+    pages = pack_pages(sizes)
+
+    images = []
+    textures = []
+    for page_index, (width, height, placed) in enumerate(pages):
+        page = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        frame_entries = []
+        for index in sorted(placed):
+            name, source_size, cropped, (ox, oy) = trimmed[index]
+            x, y = placed[index]
+            page.paste(cropped, (x, y))
+            for frame_name in [name] + shared_names.get(name, []):
+                frame_entries.append({
+                    "filename": frame_name,
+                    "rotated": False,
+                    "trimmed": cropped.size != source_size,
+                    "sourceSize": {"w": source_size[0], "h": source_size[1]},
+                    "spriteSourceSize": {"x": ox, "y": oy, "w": cropped.width, "h": cropped.height},
+                    "frame": {"x": x, "y": y, "w": cropped.width, "h": cropped.height},
+                    # Phaser reads a custom pivot from "anchor" (normalized to sourceSize)
+                    "anchor": {"x": 0.5, "y": 0.5},
+                })
+        images.append(page)
+        textures.append({
+            "image": f"{ATLAS_NAME}-{page_index}.png",
+            "format": "RGBA8888",
+            "size": {"w": width, "h": height},
+            "scale": 1,
+            "frames": frame_entries,
+        })
+
+    atlas = {
+        "textures": textures,
+        "meta": {
+            "app": "scripts/pack-atlas.py",
+            "version": "1.0",
+        },
+    }
+    return images, atlas
+
+
+def main():
+    print("Packing texture atlas...")
+    print()
+
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    for rel_path, packed, loaded in bootscene_mismatches(load_sheets()):
+        print(f"  WARNING: {rel_path} has {packed[0]}x{packed[1]} frames, "
+              f"but BootScene.ts loads it as {loaded[0]}x{loaded[1]}")
+    frames = collect_frames()
+    ase_frames, ase_anims, ase_stats = collect_aseprite_frames()
+    frames += ase_frames
+    if ase_stats["files"]:
+        print(f"  Aseprite: {len(ase_frames)} frames, {len(ase_anims)} tags from {ase_stats['files']} files "
+              f"({ase_stats['decoded']} rendered, {ase_stats['cached']} unchanged)")
+    unique, aliases = dedupe_frames(frames)
+    images, atlas = build_atlas(unique, aliases)
+
+    source_px = sum(img.width * img.height for _, img in frames)
+    atlas_px = 0
+    for texture, page in zip(atlas["textures"], images):
+        path = os.path.join(ATLAS_DIR, texture["image"])
+        page.save(path)
+        atlas_px += page.width * page.height
+        print(f"  Created {path} ({page.width}x{page.height}, {len(texture['frames'])} frames)")
+
+    json_path = os.path.join(ATLAS_DIR, f"{ATLAS_NAME}.json")
+    with open(json_path, "w") as f:
+        json.dump(atlas, f, indent=2)
+    print(f"  Created {json_path}")
+
+    anims_path = os.path.join(ATLAS_DIR, f"{ATLAS_NAME}.anims.json")
+    with open(anims_path, "w") as f:
+        json.dump({"frames": aliases, "anims": build_animations(aliases, ase_anims)}, f, indent=2)
+    print(f"  Created {anims_path}")
+
+    mirrored = sum(1 for a in aliases.values() if a["flipX"])
+    duplicates = len(frames) - len(unique) - mirrored
+    print(f"    Frames: {len(frames)} ({len(unique)} unique, {duplicates} duplicates, {mirrored} mirrors), pages: {len(images)}")
+    print(f"    Pixels: {source_px} in sources -> {atlas_px} in atlas ({atlas_px / source_px * 100:.1f}%)")
+
+    print()
+    print("Atlas packing complete.")
+
+
+if __name__ == "__main__":
+    main()
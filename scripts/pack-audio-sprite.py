@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Pack the sound effects into a single audio sprite for Phaser.
+
+BootScene fetches and decodes every WAV in client/public/soundeffects on its
+own. This stage joins them into one file plus an offset map, so startup
+needs one request and one decode:
+
+  - every effect is resampled to TARGET_RATE (windowed-sinc low-pass, then
+    linear interpolation) -- the effects are 8-bit-style blips and noise
+    bursts with little energy above 11 kHz
+  - stereo files whose channels are identical (within MONO_TOLERANCE) are
+    downmixed to mono; the sprite is only stereo if a source really is
+  - leading and trailing silence below SILENCE_DB is trimmed, keeping
+    TRIM_PAD_MS around the sound; an effect that is silent throughout is
+    left out with a warning instead of getting a zero-length marker
+  - effects are concatenated in name order with GAP_MS of silence between
+    them, so a marker that stops a few milliseconds late never plays the
+    start of the next effect
+
+The JSON is the audiosprite format Phaser's loader reads: "resources" lists
+the audio URL and "spritemap" maps every effect (named after its file stem)
+to {start, end, loop} in seconds.
+
+Input:  client/public/soundeffects/*.wav (8/16/24/32-bit PCM)
+Output: client/public/audio/sfx_sprite.wav (16-bit PCM)
+        client/public/audio/sfx_sprite.json
+
+Client usage:
+    this.load.audioSprite('sfx', 'audio/sfx_sprite.json');
+    this.sound.playAudioSprite('sfx', 'hurt_1');
+
+Usage:
+    python3 scripts/pack-audio-sprite.py
+"""
+
+import numpy as np
+import json
+import os
+import wave
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+PUBLIC_DIR = os.path.join(PROJECT_ROOT, "client", "public")
+SOUNDEFFECTS_DIR = os.path.join(PUBLIC_DIR, "soundeffects")
+AUDIO_DIR = os.path.join(PUBLIC_DIR, "audio")
+
+SPRITE_NAME = "sfx_sprite"
+TARGET_RATE = 22050     # Hz
+SILENCE_DB = -50.0      # Samples quieter than this (dBFS) count as silence when trimming
+TRIM_PAD_MS = 10        # Kept before the first and after the last audible sample
+GAP_MS = 100            # Silence between effects
+MONO_TOLERANCE = 1 / 256  # Largest L/R difference (full scale = 1) still treated as mono
+SINC_TAPS = 63          # Low-pass filter length used when downsampling
+
+
+# ============================================================
+# WAV I/O
+# ============================================================
+
+def read_wav(path):
+    """Read a PCM WAV as float32 samples in [-1, 1]. Returns ((frames, channels) array, rate)."""
+    with wave.open(path, "rb") as w:
+        channels, width, rate = w.getnchannels(), w.getsampwidth(), w.getframerate()
+        raw = w.readframes(w.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - (1 << 24), ints)
+        samples = ints.astype(np.float32) / (1 << 23)
+    elif width == 4:
+        samples = (np.frombuffer(raw, dtype="<i4").astype(np.float64) / (1 << 31)).astype(np.float32)
+    else:
+        raise ValueError(f"{os.path.basename(path)}: unsupported sample width {width}")
+    return samples.reshape(-1, channels), rate
+
+
+def write_wav(path, samples, rate):
+    """Write (frames, channels) float samples as 16-bit PCM."""
+    ints = np.clip(np.rint(samples * 32767), -32768, 32767).astype("<i2")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(samples.shape[1])
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(ints.tobytes())
+
+
+# ============================================================
+# Processing
+# ============================================================
+
+def downmix(samples):
+    """Collapse channels that carry the same signal to mono; leave real stereo alone."""
+    if samples.shape[1] == 1:
+        return samples
+    spread = np.abs(samples - samples[:, :1]).max() if len(samples) else 0.0
+    if spread <= MONO_TOLERANCE:
+        return samples.mean(axis=1, keepdims=True)
+    return samples
+
+
+def lowpass(samples, cutoff):
+    """Blackman-windowed sinc low-pass; `cutoff` is a fraction of the sample rate (< 0.5)."""
+    n = np.arange(SINC_TAPS) - (SINC_TAPS - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.blackman(SINC_TAPS)
+    kernel /= kernel.sum()
+    return np.stack([np.convolve(samples[:, c], kernel, mode="same") for c in range(samples.shape[1])], axis=1)
+
+
+def resample(samples, rate, target=TARGET_RATE):
+    """Resample (frames, channels) samples from `rate` to `target` Hz."""
+    if rate == target or not len(samples):
+        return samples
+    if target < rate:
+        # Band-limit to the new Nyquist (with some headroom) before decimating
+        samples = lowpass(samples, 0.45 * target / rate)
+    out_len = max(1, int(round(len(samples) * target / rate)))
+    positions = np.arange(out_len) * (rate / target)
+    src = np.arange(len(samples))
+    return np.stack([np.interp(positions, src, samples[:, c]) for c in range(samples.shape[1])], axis=1)
+
+
+def trim_silence(samples, rate):
+    """Cut leading/trailing samples below SILENCE_DB, keeping TRIM_PAD_MS of padding."""
+    threshold = 10 ** (SILENCE_DB / 20)
+    loud = np.flatnonzero(np.abs(samples).max(axis=1) > threshold)
+    if not len(loud):
+        return samples[:0]
+    pad = int(rate * TRIM_PAD_MS / 1000)
+    return samples[max(loud[0] - pad, 0):loud[-1] + 1 + pad]
+
+
+def load_effects():
+    """Read, downmix, resample and trim every audible effect. Returns [(name, samples, source seconds)]."""
+    effects = []
+    for filename in sorted(os.listdir(SOUNDEFFECTS_DIR)):
+        if not filename.lower().endswith(".wav"):
+            continue
+        samples, rate = read_wav(os.path.join(SOUNDEFFECTS_DIR, filename))
+        processed = trim_silence(resample(downmix(samples), rate), TARGET_RATE)
+        if not len(processed):
+            print(f"  WARNING: {filename} is silent (below {SILENCE_DB:.0f} dBFS); left out of the sprite")
+            continue
+        effects.append((os.path.splitext(filename)[0], processed, len(samples) / rate))
+    return effects
+
+
+def build_sprite(effects):
+    """
+    Concatenate effects with GAP_MS of silence between them.
+
+    Returns ((frames, channels) samples, spritemap dict).
+    """
+    channels = max((s.shape[1] for _, s, _ in effects), default=1)
+    gap = np.zeros((int(TARGET_RATE * GAP_MS / 1000), channels), dtype=np.float32)
+
+    parts = []
+    spritemap = {}
+    cursor = 0
+    for name, samples, _ in effects:
+        if samples.shape[1] < channels:
+            samples = np.repeat(samples, channels, axis=1)
+        if parts:
+            parts.append(gap)
+            cursor += len(gap)
+        spritemap[name] = {
+            "start": round(cursor / TARGET_RATE, 4),
+            "end": round((cursor + len(samples)) / TARGET_RATE, 4),
+            "loop": False,
+        }
+        parts.append(samples.astype(np.float32))
+        cursor += len(samples)
+    sprite = np.concatenate(parts) if parts else np.zeros((0, channels), dtype=np.float32)
+    return sprite, spritemap
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def main():
+    print("Packing sound effect sprite...")
+    print()
+
+    os.makedirs(AUDIO_DIR, exist_ok=True)
+    effects = load_effects()
+    sprite, spritemap = build_sprite(effects)
+
+    wav_path = os.path.join(AUDIO_DIR, f"{SPRITE_NAME}.wav")
+    write_wav(wav_path, sprite, TARGET_RATE)
+    print(f"  Created {wav_path} ({len(effects)} effects, {len(sprite) / TARGET_RATE:.2f}s, "
+          f"{sprite.shape[1]} channel(s) @ {TARGET_RATE} Hz)")
+
+    json_path = os.path.join(AUDIO_DIR, f"{SPRITE_NAME}.json")
+    with open(json_path, "w") as f:
+        json.dump({"resources": [f"audio/{SPRITE_NAME}.wav"], "spritemap": spritemap}, f, indent=2)
+    print(f"  Created {json_path}")
+
+    source_bytes = sum(os.path.getsize(os.path.join(SOUNDEFFECTS_DIR, f"{name}.wav")) for name, _, _ in effects)
+    source_seconds = sum(seconds for _, _, seconds in effects)
+    sprite_bytes = os.path.getsize(wav_path)
+    print(f"    Audio: {source_seconds:.2f}s in {len(effects)} files -> {len(sprite) / TARGET_RATE:.2f}s in one")
+    if source_bytes:
+        print(f"    Bytes: {source_bytes} -> {sprite_bytes} ({sprite_bytes / source_bytes * 100:.1f}%)")
+    else:
+        print(f"    Bytes: no effects packed, {sprite_bytes} byte(s) written")
+
+    print()
+    print("Audio sprite packing complete.")
+
+
+if __name__ == "__main__":
+    main()
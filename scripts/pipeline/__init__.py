@@ -0,0 +1,31 @@
+"""
+Asset pipeline entry point.
+
+Runs the scripts in scripts/ as stages of one build. Each stage declares the
+artifacts it consumes and produces (see stages.py). The runner orders the stages
+from those declarations and runs independent ones in parallel. Artifacts that
+are only intermediate results (the 8x44 unified tileset before decorations
+are appended, the decoded tile array after extrusion) are handed over in
+memory instead of being written to and re-read from disk.
+
+The individual scripts still run standalone. The pipeline loads them lazily
+by path, so PIL/NumPy are only imported once a stage actually runs and
+`--help`, `list` and `--dry-run` start instantly.
+
+Builds are byte-reproducible: PNGs go through one fixed encoder, JSON is
+written with sorted keys, and every output's hash is recorded in
+build/output-manifest.json for `verify` (see determinism.py). Decoded PNG
+pixels are cached by content hash in build/decode-cache and memory-mapped by
+later readers (see decode_cache.py).
+
+Usage:
+    python3 -m scripts.pipeline list
+    python3 -m scripts.pipeline build                     # every stage
+    python3 -m scripts.pipeline build bake-static-chunks  # + the stages it needs
+    python3 -m scripts.pipeline build pack-atlas --only   # just this stage, inputs from disk
+    python3 -m scripts.pipeline build --profile --cprofile optimize-pngs
+    python3 -m scripts.pipeline verify [--full]
+    python3 -m scripts.pipeline watch                     # dev loop: rebuild what an edit affects
+    python3 -m scripts.pipeline bench [--quick] [-k resolve_autotile]
+    python3 -m scripts.pipeline bench-compare [--threshold 0.15]
+"""
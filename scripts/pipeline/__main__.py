@@ -0,0 +1,223 @@
+"""Command line for the asset pipeline: `python3 -m scripts.pipeline --help`."""
+
+import argparse
+import contextlib
+import sys
+import time
+
+from .decode_cache import DecodeCache
+from .determinism import DEFAULT_MANIFEST, build_manifest, fixed_png_saves, verify, write_manifest
+from .runner import StageFailed, build, dependencies, plan
+from .stages import STAGES
+
+
+def cmd_list(args):
+    waits = dependencies(STAGES)
+    for stage in STAGES:
+        after = ", ".join(sorted(waits[stage.name])) or "-"
+        print(f"{stage.name:22s} {stage.description}")
+        print(f"{'':22s}   after: {after}")
+        print(f"{'':22s}   makes: {', '.join(stage.outputs)}")
+    return 0
+
+
+def cmd_build(args):
+    try:
+        stages = plan(args.stages, with_deps=not args.only)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    if args.dry_run:
+        waits = dependencies(stages)
+        for stage in stages:
+            after = ", ".join(sorted(waits[stage.name]))
+            print(f"{stage.name}" + (f"  (after {after})" if after else ""))
+        return 0
+
+    profiler = None
+    jobs = args.jobs
+    if args.profile or args.cprofile:
+        from .profiling import DEFAULT_PROFILE_DIR, Profiler
+
+        unknown = [n for n in args.cprofile if n not in {s.name for s in stages}]
+        if unknown:
+            print(f"--cprofile stage(s) not in this build: {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        profiler = Profiler(args.profile_dir or DEFAULT_PROFILE_DIR, args.cprofile)
+        jobs = jobs or 1  # keep process CPU and memory attributable to one stage
+
+    print(f"Building {len(stages)} stage(s)...")
+    print()
+    start = time.perf_counter()
+    cache = None if args.no_decode_cache else DecodeCache()
+    # The fixed encoder goes in first so the profiler's save hook wraps (and restores) it
+    with fixed_png_saves(), cache.installed() if cache else contextlib.nullcontext():
+        if profiler:
+            profiler.start()
+        try:
+            timings = build(stages, jobs=jobs, profiler=profiler)
+        except StageFailed as e:
+            print(f"Build failed: {e}", file=sys.stderr)
+            return 1
+        finally:
+            if profiler:
+                profiler.stop()
+
+    total = time.perf_counter() - start
+    print(f"Pipeline complete: {len(timings)} stage(s) in {total:.2f}s "
+          f"(stage time {sum(timings.values()):.2f}s)")
+
+    if cache:
+        cache.prune()
+        print(f"Decode cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+
+    # Every stage's files, so a partial build refreshes the manifest without dropping entries
+    manifest_path = args.manifest or DEFAULT_MANIFEST
+    manifest = build_manifest(STAGES)
+    write_manifest(manifest, manifest_path)
+    print(f"Manifest: {len(manifest['files'])} file(s) hashed into {manifest_path}")
+
+    if profiler:
+        print()
+        print(profiler.write())
+        print()
+        print(f"Profile written to {profiler.out_dir}")
+    return 0
+
+
+def cmd_verify(args):
+    manifest_path = args.manifest or DEFAULT_MANIFEST
+    start = time.perf_counter()
+    try:
+        checked, hashed, problems = verify(manifest_path, full=args.full)
+    except FileNotFoundError:
+        print(f"No manifest at {manifest_path}; run `build` first", file=sys.stderr)
+        return 2
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for rel, reason in problems:
+        print(f"  {rel}: {reason}")
+    summary = f"{checked} file(s) checked, {hashed} hashed in {elapsed:.0f}ms"
+    if problems:
+        print(f"{len(problems)} file(s) do not match the manifest ({summary})")
+        return 1
+    print(f"All outputs match the manifest ({summary})")
+    return 0
+
+
+def cmd_watch(args):
+    from .watch import POLL_INTERVAL, watch
+
+    cache = None if args.no_decode_cache else DecodeCache()
+    with cache.installed() if cache else contextlib.nullcontext():
+        watch(jobs=args.jobs, interval=args.interval or POLL_INTERVAL, manifest_path=args.manifest or DEFAULT_MANIFEST)
+    return 0
+
+
+def cmd_bench(args):
+    from .bench import DEFAULT_HISTORY, append_history, run_benchmarks
+
+    history = args.history or DEFAULT_HISTORY
+    print("Running benchmarks" + (" (quick)" if args.quick else "") + "...")
+    results = run_benchmarks(args.filter, args.quick)
+    if not results:
+        print(f"No benchmark matches {args.filter!r}", file=sys.stderr)
+        return 2
+    index = append_history(history, results)
+    print()
+    print(f"Recorded run #{index} in {history}")
+    return 0
+
+
+def cmd_bench_compare(args):
+    from .bench import DEFAULT_HISTORY, compare, load_history
+
+    history = args.history or DEFAULT_HISTORY
+    runs = load_history(history)
+    if len(runs) < 2:
+        print(f"Need at least two runs in {history} to compare", file=sys.stderr)
+        return 2
+    try:
+        current, baseline = runs[args.current], runs[args.baseline]
+    except IndexError:
+        print(f"Run index out of range ({len(runs)} runs recorded)", file=sys.stderr)
+        return 2
+
+    lines, regressed = compare(runs, args.current, args.baseline, args.threshold, args.min_delta)
+    print(f"Baseline: {baseline['timestamp']} ({baseline.get('commit') or 'unknown commit'})")
+    print(f"Current:  {current['timestamp']} ({current.get('commit') or 'unknown commit'})")
+    print()
+    print("\n".join(lines))
+    print()
+    if regressed:
+        print(f"{len(regressed)} case(s) regressed by more than {args.threshold * 100:.0f}%")
+        return 1
+    print(f"No regressions beyond {args.threshold * 100:.0f}%")
+    return 0
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog="python3 -m scripts.pipeline", description="Banger asset pipeline")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="List stages with their inputs and outputs")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("build", help="Run stages (default: all) in dependency order")
+    p.add_argument("stages", nargs="*", help="Stage names; their upstream stages run too unless --only")
+    p.add_argument("--only", action="store_true", help="Run just the named stages; inputs come from disk")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="Parallel stages (default: CPU count)")
+    p.add_argument("-n", "--dry-run", action="store_true", help="Print the plan without running it")
+    p.add_argument("--profile", action="store_true",
+                   help="Record per-stage time, memory and PIL I/O; write a Chrome trace and summary")
+    p.add_argument("--cprofile", action="append", default=[], metavar="STAGE",
+                   help="Also dump a cProfile for STAGE (repeatable; implies --profile)")
+    p.add_argument("--profile-dir", default=None, metavar="DIR",
+                   help="Where profile output goes (default: build/pipeline-profile)")
+    p.add_argument("--manifest", default=None, metavar="PATH",
+                   help="Output hash manifest to write (default: build/output-manifest.json)")
+    p.add_argument("--no-decode-cache", action="store_true",
+                   help="Decode every PNG instead of mapping cached pixels from build/decode-cache")
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser("verify", help="Check the generated files against the last build's hash manifest")
+    p.add_argument("--full", action="store_true", help="Re-hash every file, not just those whose size/mtime moved")
+    p.add_argument("--manifest", default=None, metavar="PATH",
+                   help="Manifest to check (default: build/output-manifest.json)")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("watch", help="Poll the source assets and scripts, rebuilding only what an edit affects")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="Parallel stages (default: CPU count)")
+    p.add_argument("--interval", type=float, default=None, metavar="SECONDS",
+                   help="Seconds between polls (default 0.25)")
+    p.add_argument("--manifest", default=None, metavar="PATH",
+                   help="Output hash manifest to keep up to date (default: build/output-manifest.json)")
+    p.add_argument("--no-decode-cache", action="store_true",
+                   help="Decode every PNG instead of mapping cached pixels from build/decode-cache")
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("bench", help="Time the pipeline's hot functions and append the results to the history")
+    p.add_argument("-k", "--filter", default=None, help="Only cases whose name contains this text")
+    p.add_argument("--quick", action="store_true", help="Smallest synthetic sizes and the 2x density only")
+    p.add_argument("--history", default=None, help="History JSON (default: build/bench-history.json)")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("bench-compare", help="Fail when the latest benchmark run regressed")
+    p.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown as a fraction (default 0.15)")
+    p.add_argument("--min-delta", type=float, default=0.0005,
+                   help="Ignore slowdowns smaller than this many seconds (default 0.0005)")
+    p.add_argument("--current", type=int, default=-1, help="Run index to check (default: latest)")
+    p.add_argument("--baseline", type=int, default=-2, help="Run index to compare against (default: previous)")
+    p.add_argument("--history", default=None, help="History JSON (default: build/bench-history.json)")
+    p.set_defaults(func=cmd_bench_compare)
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,372 @@
+"""
+Benchmarks for the hot functions of the asset and map pipeline.
+
+Each case times one function on a real input (the shipped layouts, source
+art and tileset) or a synthetic one at several sizes. Synthetic inputs are
+wall layouts from 50x38 up to 400x400 tiles and tile atlases up to 4096px.
+Inputs are built before timing (and only for cases the `-k` filter keeps)
+and copied per repetition where the function mutates them. A case repeats until it has run for MIN_SECONDS (at least
+MIN_REPS, at most MAX_REPS times) and records the best and median time.
+
+Every run is appended to a JSON history file. `bench-compare` checks the
+latest run against an earlier one and exits non-zero when a case got slower
+than the threshold allows.
+"""
+
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+from .runner import load_script
+from .stages import SCRIPTS_DIR
+
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+DEFAULT_HISTORY = os.path.join(PROJECT_ROOT, "build", "bench-history.json")
+
+MIN_SECONDS = 0.3   # Keep repeating a case until it has run this long
+MIN_REPS = 3
+MAX_REPS = 50
+
+MAP_SIZES = [(50, 38), (100, 76), (200, 150), (400, 400)]
+ATLAS_SIZES = [1024, 2048, 4096]
+DENSITIES = [1, 2, 3]
+TILE = 32
+
+DEFAULT_THRESHOLD = 0.15     # Fail when a case is more than 15% slower
+DEFAULT_MIN_DELTA = 0.0005   # ... and at least this many seconds slower
+
+
+def script(name):
+    return load_script(os.path.join(SCRIPTS_DIR, name))
+
+
+# ============================================================
+# Timing
+# ============================================================
+
+def measure(fn, setup=None):
+    """
+    Time fn(*setup()) repeatedly; setup runs outside the timed region.
+
+    The garbage collector is paused while timing (as timeit does) so
+    collections triggered by earlier cases do not land in later ones.
+    """
+    times = []
+    spent = 0.0
+    sink = io.StringIO()
+    while len(times) < MAX_REPS and (len(times) < MIN_REPS or spent < MIN_SECONDS):
+        args = setup() if setup else ()
+        gc.collect()
+        gc.disable()
+        try:
+            with contextlib.redirect_stdout(sink):
+                start = time.perf_counter()
+                fn(*args)
+                elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        times.append(elapsed)
+        spent += elapsed
+        sink.seek(0)
+        sink.truncate()
+    return {"min": min(times), "median": statistics.median(times), "reps": len(times)}
+
+
+# ============================================================
+# Synthetic inputs
+# ============================================================
+
+def synthetic_walls(arenas, w, h, seed=7):
+    """
+    A walls layer in the shape make_walls_layer() produces: perimeter walls,
+    random wall segments and blocks (as WALL_ID sentinels) and scattered rocks.
+    About 15% of the interior ends up solid.
+    """
+    import random
+
+    rng = random.Random(seed * 100003 + w * 1009 + h)
+    data = [0] * (w * h)
+    for x in range(w):
+        data[x] = data[(h - 1) * w + x] = arenas.WALL_ID
+    for y in range(h):
+        data[y * w] = data[y * w + w - 1] = arenas.WALL_ID
+
+    target = int((w - 2) * (h - 2) * 0.15)
+    placed = 0
+    while placed < target:
+        x, y = rng.randrange(2, w - 2), rng.randrange(2, h - 2)
+        if rng.random() < 0.5:
+            length = rng.randrange(3, 12)
+            horizontal = rng.random() < 0.5
+            cells = [(x + i, y) if horizontal else (x, y + i) for i in range(length)]
+        else:
+            bw, bh = rng.randrange(2, 4), rng.randrange(2, 4)
+            cells = [(x + i, y + j) for j in range(bh) for i in range(bw)]
+        for cx, cy in cells:
+            if 1 <= cx < w - 1 and 1 <= cy < h - 1 and data[cy * w + cx] == 0:
+                data[cy * w + cx] = arenas.WALL_ID
+                placed += 1
+
+    for _ in range((w * h) // 200):
+        x, y = rng.randrange(1, w - 1), rng.randrange(1, h - 1)
+        if data[y * w + x] == 0:
+            data[y * w + x] = rng.choice(sorted(arenas.OBSTACLE_IDS))
+    return data
+
+
+def synthetic_atlas(size, seed=7):
+    """A size x size RGBA atlas of 32px tiles: noise, partly transparent, some tiles empty."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    n = size // TILE
+    px = rng.integers(0, 256, (size, size, 4), dtype=np.uint8)
+    alpha = rng.random((n, n)) < 0.8
+    px[..., 3] = np.where(np.kron(alpha, np.ones((TILE, TILE), dtype=bool)), 255, 0)
+    px[size // 4:size // 2, :, 3] = 0  # a band of fully transparent tiles
+    return px
+
+
+# Shipped layouts: map name -> (theme, layout function name in generate-arenas.py)
+REAL_LAYOUTS = {
+    "hedge_garden": ("hedge", "layout_hedge_garden"),
+    "brick_fortress": ("brick", "layout_brick_fortress"),
+    "timber_yard": ("wood", "layout_timber_yard"),
+}
+
+
+def real_walls(arenas, name):
+    """One shipped layout, resolved as generate_map_json() does (before autotiling)."""
+    theme, layout = REAL_LAYOUTS[name]
+    rocks = {'heavy': arenas.HEAVY_ROCKS[0], 'medium': arenas.MEDIUM_ROCKS[0], 'light': arenas.LIGHT_ROCKS[0]}
+    return arenas.make_walls_layer(arenas.MAP_W, arenas.MAP_H, getattr(arenas, layout), theme, rocks)
+
+
+# ============================================================
+# Cases
+# ============================================================
+
+MAP_FUNCTIONS = ["resolve_autotile", "generate_front_faces", "verify_no_sealed_rooms", "find_safe_spawn"]
+
+
+def map_cases(quick, want):
+    """Cases for the map functions of generate-arenas.py."""
+    # (label, synthetic size or None for a shipped layout), only where some case is wanted
+    inputs = [(name, None) for name in REAL_LAYOUTS]
+    inputs += [(f"synthetic {w}x{h}", (w, h)) for w, h in (MAP_SIZES[:2] if quick else MAP_SIZES)]
+    inputs = [(label, size) for label, size in inputs if any(want(func, label) for func in MAP_FUNCTIONS)]
+    if not inputs:
+        return
+    arenas = script("generate-arenas.py")
+    rules = arenas.load_autotile_rules()
+
+    for label, size in inputs:
+        if size is None:
+            w, h, theme, raw = arenas.MAP_W, arenas.MAP_H, REAL_LAYOUTS[label][0], real_walls(arenas, label)
+        else:
+            w, h = size
+            theme, raw = "brick", synthetic_walls(arenas, w, h)
+        offset = arenas.THEME_OFFSETS[theme]
+        resolved = list(raw)
+        arenas.resolve_autotile(resolved, w, h, rules, offset)
+        region = (1, 1, w - 2, h - 2)
+
+        yield ("resolve_autotile", label,
+               lambda w=w, h=h, offset=offset: lambda data: arenas.resolve_autotile(data, w, h, rules, offset),
+               lambda raw=raw: (list(raw),))
+        yield ("generate_front_faces", label,
+               lambda w=w, h=h, offset=offset, resolved=resolved:
+                   lambda: arenas.generate_front_faces(resolved, w, h, offset),
+               None)
+        yield ("verify_no_sealed_rooms", label,
+               lambda w=w, h=h, resolved=resolved: lambda: arenas.verify_no_sealed_rooms(resolved, w, h),
+               None)
+        # Search the whole interior with a 2-tile buffer
+        yield ("find_safe_spawn", label,
+               lambda w=w, h=h, resolved=resolved, region=region:
+                   lambda: arenas.find_safe_spawn(resolved, w, h, region, buffer=2),
+               None)
+
+
+def tileset_cases(quick, tmp, want):
+    """Cases for tileset building, extrusion and collision rects."""
+    from PIL import Image
+
+    # create_unified_tileset: real source art, decoded once up front
+    if want("create_unified_tileset", "real 8x44"):
+        arenas = script("generate-arenas.py")
+        sources = arenas.load_source_images()
+        for img in sources[:4]:
+            img.load()
+        yield ("create_unified_tileset", "real 8x44",
+               lambda: lambda: arenas.create_unified_tileset(sources[1], sources[2], sources[3], sources[0],
+                                                             sources[4]),
+               None)
+
+    sizes = [size for size in (ATLAS_SIZES[:1] if quick else ATLAS_SIZES)
+             if want("extrude_tileset", f"synthetic {size}px (arrays)")
+             or want("compute_collision_rects", f"synthetic {size}px")]
+    real = want("extrude_tileset", "real 8x46") or want("compute_collision_rects", "real 8x46")
+    if not (sizes or real):
+        return
+    extrude = script("extrude-tileset.py")
+    masks = script("generate-collision-masks.py")
+
+    # extrude_tileset: the whole stage, including PNG I/O, on a copy of the shipped tileset
+    real_tiles = extrude.read_tiles(Image.open(extrude.TILESET_PATH))
+    plain = extrude.build_extruded_atlas(real_tiles, extrude.COLS, 0)
+    plain_path = os.path.join(tmp, "arena_unified.png")
+
+    def extrude_setup():
+        Image.fromarray(plain, "RGBA").save(plain_path)
+        return ()
+
+    def run_extrude():
+        saved = extrude.TILESET_PATH, extrude.LODS_PATH
+        extrude.TILESET_PATH, extrude.LODS_PATH = plain_path, os.path.join(tmp, "lods.json")
+        try:
+            extrude.extrude_tileset()
+        finally:
+            extrude.TILESET_PATH, extrude.LODS_PATH = saved
+
+    yield ("extrude_tileset", "real 8x46", lambda: run_extrude, extrude_setup)
+
+    # compute_collision_rects: real tiles laid out plain, then synthetic atlases
+    atlases = [("real 8x46", plain, extrude.COLS, extrude.ROWS)]
+    for size in sizes:
+        px = synthetic_atlas(size)
+        atlases.append((f"synthetic {size}px", px, size // TILE, size // TILE))
+
+        def extrude_array(px=px, n=size // TILE):
+            tiles = extrude.read_tiles(Image.fromarray(px, "RGBA"), cols=n, rows=n)
+            extrude.build_extruded_atlas(tiles, n, extrude.EXTRUDE)
+            for lod in extrude.LOD_TILE_SIZES:
+                extrude.build_extruded_atlas(extrude.box_downscale(tiles, lod), n, extrude.EXTRUDE)
+
+        yield ("extrude_tileset", f"synthetic {size}px (arrays)", lambda fn=extrude_array: fn, None)
+
+    for label, px, cols, rows in atlases:
+        if not want("compute_collision_rects", label):
+            continue
+        path = os.path.join(tmp, f"collision_{cols}x{rows}.png")
+        Image.fromarray(px, "RGBA").save(path)
+
+        def collision(path=path, cols=cols, rows=rows):
+            saved = masks.COLUMNS, masks.ROWS
+            masks.COLUMNS, masks.ROWS = cols, rows
+            try:
+                masks.compute_collision_rects(path)
+            finally:
+                masks.COLUMNS, masks.ROWS = saved
+
+        yield ("compute_collision_rects", label, lambda fn=collision: fn, None)
+
+
+def frame_cases(quick, want):
+    """Cold character frame generation (layer cache cleared) at every density."""
+    assets = script("generate-assets.py")
+    generators = {
+        "paran": assets.generate_paran_frames,
+        "faran": assets.generate_faran_frames,
+        "baran": assets.generate_baran_frames,
+    }
+    for density in ([assets.DESIGN_DENSITY] if quick else DENSITIES):
+        for name, generate in generators.items():
+            if not want(f"generate_{name}_frames", f"{density}x"):
+                continue
+
+            def setup(density=density):
+                assets.set_density(density)
+                assets._LAYER_CACHE.clear()
+                return ()
+            yield (f"generate_{name}_frames", f"{density}x", lambda fn=generate: fn, setup)
+    assets.set_density(assets.DESIGN_DENSITY)
+
+
+# ============================================================
+# Running + history
+# ============================================================
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(name_filter=None, quick=False):
+    """Run every case whose "function [input]" key contains name_filter. Returns {key: result}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        def want(func, label):
+            return not name_filter or name_filter in f"{func} [{label}]"
+
+        # The generators check want() before building a case's inputs
+        groups = [map_cases(quick, want), tileset_cases(quick, tmp, want), frame_cases(quick, want)]
+        for cases in groups:
+            for func, label, make, setup in cases:
+                key = f"{func} [{label}]"
+                if not want(func, label):
+                    continue
+                result = measure(make(), setup)
+                results[key] = result
+                print(f"  {key:58s} {result['min'] * 1000:10.2f} ms  "
+                      f"(median {result['median'] * 1000:.2f} ms, {result['reps']} reps)")
+    return results
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)["runs"]
+
+
+def append_history(path, results):
+    runs = load_history(path)
+    runs.append({
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPU)",
+        "results": results,
+    })
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"runs": runs}, f, indent=1)
+    return len(runs) - 1
+
+
+def compare(runs, current=-1, baseline=-2, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """
+    Compare two runs' best times case by case.
+
+    A case regresses when it is more than `threshold` (a fraction) and at
+    least `min_delta` seconds slower than the baseline. Returns (report lines,
+    list of regressed keys).
+    """
+    new, old = runs[current]["results"], runs[baseline]["results"]
+    lines = [f"{'case':58s} {'baseline':>10s} {'current':>10s} {'change':>8s}"]
+    regressed = []
+    for key in sorted(set(new) | set(old)):
+        if key not in old or key not in new:
+            where = "new" if key in new else "dropped"
+            lines.append(f"{key:58s} {'':>10s} {'':>10s} {where:>8s}")
+            continue
+        a, b = old[key]["min"], new[key]["min"]
+        change = b / a - 1.0 if a > 0 else 0.0
+        flag = ""
+        if change > threshold and b - a >= min_delta:
+            regressed.append(key)
+            flag = "  REGRESSED"
+        lines.append(f"{key:58s} {a * 1000:8.2f}ms {b * 1000:8.2f}ms {change * 100:+7.1f}%{flag}")
+    return lines, regressed
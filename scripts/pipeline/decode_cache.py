@@ -0,0 +1,136 @@
+"""
+Decoded-image cache for the asset pipeline.
+
+Several stages decode the same PNGs: the wall reference tilesets are read by
+generate-arenas and recolor-variants, and the character sheets written by
+generate-assets are read again by recolor-variants and pack-atlas. While the
+cache is installed, Image.open() on a PNG path inside the project looks the
+file up by the SHA-256 of its bytes in build/decode-cache/. A hit maps the
+stored .npy with np.load(mmap_mode="r") and wraps it in a read-only PIL image
+without copying, so nothing is inflated and every thread or process reading
+the same source shares the same page-cache pages. A miss decodes the PNG
+once and stores its pixels for the next reader.
+
+Pixels are stored as L, RGB or RGBA as decoded; any other mode (palette,
+LA, 16-bit) is stored as RGBA. The scripts convert what they open to RGBA or
+paste it into RGBA canvases, so the result is the same pixels either way.
+A cached image is read-only: PIL copies it on the first in-place edit.
+
+Entries never go stale (the key is the content hash), so prune() only
+bounds the cache size, evicting the least recently used entries.
+"""
+
+import contextlib
+import hashlib
+import os
+import threading
+
+from .determinism import PROJECT_ROOT
+
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, "build", "decode-cache")
+MAX_CACHE_BYTES = 256 << 20
+
+# Array channel count -> PIL mode stored as-is; anything else is stored as RGBA
+CHANNEL_MODES = {1: "L", 3: "RGB", 4: "RGBA"}
+
+
+class DecodeCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.digests = {}  # (path, size, mtime_ns) -> sha256, so unchanged files are hashed once
+        self.hits = 0
+        self.misses = 0
+
+    def _digest(self, path):
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)
+        digest = self.digests.get(key)
+        if digest is None:
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            self.digests[key] = digest
+        return digest
+
+    def pixels(self, path, decode):
+        """
+        Return the pixels of a PNG as a read-only (h, w[, c]) uint8 memmap.
+
+        `decode(path)` is only called on a miss; it must return a PIL image.
+        """
+        import numpy as np
+
+        entry = os.path.join(self.cache_dir, self._digest(path) + ".npy")
+        try:
+            pixels = np.load(entry, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            pixels = None
+        if pixels is not None:
+            os.utime(entry)  # recency for prune()
+            with self.lock:
+                self.hits += 1
+            return pixels
+
+        with decode(path) as img:
+            if img.mode not in CHANNEL_MODES.values():
+                img = img.convert("RGBA")
+            arr = np.asarray(img)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Unique temp name + atomic rename: concurrent writers of one entry are harmless
+        tmp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, entry)
+        with self.lock:
+            self.misses += 1
+        return np.load(entry, mmap_mode="r")
+
+    def image(self, path, decode):
+        """PIL image backed directly by the cached pixels (no copy)."""
+        from PIL import Image
+
+        pixels = self.pixels(path, decode)
+        mode = CHANNEL_MODES[pixels.shape[2] if pixels.ndim == 3 else 1]
+        return Image.frombuffer(mode, (pixels.shape[1], pixels.shape[0]), pixels, "raw", mode, 0, 1)
+
+    @contextlib.contextmanager
+    def installed(self):
+        """Serve Image.open() of project PNG paths from the cache while active."""
+        from PIL import Image
+
+        original_open = Image.open
+        root = os.path.join(PROJECT_ROOT, "")
+        cache = self
+
+        def open_cached(fp, mode="r", formats=None):
+            if isinstance(fp, (str, os.PathLike)) and mode == "r":
+                path = os.path.abspath(os.fspath(fp))
+                if path.startswith(root) and path.lower().endswith(".png") \
+                        and not path.startswith(os.path.join(cache.cache_dir, "")):
+                    return cache.image(path, lambda p: original_open(p, mode, formats))
+            return original_open(fp, mode, formats)
+
+        Image.open = open_cached
+        try:
+            yield self
+        finally:
+            Image.open = original_open
+
+    def prune(self, max_bytes=MAX_CACHE_BYTES):
+        """Delete the least recently used entries until the cache fits max_bytes. Returns the count removed."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            st = os.stat(path)
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,210 @@
+"""
+Byte-reproducible build outputs and the output hash manifest.
+
+During `build` every generated file is written in a canonical form, so
+identical inputs give identical bytes on any machine:
+
+  - PNG saves through PIL are encoded by one fixed encoder (optimize-pngs.py's
+    writer: exact palette when possible, adaptive row filters, zlib level 9,
+    no ancillary chunks) instead of PIL's version-dependent PNG plugin.
+  - JSON outputs are rewritten with sorted keys, two-space indentation,
+    ", "/": " separators and a trailing newline after their stage finishes,
+    so later stages already see the canonical bytes.
+  - The global `random` and `numpy.random` generators are reseeded from the
+    stage name before every stage. The scripts already draw from their own
+    seeded random.Random instances; this only pins down code that does not.
+
+After the build, the manifest lists every output file (the `files` globs of
+every stage) with its size and SHA-256. `verify` compares the tree with it.
+Each entry also stores the file's mtime, so unchanged files are checked with
+a single stat() call and only files whose size or mtime moved are re-hashed.
+"""
+
+import contextlib
+import glob
+import hashlib
+import json
+import os
+import random
+import struct
+import sys
+import zlib
+
+from .stages import SCRIPTS_DIR
+
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+DEFAULT_MANIFEST = os.path.join(PROJECT_ROOT, "build", "output-manifest.json")
+
+PNG_LEVEL = 9
+
+
+# ============================================================
+# Canonical encoders
+# ============================================================
+
+def canonical_json(obj):
+    """Serialize an object as canonical JSON bytes."""
+    return (json.dumps(obj, indent=2, sort_keys=True) + "\n").encode()
+
+
+def canonicalize_json_file(path):
+    """Rewrite a JSON file in canonical form. Returns True if its bytes changed."""
+    with open(path, "rb") as f:
+        data = f.read()
+    canonical = canonical_json(json.loads(data))
+    if canonical == data:
+        return False
+    with open(path, "wb") as f:
+        f.write(canonical)
+    return True
+
+
+def fixed_png_bytes(encoder, rgba):
+    """Encode an (h, w, 4) array with fixed settings using optimize-pngs.py's writer."""
+    (w, h, depth, color_type), lines, bpp, extra_chunks = encoder.prepare_image(rgba)
+    raw = encoder.filter_rows(lines, bpp)[encoder.FILTER_ADAPTIVE].tobytes()
+    idat = encoder.deflate(raw, PNG_LEVEL, zlib.Z_DEFAULT_STRATEGY)
+    header = struct.pack(">IIBBBBB", w, h, depth, color_type, 0, 0, 0)
+    return b"".join([
+        encoder.PNG_SIGNATURE,
+        encoder.png_chunk(b"IHDR", header),
+        *extra_chunks,
+        encoder.png_chunk(b"IDAT", idat),
+        encoder.png_chunk(b"IEND", b""),
+    ])
+
+
+@contextlib.contextmanager
+def fixed_png_saves():
+    """Route PIL's PNG saves to file paths through fixed_png_bytes() while active."""
+    import numpy as np
+    from PIL import Image
+
+    from .runner import load_script
+
+    encoder = load_script(os.path.join(SCRIPTS_DIR, "optimize-pngs.py"))
+    original_save = Image.Image.save
+
+    def save(self, fp, format=None, **params):
+        is_path = isinstance(fp, (str, os.PathLike))
+        is_png = (format or "").upper() == "PNG" or (
+            format is None and is_path and os.fspath(fp).lower().endswith(".png"))
+        if not (is_path and is_png and self.mode in encoder.LOSSLESS_MODES):
+            return original_save(self, fp, format, **params)
+        data = fixed_png_bytes(encoder, np.ascontiguousarray(self.convert("RGBA")))
+        with open(fp, "wb") as f:
+            f.write(data)
+
+    Image.Image.save = save
+    try:
+        yield
+    finally:
+        Image.Image.save = original_save
+
+
+def seed_stage(name):
+    """Reseed the global RNGs from a stage name (str seeds hash the same in every process)."""
+    random.seed(name)
+    np = sys.modules.get("numpy")
+    if np is not None:
+        np.random.seed(zlib.crc32(name.encode()))
+
+
+# ============================================================
+# Output files + manifest
+# ============================================================
+
+def stage_files(stage):
+    """Existing files matching a stage's output globs, as sorted '/'-separated project paths."""
+    found = set()
+    for pattern in stage.files:
+        for path in glob.glob(os.path.join(PROJECT_ROOT, pattern), recursive=True):
+            if os.path.isfile(path):
+                found.add(os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/"))
+    return sorted(found)
+
+
+def canonicalize_stage(stage):
+    """Rewrite a stage's JSON outputs canonically. Returns the number of files changed."""
+    if not stage.rewrite_json:
+        return 0
+    changed = 0
+    for rel in stage_files(stage):
+        if rel.endswith(".json"):
+            changed += canonicalize_json_file(os.path.join(PROJECT_ROOT, rel))
+    return changed
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def build_manifest(stages):
+    """Hash every output file of the given stages."""
+    files = {}
+    for stage in stages:
+        for rel in stage_files(stage):
+            path = os.path.join(PROJECT_ROOT, rel)
+            st = os.stat(path)
+            files[rel] = {"stage": stage.name, "bytes": st.st_size, "sha256": file_sha256(path),
+                          "mtimeNs": st.st_mtime_ns}
+    return {"files": files}
+
+
+def write_manifest(manifest, path=DEFAULT_MANIFEST):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(canonical_json(manifest))
+
+
+def refresh_manifest(stages, path=DEFAULT_MANIFEST):
+    """
+    Re-hash the given stages' outputs in an existing manifest, keeping every other entry.
+
+    Returns the number of entries written, or None if there is no manifest yet.
+    """
+    try:
+        with open(path) as f:
+            files = json.load(f)["files"]
+    except FileNotFoundError:
+        return None
+    names = {stage.name for stage in stages}
+    fresh = build_manifest(stages)["files"]
+    files = {rel: entry for rel, entry in files.items() if entry["stage"] not in names}
+    files.update(fresh)
+    write_manifest({"files": files}, path)
+    return len(fresh)
+
+
+def verify(path=DEFAULT_MANIFEST, full=False):
+    """
+    Check the tree against a manifest.
+
+    Files whose size and mtime match the manifest are trusted unless `full`.
+    Returns (checked count, hashed count, problems as (path, reason) pairs).
+    """
+    with open(path) as f:
+        files = json.load(f)["files"]
+
+    problems = []
+    hashed = 0
+    for rel, entry in files.items():
+        file_path = os.path.join(PROJECT_ROOT, rel)
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            problems.append((rel, "missing"))
+            continue
+        if st.st_size != entry["bytes"]:
+            problems.append((rel, f"size {st.st_size} != {entry['bytes']}"))
+            continue
+        if not full and st.st_mtime_ns == entry.get("mtimeNs"):
+            continue
+        hashed += 1
+        if file_sha256(file_path) != entry["sha256"]:
+            problems.append((rel, "content differs"))
+    return len(files), hashed, problems
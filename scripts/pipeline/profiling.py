@@ -0,0 +1,235 @@
+"""
+Per-stage profiling for the asset pipeline (`build --profile`).
+
+For every stage this records:
+  - wall time and CPU time (process CPU, so the stage's own worker threads count)
+  - peak traced memory (tracemalloc: Python objects and NumPy buffers;
+    PIL's internal image storage is not traced)
+  - PIL decodes and encodes, each with its file, duration and size
+
+Process-wide CPU and memory are only attributable to one stage when stages
+do not overlap, so --profile runs one stage at a time unless --jobs is
+given.
+
+Results go to the profile directory:
+  trace.json          Chrome trace (chrome://tracing, ui.perfetto.dev): one
+                      slice per stage with a slice per PIL decode/encode
+                      nested inside it
+  summary.txt         the per-stage table printed at the end of the build,
+                      plus the slowest output files
+  <stage>.prof        cProfile dump for each --cprofile stage (+ .txt top list)
+"""
+
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_PROFILE_DIR = os.path.join(PROJECT_ROOT, "build", "pipeline-profile")
+
+TOP_FILES = 15       # Slowest PIL encodes/decodes listed in summary.txt
+CPROFILE_LINES = 40  # Functions listed in <stage>.cprofile.txt
+
+
+class Profiler:
+    def __init__(self, out_dir=DEFAULT_PROFILE_DIR, cprofile_stages=()):
+        self.out_dir = out_dir
+        self.cprofile_stages = set(cprofile_stages)
+        self.origin = time.perf_counter()
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.active = []      # Stage names currently running
+        self.stages = {}      # name -> metrics dict
+        self.events = []      # Chrome trace events
+        self.files = []       # (stage, kind, path, seconds, bytes)
+        self.thread_ids = {}
+        self._unpatch = None
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+
+    def start(self):
+        tracemalloc.start()
+        self._patch_pil()
+
+    def stop(self):
+        if self._unpatch:
+            self._unpatch()
+            self._unpatch = None
+        tracemalloc.stop()
+
+    def _us(self, t):
+        return round((t - self.origin) * 1e6)
+
+    def _tid(self):
+        ident = threading.get_ident()
+        with self.lock:
+            if ident not in self.thread_ids:
+                self.thread_ids[ident] = len(self.thread_ids)
+            return self.thread_ids[ident]
+
+    def _current_stage(self):
+        stage = getattr(self.local, "stage", None)
+        if stage is None and len(self.active) == 1:
+            stage = self.active[0]  # a stage's own worker thread
+        return stage or "(none)"
+
+    # ------------------------------------------------------------
+    # Stage scope
+    # ------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Measure one stage running on the current thread."""
+        with self.lock:
+            self.active.append(name)
+        self.local.stage = name
+        metrics = {"decodes": 0, "encodes": 0, "decodeSeconds": 0.0, "encodeSeconds": 0.0}
+        self.stages[name] = metrics
+
+        profile = cProfile.Profile() if name in self.cprofile_stages else None
+        tracemalloc.reset_peak()
+        base_mem = tracemalloc.get_traced_memory()[0]
+        cpu = time.process_time()
+        start = time.perf_counter()
+        if profile:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            end = time.perf_counter()
+            metrics["wall"] = end - start
+            metrics["cpu"] = time.process_time() - cpu
+            metrics["peakBytes"] = max(tracemalloc.get_traced_memory()[1] - base_mem, 0)
+            self.local.stage = None
+            with self.lock:
+                self.active.remove(name)
+                self.events.append({
+                    "name": name, "cat": "stage", "ph": "X", "pid": 0, "tid": self._tid_unlocked(),
+                    "ts": self._us(start), "dur": round((end - start) * 1e6),
+                    "args": {"cpuMs": round(metrics["cpu"] * 1000, 1),
+                             "peakKiB": metrics["peakBytes"] // 1024,
+                             "decodes": metrics["decodes"], "encodes": metrics["encodes"]},
+                })
+            if profile:
+                self._dump_cprofile(name, profile)
+
+    def _tid_unlocked(self):
+        ident = threading.get_ident()
+        if ident not in self.thread_ids:
+            self.thread_ids[ident] = len(self.thread_ids)
+        return self.thread_ids[ident]
+
+    # ------------------------------------------------------------
+    # PIL instrumentation
+    # ------------------------------------------------------------
+
+    def _record_file(self, kind, path, start, end, size):
+        stage = self._current_stage()
+        tid = self._tid()
+        with self.lock:
+            metrics = self.stages.get(stage)
+            if metrics is not None:
+                metrics[kind + "s"] += 1
+                metrics[kind + "Seconds"] += end - start
+            self.files.append((stage, kind, path, end - start, size))
+            self.events.append({
+                "name": os.path.basename(path) if path else kind, "cat": kind, "ph": "X", "pid": 0,
+                "tid": tid, "ts": self._us(start), "dur": round((end - start) * 1e6),
+                "args": {"stage": stage, "path": path, "bytes": size},
+            })
+
+    def _patch_pil(self):
+        from PIL import Image, ImageFile
+
+        profiler = self
+        original_load = ImageFile.ImageFile.load
+        original_save = Image.Image.save
+
+        def load(self, *args, **kwargs):
+            # Only the first load() decodes (tile is cleared once decoded)
+            if not getattr(self, "tile", None):
+                return original_load(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return original_load(self, *args, **kwargs)
+            finally:
+                path = getattr(self, "filename", "") or ""
+                size = os.path.getsize(path) if path and os.path.exists(path) else 0
+                profiler._record_file("decode", path, start, time.perf_counter(), size)
+
+        def save(self, fp, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original_save(self, fp, *args, **kwargs)
+            finally:
+                path = os.fspath(fp) if isinstance(fp, (str, os.PathLike)) else ""
+                size = os.path.getsize(path) if path and os.path.exists(path) else 0
+                profiler._record_file("encode", path, start, time.perf_counter(), size)
+
+        ImageFile.ImageFile.load = load
+        Image.Image.save = save
+
+        def unpatch():
+            ImageFile.ImageFile.load = original_load
+            Image.Image.save = original_save
+        self._unpatch = unpatch
+
+    # ------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------
+
+    def _dump_cprofile(self, name, profile):
+        os.makedirs(self.out_dir, exist_ok=True)
+        prof_path = os.path.join(self.out_dir, f"{name}.prof")
+        profile.dump_stats(prof_path)
+        text = io.StringIO()
+        pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(CPROFILE_LINES)
+        with open(os.path.join(self.out_dir, f"{name}.cprofile.txt"), "w") as f:
+            f.write(text.getvalue())
+
+    def summary(self):
+        """Per-stage table (slowest first) plus the slowest PIL encodes/decodes."""
+        lines = [f"{'stage':22s} {'wall s':>8s} {'cpu s':>8s} {'peak MiB':>9s} "
+                 f"{'decodes':>8s} {'dec s':>7s} {'encodes':>8s} {'enc s':>7s}"]
+        ordered = sorted(self.stages.items(), key=lambda kv: -kv[1].get("wall", 0.0))
+        for name, m in ordered:
+            lines.append(f"{name:22s} {m.get('wall', 0):8.2f} {m.get('cpu', 0):8.2f} "
+                         f"{m.get('peakBytes', 0) / 2**20:9.1f} {m['decodes']:8d} {m['decodeSeconds']:7.2f} "
+                         f"{m['encodes']:8d} {m['encodeSeconds']:7.2f}")
+        total_wall = sum(m.get("wall", 0) for m in self.stages.values())
+        total_cpu = sum(m.get("cpu", 0) for m in self.stages.values())
+        lines.append(f"{'total':22s} {total_wall:8.2f} {total_cpu:8.2f}")
+
+        slow = sorted(self.files, key=lambda f: -f[3])[:TOP_FILES]
+        if slow:
+            lines.append("")
+            lines.append(f"Slowest PIL decodes/encodes (of {len(self.files)}):")
+            for stage, kind, path, seconds, size in slow:
+                rel = os.path.relpath(path, PROJECT_ROOT) if path else "(stream)"
+                lines.append(f"  {seconds * 1000:8.1f} ms  {kind:6s} {size:>9d} B  {stage:20s} {rel}")
+        return "\n".join(lines)
+
+    def write(self):
+        """Write trace.json and summary.txt. Returns the summary text."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        events = list(self.events)
+        for ident, tid in self.thread_ids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 0, "tid": tid,
+                           "args": {"name": f"worker-{tid}"}})
+        with open(os.path.join(self.out_dir, "trace.json"), "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+        text = self.summary()
+        with open(os.path.join(self.out_dir, "summary.txt"), "w") as f:
+            f.write(text + "\n")
+        return text
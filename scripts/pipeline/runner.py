@@ -0,0 +1,240 @@
+"""
+Dependency-ordered, parallel stage execution.
+
+Stages run on a thread pool as soon as every stage producing one of their
+inputs has finished. NumPy, zlib and PIL's codecs release the GIL for most of
+their work, so independent stages overlap. Each stage's printed output is
+buffered and written in one block when the stage ends, so parallel stages
+do not interleave their logs.
+
+Before a stage runs the global RNGs are reseeded from its name, and after it
+finishes its JSON outputs are rewritten canonically (see determinism.py).
+"""
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import threading
+import time
+import traceback
+
+from .determinism import canonicalize_stage, seed_stage
+from .stages import STAGES, STAGES_BY_NAME, TRANSIENT_ARTIFACTS
+
+_MODULES = {}
+_MODULES_LOCK = threading.Lock()
+
+
+# ============================================================
+# Script loading
+# ============================================================
+
+def load_script(path):
+    """
+    Import a (hyphenated) script by path, once per process.
+
+    The script's directory goes on sys.path, as it does when the script runs
+    directly, so shared helper modules next to it (tile_atlas.py) import.
+    """
+    with _MODULES_LOCK:
+        if path not in _MODULES:
+            script_dir = os.path.dirname(path)
+            if script_dir not in sys.path:
+                sys.path.append(script_dir)
+            stem = os.path.splitext(os.path.basename(path))[0]
+            spec = importlib.util.spec_from_file_location(f"pipeline_{stem.replace('-', '_')}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _MODULES[path] = module
+        return _MODULES[path]
+
+
+def forget_script(path):
+    """Drop a loaded script so the next load_script() re-imports it from disk."""
+    with _MODULES_LOCK:
+        _MODULES.pop(path, None)
+
+
+# ============================================================
+# Output capture
+# ============================================================
+
+class StageOutput(io.TextIOBase):
+    """sys.stdout replacement that routes each stage thread's writes into its own buffer."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def begin(self):
+        self.local.buffer = io.StringIO()
+
+    def end(self):
+        text = self.local.buffer.getvalue()
+        self.local.buffer = None
+        return text
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is None:
+            return self.stream.write(text)
+        return buffer.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+# ============================================================
+# Planning
+# ============================================================
+
+def producers():
+    """Map each artifact name to the stage producing it."""
+    return {artifact: stage.name for stage in STAGES for artifact in stage.outputs}
+
+
+def plan(names=None, with_deps=True):
+    """
+    Return the stages to run, in declaration order.
+
+    With no names every stage runs. Otherwise the named stages run, plus
+    (with_deps) every stage they transitively depend on.
+    """
+    if not names:
+        return list(STAGES)
+    unknown = [n for n in names if n not in STAGES_BY_NAME]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+
+    selected = set(names)
+    if with_deps:
+        made_by = producers()
+        pending = list(names)
+        while pending:
+            for artifact in STAGES_BY_NAME[pending.pop()].inputs:
+                dep = made_by.get(artifact)
+                if dep and dep not in selected:
+                    selected.add(dep)
+                    pending.append(dep)
+    return [stage for stage in STAGES if stage.name in selected]
+
+
+def downstream(names):
+    """
+    Return the named stages plus every stage that transitively consumes their
+    outputs, in declaration order.
+
+    Producers of transient inputs (see TRANSIENT_ARTIFACTS) are added too,
+    since those inputs cannot be read back from disk. Their other outputs
+    come out unchanged, so the stages consuming those are not added.
+    """
+    affected = set(names)
+    for stage in STAGES:
+        if any(a in stage.inputs for s in STAGES if s.name in affected for a in s.outputs):
+            affected.add(stage.name)
+
+    made_by = producers()
+    selected = set(affected)
+    pending = list(affected)
+    while pending:
+        for artifact in STAGES_BY_NAME[pending.pop()].inputs:
+            dep = made_by.get(artifact)
+            if artifact in TRANSIENT_ARTIFACTS and dep not in selected:
+                selected.add(dep)
+                pending.append(dep)
+    return [stage for stage in STAGES if stage.name in selected]
+
+
+def dependencies(stages):
+    """Map each planned stage name to the planned stages it must wait for."""
+    made_by = producers()
+    names = {stage.name for stage in stages}
+    return {stage.name: {made_by[a] for a in stage.inputs if made_by.get(a) in names} for stage in stages}
+
+
+# ============================================================
+# Execution
+# ============================================================
+
+class StageFailed(Exception):
+    def __init__(self, name, log):
+        super().__init__(f"stage {name} failed")
+        self.log = log
+
+
+def run_stage(stage, artifacts, consumed, output, profiler=None):
+    """Load and run one stage. Returns (outputs, seconds, log text)."""
+    output.begin()
+    start = time.perf_counter()
+    try:
+        inputs = {a: artifacts.get(a) for a in stage.inputs}
+        module = load_script(stage.script)
+        scope = profiler.stage(stage.name) if profiler else contextlib.nullcontext()
+        seed_stage(stage.name)
+        with scope:
+            produced = stage.run(module, inputs, consumed) or {}
+        canonicalize_stage(stage)
+    except Exception:
+        traceback.print_exc(file=sys.stdout)
+        raise StageFailed(stage.name, output.end())
+    log = output.end()
+    return produced, time.perf_counter() - start, log
+
+
+def build(stages, jobs=None, profiler=None):
+    """
+    Run the planned stages, independent ones in parallel.
+
+    Stops scheduling after the first failure and raises StageFailed once
+    running stages have finished; the failing stage's log and traceback are
+    printed. Returns {stage name: seconds}. With a profiler,
+    each stage run (not the script import) is measured by it.
+    """
+    waits = dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+    consumed = {a for stage in stages for a in stage.inputs}
+    artifacts = {}
+    timings = {}
+    done = set()
+    failure = None
+
+    output = StageOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            running = {}
+            while True:
+                if failure is None:
+                    for name, deps in waits.items():
+                        if name not in done and name not in running.values() and deps <= done:
+                            future = pool.submit(run_stage, by_name[name], artifacts, consumed, output, profiler)
+                            running[future] = name
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        produced, seconds, log = future.result()
+                    except StageFailed as e:
+                        failure = failure or e
+                        print(f"=== {name} FAILED")
+                        output.stream.write(e.log)
+                        print()
+                        continue
+                    artifacts.update(produced)
+                    timings[name] = seconds
+                    done.add(name)
+                    print(f"=== {name} ({seconds:.2f}s)")
+                    output.stream.write(log)
+                    print()
+    finally:
+        sys.stdout = output.stream
+
+    if failure is not None:
+        raise failure
+    return timings
@@ -0,0 +1,185 @@
+"""
+Stage declarations for the asset pipeline.
+
+A stage wraps one script in scripts/. `inputs` and `outputs` name artifacts;
+a stage runs after every stage that produces one of its inputs. Each `run`
+function receives the loaded script module, the input artifacts that were
+produced in memory during this build (missing ones are None, so the script
+falls back to reading the file), and the set of artifacts some later stage
+in the plan will consume. It returns the artifacts it hands on.
+
+`files` are globs for the files a stage writes, relative to `files_root`
+(client/public unless the stage writes elsewhere); they feed the output
+manifest and JSON canonicalization in determinism.py.
+`sources` are globs (relative to the project root) for the hand-made inputs
+a stage reads; `watch` reruns the stage when one of them, or its script,
+changes. `helpers` name the shared modules in scripts/ the script imports
+(tile_atlas.py), which `watch` treats like the script itself.
+
+generate-collision-masks.py is not a stage: it reads the retired per-theme
+tilesets (arena_hedge.png, ...), which nothing produces any more.
+"""
+
+import os
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+UNIFIED_TILE_COUNT = 368
+
+# Artifacts that only exist in memory during a build (arena_unified.png on disk
+# is already extruded), so a stage consuming one must run with its producer
+TRANSIENT_ARTIFACTS = {"tileset.base", "tileset.decorated"}
+
+
+class Stage:
+    def __init__(self, name, script, run, inputs=(), outputs=(), files=(), sources=(), helpers=(), description="",
+                 rewrite_json=True, files_root=os.path.join("client", "public")):
+        self.name = name
+        self.script = os.path.join(SCRIPTS_DIR, script)
+        self.helpers = [os.path.join(SCRIPTS_DIR, h) for h in helpers]
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.files = [os.path.join(files_root, f) for f in files]
+        self.sources = list(sources)
+        self.description = description
+        self.rewrite_json = rewrite_json
+
+
+# ============================================================
+# Stage runners
+# ============================================================
+
+def _main(module, inputs, consumed):
+    """Run a script's main() with no in-memory hand-over."""
+    module.main()
+    return {}
+
+
+def _generate_arenas(module, inputs, consumed):
+    # The 8x44 tileset is only an intermediate when decorations are appended in this build
+    in_memory = "tileset.base" in consumed
+    return {"tileset.base": module.main(write_tileset=not in_memory)}
+
+
+def _append_decorations(module, inputs, consumed):
+    in_memory = "tileset.decorated" in consumed
+    return {"tileset.decorated": module.main(inputs.get("tileset.base"), save=not in_memory)}
+
+
+def _extrude_tileset(module, inputs, consumed):
+    return {"tileset": module.extrude_tileset(inputs.get("tileset.decorated"))}
+
+
+def _dedupe_tileset(module, inputs, consumed):
+    module.main(inputs.get("tileset"))
+    return {}
+
+
+def _recolor_variants(module, inputs, consumed):
+    module.main(inputs.get("tileset"))
+    return {}
+
+
+def _tile_cache(tiles):
+    """Seed a per-map tile cache with the unified tileset decoded during this build."""
+    if tiles is None:
+        return None
+    import numpy as np
+
+    stack = np.zeros((len(tiles) + 1,) + tiles.shape[1:], dtype=np.uint8)
+    stack[1:] = tiles
+    path = os.path.join(os.path.dirname(SCRIPTS_DIR), "client", "public", "tilesets", "arena_unified.png")
+    return {(os.path.normpath(path), len(tiles)): stack}
+
+
+def _with_tile_cache(module, inputs, consumed):
+    module.main(_tile_cache(inputs.get("tileset")))
+    return {}
+
+
+# ============================================================
+# Stage graph
+# ============================================================
+
+STAGES = [
+    Stage("generate-assets", "generate-assets.py", _main,
+          outputs=["sprites", "legacy-tilesets"],
+          files=["sprites/paran*.png", "sprites/faran*.png", "sprites/baran*.png", "sprites/projectiles*.png",
+                 "sprites/particle*.png", "sprites/densities.json", "tilesets/solarpunk_*.png"],
+          description="Character, projectile and particle sheets at every density"),
+    Stage("generate-arenas", "generate-arenas.py", _generate_arenas,
+          outputs=["tileset.base"],
+          sources=["assets/tilesets/32x32 topdown tileset Spreadsheet V1-1.png", "assets/tilesets/walls/*",
+                   "assets/tilesets/obstacles/Rock*_3.png"],
+          helpers=["tile_atlas.py"],
+          description="Unified 8x44 tileset (arena maps go to build/generated-maps)"),
+    Stage("append-decorations", "append-decorations.py", _append_decorations,
+          inputs=["tileset.base"], outputs=["tileset.decorated"],
+          sources=["assets/tilesets/decorations.png"],
+          description="Decoration tiles appended as rows 44-45"),
+    Stage("extrude-tileset", "extrude-tileset.py", _extrude_tileset,
+          inputs=["tileset.decorated"], outputs=["tileset", "tileset-lods"],
+          files=["tilesets/arena_unified.png", "tilesets/arena_unified_16.png", "tilesets/arena_unified_8.png",
+                 "tilesets/arena_unified_lods.json"],
+          helpers=["tile_atlas.py"],
+          description="Extruded arena_unified.png plus 16px/8px LOD atlases"),
+    Stage("dedupe-tileset", "dedupe-tileset.py", _dedupe_tileset,
+          inputs=["tileset"], outputs=["tileset-dedup"],
+          files=["tilesets/arena_unified_dedup.png", "tilesets/arena_unified_aliases.json"],
+          helpers=["tile_atlas.py"],
+          description="Deduplicated tileset and legacy-ID alias table"),
+    Stage("build-map-atlases", "build-map-atlases.py", _with_tile_cache,
+          inputs=["tileset"], outputs=["compact-maps"],
+          files=["maps/compact/*.json", "tilesets/compact/*.png"],
+          sources=["client/public/maps/*.json"],
+          helpers=["tile_atlas.py"],
+          description="Per-map compact atlases and remapped maps"),
+    Stage("bake-static-chunks", "bake-static-chunks.py", _with_tile_cache,
+          inputs=["tileset"], outputs=["baked-chunks"],
+          files=["tilesets/baked/*/manifest.json", "tilesets/baked/*/*_*_*.png"],
+          sources=["client/public/maps/*.json"],
+          helpers=["tile_atlas.py"],
+          description="Static layers baked into chunk PNGs"),
+    Stage("bake-shadow-overlay", "bake-shadow-overlay.py", _main,
+          outputs=["baked-shadows"],
+          files=["tilesets/baked/*/shadow.png", "tilesets/baked/rock_shadow.png", "tilesets/baked/shadows.json"],
+          sources=["client/public/maps/*.json"],
+          helpers=["tile_atlas.py"],
+          description="Contact-shadow overlays per map"),
+    Stage("render-minimaps", "render-minimaps.py", _main,
+          outputs=["minimaps"],
+          files=["images/minimaps/*"],
+          sources=["client/public/maps/*.json"],
+          helpers=["tile_atlas.py"],
+          description="Minimap thumbnails per map"),
+    Stage("recolor-variants", "recolor-variants.py", _recolor_variants,
+          inputs=["sprites", "tileset"], outputs=["skins", "wall-themes"],
+          files=["sprites/skins/*", "tilesets/arena_unified_themes.png", "tilesets/arena_themes.json"],
+          sources=["assets/tilesets/walls/*"],
+          helpers=["tile_atlas.py"],
+          description="Character skins and extra wall themes"),
+    Stage("pack-atlas", "pack-atlas.py", _main,
+          inputs=["sprites"], outputs=["atlas"],
+          files=["sprites/atlas/*"],
+          sources=["client/public/icons/**/*.png", "assets/aseprite/*.aseprite"],
+          description="Sprite, icon and Aseprite multiatlas"),
+    Stage("pack-audio-sprite", "pack-audio-sprite.py", _main,
+          outputs=["audio-sprite"],
+          files=["audio/sfx_sprite.wav", "audio/sfx_sprite.json"],
+          sources=["client/public/soundeffects/*.wav"],
+          description="Sound effects packed into one audio sprite"),
+    Stage("optimize-pngs", "optimize-pngs.py", _main,
+          inputs=["sprites", "legacy-tilesets", "tileset", "tileset-lods", "tileset-dedup",
+                  "compact-maps", "baked-chunks", "baked-shadows", "minimaps", "skins",
+                  "wall-themes", "atlas"],
+          outputs=["optimized-pngs"],
+          description="Lossless PNG re-encoding"),
+    Stage("publish-assets", "publish-assets.py", _main,
+          inputs=["optimized-pngs", "audio-sprite"], outputs=["published"],
+          sources=["client/public/maps/*.json"],
+          files=["published/**"], files_root="build", rewrite_json=False,
+          description="Content-hashed copies and asset manifest"),
+]
+
+STAGES_BY_NAME = {stage.name: stage for stage in STAGES}
@@ -0,0 +1,256 @@
+"""
+Watch mode: rebuild only what an edited input affects.
+
+The watcher polls the hand-made inputs (every stage's `sources` plus the
+stage scripts and their shared helper modules) with os.stat(). A file whose size or mtime moved
+is re-hashed, and only a changed SHA-256 counts as an edit, so saving a file
+without changing it, or a checkout that only touches mtimes, rebuilds
+nothing.
+
+Edits map to the smallest rebuild that keeps client/public consistent:
+
+  - A rock sprite (assets/tilesets/obstacles/Rock<N>_3.png) only patches that
+    tile: its cell in arena_unified.png, the LOD atlases and the wall-theme
+    atlas, the dedup atlas, and the compact map and atlas of every map
+    placing the rock. Baked chunks and minimaps leave rocks out, so they stay
+    as they are. The maps themselves are authored in Tiled and never
+    written; their hand-tuned collisionOverrides carry over into the compact
+    maps exactly as in a full build.
+  - Any other input reruns the stages reading it plus everything downstream
+    (see runner.downstream()). An edited script is re-imported first; an
+    edited helper module re-imports every script using it.
+
+Rebuilds save PNGs through the same fixed encoder as `build`, and the
+output manifest entries of every stage they touched are re-hashed, so
+`verify` keeps passing after an edit.
+
+optimize-pngs and publish-assets are left out: Vite serves client/public
+directly, and re-encoding every PNG would take longer than the rebuild
+itself. Run a full `build` before committing or shipping.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+from .determinism import (DEFAULT_MANIFEST, PROJECT_ROOT, canonicalize_stage, fixed_png_saves, refresh_manifest,
+                          stage_files)
+from .runner import StageFailed, build, downstream, forget_script, load_script
+from .stages import SCRIPTS_DIR, STAGES, _tile_cache
+
+POLL_INTERVAL = 0.25  # seconds between stat() sweeps
+
+# Release-only stages, skipped in the dev loop
+SKIPPED_STAGES = {"optimize-pngs", "publish-assets"}
+
+ROCK_PATTERN = re.compile(r"assets/tilesets/obstacles/Rock(\d)_3\.png$")
+
+
+# ============================================================
+# Change detection
+# ============================================================
+
+def watched_files():
+    """Map every watched file (project-relative, '/'-separated) to the stages it feeds."""
+    watched = {}
+    for stage in STAGES:
+        paths = [stage.script] + stage.helpers
+        for pattern in stage.sources:
+            paths += glob.glob(os.path.join(PROJECT_ROOT, pattern), recursive=True)
+        for path in paths:
+            if os.path.isfile(path):
+                rel = os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/")
+                watched.setdefault(rel, set()).add(stage.name)
+    return watched
+
+
+def sha256_of(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class Poller:
+    """Tracks (size, mtime_ns, sha256) per watched file between sweeps."""
+
+    def __init__(self):
+        self.state = {}
+        self.stages = {}
+        self.poll()
+
+    def poll(self):
+        """Return {relative path: stages} for files added, removed or changed in content since the last sweep."""
+        first = not self.stages
+        watched = watched_files()
+        changed = {rel: self.stages[rel] for rel in set(self.stages) - set(watched)}
+        for rel in changed:
+            del self.state[rel]
+        self.stages = watched
+
+        for rel, stages in watched.items():
+            try:
+                st = os.stat(os.path.join(PROJECT_ROOT, rel))
+            except FileNotFoundError:
+                continue
+            old = self.state.get(rel)
+            if old and old[:2] == (st.st_size, st.st_mtime_ns):
+                continue
+            digest = sha256_of(os.path.join(PROJECT_ROOT, rel))
+            self.state[rel] = (st.st_size, st.st_mtime_ns, digest)
+            if not first and (old is None or old[2] != digest):
+                changed[rel] = stages
+        return changed
+
+    def update(self, paths):
+        """Record the current state of files the watcher wrote itself, so the next sweep skips them."""
+        for path in paths:
+            rel = os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/")
+            if rel in self.stages and os.path.exists(path):
+                st = os.stat(path)
+                self.state[rel] = (st.st_size, st.st_mtime_ns, sha256_of(path))
+
+
+# ============================================================
+# Fine-grained rock rebuild
+# ============================================================
+
+def _script(name):
+    return load_script(os.path.join(SCRIPTS_DIR, name))
+
+
+def _patch_atlas_tile(path, index, tile, cols, extrude):
+    """Overwrite one tile (with its edge extrusion) in an extruded atlas PNG."""
+    import numpy as np
+    from PIL import Image
+
+    atlas = np.array(Image.open(path).convert("RGBA"))
+    stride = tile.shape[0] + 2 * extrude
+    y, x = (index // cols) * stride, (index % cols) * stride
+    atlas[y:y + stride, x:x + stride] = np.pad(tile, ((extrude, extrude), (extrude, extrude), (0, 0)), mode="edge")
+    Image.fromarray(atlas, "RGBA").save(path)
+
+
+def rebuild_rock(number):
+    """Patch every output that shows rock sprite Rock<number>_3.png. Returns the files written."""
+    import numpy as np
+    from PIL import Image
+
+    extrude = _script("extrude-tileset.py")
+    arenas = _script("generate-arenas.py")
+    tile_id = arenas.ROCK_CANOPY_MIN + number - 1  # Rock1_3.png is the first rock tile
+    index = tile_id - 1
+
+    rock = np.asarray(Image.open(os.path.join(arenas.OBSTACLES_DIR, f"Rock{number}_3.png")).convert("RGBA"))
+    if rock.shape[:2] != (extrude.TILE, extrude.TILE):
+        raise ValueError(f"Rock{number}_3.png is {rock.shape[1]}x{rock.shape[0]}, expected "
+                         f"{extrude.TILE}x{extrude.TILE}")
+    written = []
+
+    # The unified tileset, its LODs and the themed atlas (which starts with the same 368 tiles)
+    _patch_atlas_tile(extrude.TILESET_PATH, index, rock, extrude.COLS, extrude.EXTRUDE)
+    written.append(extrude.TILESET_PATH)
+    for size in extrude.LOD_TILE_SIZES:
+        lod = extrude.box_downscale(rock[None], size)[0]
+        _patch_atlas_tile(extrude.lod_path(size), index, lod, extrude.COLS, extrude.EXTRUDE)
+        written.append(extrude.lod_path(size))
+    recolor = _script("recolor-variants.py")
+    if os.path.exists(recolor.THEMED_TILESET_PATH):
+        _patch_atlas_tile(recolor.THEMED_TILESET_PATH, index, rock, recolor.COLS, recolor.EXTRUDE)
+        written.append(recolor.THEMED_TILESET_PATH)
+
+    # Aliases can change when the rock starts or stops matching another tile
+    tiles = extrude.read_tiles(Image.open(extrude.TILESET_PATH))
+    dedupe = _script("dedupe-tileset.py")
+    dedupe.main(tiles)
+    written += [dedupe.DEDUP_PATH, dedupe.ALIASES_PATH]
+
+    # Compact map and atlas of every map placing this rock (the authored maps are read-only)
+    atlases = _script("build-map-atlases.py")
+    tile_cache = _tile_cache(tiles)
+    for map_path in sorted(glob.glob(os.path.join(atlases.MAPS_DIR, "*.json"))):
+        with open(map_path) as f:
+            d = json.load(f)
+        gid = tile_id + d["tilesets"][0]["firstgid"] - 1
+        if gid not in arenas.get_layer_data(d, "Walls"):
+            continue
+        atlases.build_map_atlas(map_path, tile_cache)
+        name = os.path.splitext(os.path.basename(map_path))[0]
+        written += [os.path.join(atlases.COMPACT_MAPS_DIR, f"{name}.json"),
+                    os.path.join(atlases.COMPACT_TILESETS_DIR, f"{name}.png")]
+    return written
+
+
+# ============================================================
+# Loop
+# ============================================================
+
+def rebuild(changed, jobs=None, manifest_path=DEFAULT_MANIFEST):
+    """
+    Rebuild what the changed files affect and refresh their manifest entries.
+
+    Returns the files the rock patches wrote. Raises StageFailed if a stage fails.
+    """
+    stage_names = set()
+    rocks = set()
+    for rel, stages in changed.items():
+        match = ROCK_PATTERN.search(rel)
+        if match and os.path.exists(os.path.join(PROJECT_ROOT, rel)):
+            rocks.add(int(match.group(1)))
+        else:
+            stage_names |= stages
+        path = os.path.join(PROJECT_ROOT, rel)
+        for stage in STAGES:
+            if path == stage.script or path in stage.helpers:
+                forget_script(stage.script)
+        if any(path in stage.helpers for stage in STAGES):
+            sys.modules.pop(os.path.splitext(os.path.basename(path))[0], None)
+
+    stages = [s for s in downstream(stage_names) if s.name not in SKIPPED_STAGES] if stage_names else []
+    if any(s.name == "generate-arenas" for s in stages):
+        rocks = set()  # the full tileset rebuild already includes them
+
+    written = []
+    with fixed_png_saves():
+        for number in sorted(rocks):
+            files = rebuild_rock(number)
+            first_id = _script("generate-arenas.py").ROCK_CANOPY_MIN
+            print(f"  Rock{number}_3.png -> tile {first_id + number - 1}: {len(files)} file(s) patched")
+            written += files
+        patched = {os.path.relpath(p, PROJECT_ROOT).replace(os.sep, "/") for p in written}
+        touched = [s for s in STAGES if s not in stages and patched & set(stage_files(s))]
+        for stage in touched:
+            canonicalize_stage(stage)
+        if stages:
+            print(f"  Rerunning {', '.join(s.name for s in stages)}")
+            build(stages, jobs=jobs)
+
+    refreshed = refresh_manifest(touched + stages, manifest_path) if touched or stages else None
+    if refreshed is not None:
+        print(f"  Manifest: {refreshed} file(s) re-hashed")
+    return written
+
+
+def watch(jobs=None, interval=POLL_INTERVAL, manifest_path=DEFAULT_MANIFEST):
+    """Poll forever, rebuilding after each edit. Stops on KeyboardInterrupt."""
+    poller = Poller()
+    print(f"Watching {len(poller.state)} file(s); Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(interval)
+            changed = poller.poll()
+            if not changed:
+                continue
+            print()
+            print(f"Changed: {', '.join(sorted(changed))}")
+            start = time.perf_counter()
+            try:
+                poller.update(rebuild(changed, jobs, manifest_path))
+            except (StageFailed, OSError, ValueError) as e:
+                print(f"Rebuild failed: {e}")
+                continue
+            print(f"Rebuilt in {(time.perf_counter() - start) * 1000:.0f}ms")
+    except KeyboardInterrupt:
+        print()
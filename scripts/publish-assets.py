@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Publish client assets under content-hashed filenames with a preload manifest.
+
+Generated files keep fixed names (arena_unified.png, paran.png,
+hedge_garden.json), so they cannot be served with long-lived cache headers.
+This stage copies every asset under PUBLISH_DIRS to
+build/published/<dir>/<stem>.<hash>.<ext>, where <hash> is a prefix
+of the SHA-256 of the file contents, so any regenerated asset gets a new URL
+and unchanged ones keep theirs. JSON files (maps, atlas and animation
+metadata, tile references) also get a precompressed .gz sibling for servers
+that serve gzip_static.
+
+asset-manifest.json maps each logical name (its path relative to
+client/public, e.g. "tilesets/arena_unified.png") to the hashed path and byte
+sizes. The hashed files can be served as immutable. Only the manifest keeps a
+fixed name and needs revalidation. Hashed files no longer in the manifest are
+removed, so the directory only holds the current build.
+
+Manifest paths are URLs relative to the site root ("published/..."). Nothing
+loads through the manifest yet, so the output stays in build/ rather than
+client/public; deploy it as /published/ once BootScene preloads through it.
+
+Input:  client/public/{sprites,tilesets,icons,images,maps,data,soundeffects,audio}/**
+Output: build/published/<dir>/<stem>.<hash>.<ext> (+ .gz for JSON)
+        build/published/asset-manifest.json (+ .gz)
+
+Usage:
+    python3 scripts/publish-assets.py
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+PUBLIC_DIR = os.path.join(PROJECT_ROOT, "client", "public")
+PUBLISH_DIR = os.path.join(PROJECT_ROOT, "build", "published")
+
+MANIFEST_NAME = "asset-manifest.json"
+
+# Directories (relative to client/public) published recursively
+PUBLISH_DIRS = ["sprites", "tilesets", "icons", "images", "maps", "data", "soundeffects", "audio"]
+
+HASH_LENGTH = 10          # Hex digits of SHA-256 kept in filenames
+GZIP_EXTENSIONS = {".json"}
+GZIP_LEVEL = 9
+
+
+# ============================================================
+# Hashing + compression
+# ============================================================
+
+def content_hash(path):
+    """SHA-256 of a file's contents, as hex."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def hashed_name(rel_path, digest):
+    """Insert the hash prefix before the extension: maps/x.json -> maps/x.<hash>.json."""
+    stem, ext = os.path.splitext(rel_path)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def gzip_bytes(data):
+    """Gzip with no filename and a zero mtime so the output only depends on the input."""
+    buf = io.BytesIO()
+    with gzip.GzipFile(filename="", mode="wb", fileobj=buf, compresslevel=GZIP_LEVEL, mtime=0) as f:
+        f.write(data)
+    return buf.getvalue()
+
+
+def write_if_changed(path, data):
+    """Write bytes unless the file already holds exactly them."""
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+# ============================================================
+# Publishing
+# ============================================================
+
+def find_assets():
+    """List asset paths relative to client/public, sorted, using '/' separators."""
+    assets = []
+    for rel_dir in PUBLISH_DIRS:
+        root_dir = os.path.join(PUBLIC_DIR, rel_dir)
+        for dirpath, _dirnames, filenames in os.walk(root_dir):
+            for filename in filenames:
+                if filename.startswith(".") or filename.endswith(".gz"):
+                    continue
+                rel_path = os.path.relpath(os.path.join(dirpath, filename), PUBLIC_DIR)
+                assets.append(rel_path.replace(os.sep, "/"))
+    return sorted(assets)
+
+
+def publish_asset(rel_path):
+    """Copy one asset to its hashed path (+ .gz for JSON). Returns (manifest entry, written files)."""
+    src = os.path.join(PUBLIC_DIR, rel_path)
+    digest = content_hash(src)
+    published = hashed_name(rel_path, digest)
+    dst = os.path.join(PUBLISH_DIR, published)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if not os.path.exists(dst):
+        shutil.copyfile(src, dst)
+
+    entry = {
+        "path": f"published/{published}",
+        "bytes": os.path.getsize(src),
+        "sha256": digest,
+    }
+    written = {dst}
+
+    if os.path.splitext(rel_path)[1] in GZIP_EXTENSIONS:
+        with open(src, "rb") as f:
+            compressed = gzip_bytes(f.read())
+        write_if_changed(dst + ".gz", compressed)
+        entry["gzipBytes"] = len(compressed)
+        written.add(dst + ".gz")
+
+    return entry, written
+
+
+def prune_stale(keep):
+    """Delete published files that are not part of the current build. Returns the count removed."""
+    removed = 0
+    for dirpath, _dirnames, filenames in os.walk(PUBLISH_DIR, topdown=False):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if path not in keep:
+                os.remove(path)
+                removed += 1
+        if dirpath != PUBLISH_DIR and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
+
+
+def main():
+    print("Publishing hashed assets...")
+    print()
+
+    os.makedirs(PUBLISH_DIR, exist_ok=True)
+    assets = {}
+    keep = set()
+    for rel_path in find_assets():
+        entry, written = publish_asset(rel_path)
+        assets[rel_path] = entry
+        keep |= written
+
+    manifest = {"assets": assets}
+    manifest_bytes = (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode()
+    manifest_path = os.path.join(PUBLISH_DIR, MANIFEST_NAME)
+    write_if_changed(manifest_path, manifest_bytes)
+    write_if_changed(manifest_path + ".gz", gzip_bytes(manifest_bytes))
+    keep |= {manifest_path, manifest_path + ".gz"}
+
+    removed = prune_stale(keep)
+
+    total_bytes = sum(e["bytes"] for e in assets.values())
+    gz_entries = [e for e in assets.values() if "gzipBytes" in e]
+    json_bytes = sum(e["bytes"] for e in gz_entries)
+    gz_bytes = sum(e["gzipBytes"] for e in gz_entries)
+    print(f"  Published {len(assets)} assets ({total_bytes} bytes) to {PUBLISH_DIR}")
+    print(f"  Gzipped {len(gz_entries)} JSON files: {json_bytes} -> {gz_bytes} bytes")
+    print(f"  Removed {removed} stale files")
+    print(f"  Created {manifest_path}")
+
+    print()
+    print("Asset publishing complete.")
+
+
+if __name__ == "__main__":
+    main()
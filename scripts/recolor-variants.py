@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Build recolored character skins and wall themes from the existing art.
+
+Character skins are exact-color swaps. Each character's sheet is drawn from
+a five-color ramp (the *_BODY/_ACCENT/_DARK/_LIGHT/_DEEP constants in
+generate-assets.py). A skin gives a replacement for each ramp slot. Every
+sheet is reduced to its distinct RGB values once (np.unique), each skin only
+remaps that short palette, and one gather rebuilds the pixels. Alpha is
+kept, so the translucent dissolve/trail pixels follow the swap. Colors outside
+the ramp (eyes, outlines, highlights) are left alone.
+
+Wall themes are hue/saturation/value shifts of the 16x32 wall references
+(hedge/brick/wood_tileset.png). All themes are converted together as one
+(themes, h, w) HSV array. Each themed reference is then split into canopy and
+front faces and upscaled exactly as generate-arenas.py does. The 96 tiles are
+appended to the unified layout in THEME_OFFSETS order. The existing 46 rows
+(IDs 1-368) are kept unchanged, so theme k's canopy IDs are
+spriteIndex + 1 + offset and its fronts are +48 as usual. arena_unified.png is
+not modified; maps can use the themed atlas by pointing their tileset at
+arena_unified_themes.png and setting wallTheme to one of the new names.
+
+Input:  client/public/sprites/{paran,faran,baran}[@Nx].png
+        assets/tilesets/walls/{hedge,brick,wood}_tileset.png (16x32 sprites, 8x6)
+        client/public/tilesets/arena_unified.png (plain or extruded, 8x46 @ 32px)
+Output: client/public/sprites/skins/<character>_<skin>[@Nx].png
+        client/public/sprites/skins/skins.json
+        client/public/tilesets/arena_unified_themes.png (extruded, 8 x (46 + 12 per theme))
+        client/public/tilesets/arena_themes.json
+
+Usage:
+    python3 scripts/recolor-variants.py
+"""
+
+from PIL import Image
+import numpy as np
+import json
+import os
+import time
+
+from tile_atlas import COLS, EXTRUDE, ROWS, THEME_OFFSETS, TILE, build_extruded_atlas, read_tiles
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+SPRITES_DIR = os.path.join(PROJECT_ROOT, "client", "public", "sprites")
+SKINS_DIR = os.path.join(SPRITES_DIR, "skins")
+WALLS_DIR = os.path.join(PROJECT_ROOT, "assets", "tilesets", "walls")
+TILESETS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "tilesets")
+TILESET_PATH = os.path.join(TILESETS_DIR, "arena_unified.png")
+THEMED_TILESET_PATH = os.path.join(TILESETS_DIR, "arena_unified_themes.png")
+THEMES_PATH = os.path.join(TILESETS_DIR, "arena_themes.json")
+
+TILE_HALF = 16
+THEME_TILES = 96  # 48 canopy + 48 front tiles per theme
+
+# ============================================================
+# Character skins
+# ============================================================
+
+# Ramp slots in the order skins list them
+SKIN_SLOTS = ["body", "accent", "dark", "light", "deep"]
+
+# Source ramps, as in generate-assets.py
+BASE_RAMPS = {
+    "paran": [(255, 204, 0), (255, 215, 0), (204, 163, 0), (255, 230, 100), (170, 130, 0)],
+    "faran": [(255, 68, 68), (204, 51, 51), (153, 40, 40), (255, 120, 120), (110, 25, 25)],
+    "baran": [(68, 204, 102), (139, 109, 60), (40, 150, 70), (120, 230, 140), (25, 100, 45)],
+}
+
+# Target ramps per character and skin (same slot order)
+SKINS = {
+    "paran": {
+        "silver": [(200, 205, 215), (220, 225, 235), (150, 155, 170), (240, 242, 250), (105, 110, 125)],
+        "rose":   [(255, 120, 170), (255, 140, 185), (205, 85, 130), (255, 180, 210), (150, 55, 95)],
+        "mint":   [(90, 230, 180), (110, 240, 195), (60, 180, 140), (170, 250, 220), (35, 125, 95)],
+    },
+    "faran": {
+        "ember":  [(255, 140, 40), (210, 105, 30), (160, 75, 20), (255, 185, 110), (115, 50, 10)],
+        "violet": [(170, 90, 255), (135, 65, 210), (100, 45, 160), (205, 150, 255), (70, 25, 115)],
+        "shadow": [(90, 90, 105), (70, 70, 85), (50, 50, 62), (130, 130, 150), (30, 30, 40)],
+    },
+    "baran": {
+        "frost":  [(90, 180, 240), (120, 130, 150), (55, 130, 190), (150, 215, 250), (30, 85, 130)],
+        "rust":   [(200, 90, 50), (110, 80, 60), (150, 60, 35), (235, 140, 95), (100, 40, 20)],
+        "jade":   [(40, 170, 140), (150, 120, 70), (25, 125, 105), (100, 215, 185), (15, 85, 70)],
+    },
+}
+
+# ============================================================
+# Wall themes
+# ============================================================
+
+# name -> (source theme, hue shift in degrees, saturation gain, value gain)
+WALL_THEMES = {
+    "autumn":    ("hedge", -75, 1.10, 1.00),
+    "frost":     ("hedge", 95, 0.35, 1.20),
+    "sandstone": ("brick", -165, 1.80, 1.30),
+    "obsidian":  ("brick", 0, 0.25, 0.55),
+    "ashwood":   ("wood", 25, 0.45, 1.90),
+    "ebony":     ("wood", -10, 0.80, 0.60),
+}
+
+
+# ============================================================
+# Color helpers
+# ============================================================
+
+def pack_rgb(rgb):
+    """Pack (..., 3) uint8 RGB into uint32 keys."""
+    rgb = np.asarray(rgb, dtype=np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def rgb_to_hsv(rgb):
+    """Convert (..., 3) RGB in 0..255 to HSV with h in [0, 1) and s, v in [0, 1]."""
+    rgb = rgb.astype(np.float64) / 255.0
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    v = rgb.max(axis=-1)
+    delta = v - rgb.min(axis=-1)
+    s = np.divide(delta, v, out=np.zeros_like(v), where=v > 0)
+
+    safe = np.where(delta > 0, delta, 1.0)
+    h = np.where(v == r, (g - b) / safe,
+                 np.where(v == g, 2.0 + (b - r) / safe, 4.0 + (r - g) / safe))
+    h = np.where(delta > 0, (h / 6.0) % 1.0, 0.0)
+    return np.stack([h, s, v], axis=-1)
+
+
+def hsv_to_rgb(hsv):
+    """Convert (..., 3) HSV back to uint8 RGB."""
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int64) % 6
+
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    rgb = np.stack([r, g, b], axis=-1) * 255.0
+    return np.clip(np.rint(rgb), 0, 255).astype(np.uint8)
+
+
+# ============================================================
+# Skin recoloring
+# ============================================================
+
+def build_skin_palettes(palette, base_ramp, skins):
+    """
+    Remap a sheet's distinct colors for every skin at once.
+
+    `palette` is the sheet's sorted packed RGB values. Returns a
+    (len(skins), len(palette), 3) array: entries matching a base ramp slot
+    take the skin's color, all others keep their own RGB.
+    """
+    keys = pack_rgb(base_ramp)
+    targets = np.asarray(skins, dtype=np.uint8)
+
+    own = np.stack([(palette >> 16) & 0xFF, (palette >> 8) & 0xFF, palette & 0xFF], axis=-1).astype(np.uint8)
+    out = np.broadcast_to(own, (len(skins),) + own.shape).copy()
+
+    slot = np.searchsorted(palette, keys)
+    slot = np.minimum(slot, len(palette) - 1)
+    present = palette[slot] == keys
+    out[:, slot[present]] = targets[:, present]
+    return out
+
+
+def recolor_sheet(rgba, base_ramp, skins):
+    """
+    Recolor one RGBA sheet for a list of target ramps.
+
+    Returns (list of recolored arrays, share of opaque pixels that were remapped).
+    """
+    packed = pack_rgb(rgba[..., :3])
+    palette, inverse = np.unique(packed, return_inverse=True)
+    inverse = inverse.reshape(packed.shape)
+    palettes = build_skin_palettes(palette, base_ramp, skins)
+
+    visible = rgba[..., 3] > 0
+    hit = np.isin(packed, pack_rgb(base_ramp)) & visible
+    coverage = hit.sum() / max(int(visible.sum()), 1)
+
+    variants = []
+    for skin_palette in palettes:
+        out = rgba.copy()
+        out[..., :3] = np.where(visible[..., None], skin_palette[inverse], rgba[..., :3])
+        variants.append(out)
+    return variants, coverage
+
+
+def find_density_sheets(name):
+    """Return [(label, filename)] for a character's sheets, from densities.json if present."""
+    manifest_path = os.path.join(SPRITES_DIR, "densities.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        sheets = [(label, d["sheets"][name]["image"])
+                  for label, d in manifest["densities"].items() if name in d["sheets"]]
+        return [(label, filename) for label, filename in sheets
+                if os.path.exists(os.path.join(SPRITES_DIR, filename))]
+    return [("2x", f"{name}.png")]
+
+
+def build_skins():
+    """Write every skin sheet at every available density. Returns the skins.json table."""
+    table = {}
+    for name, skins in SKINS.items():
+        skin_names = list(skins)
+        ramps = [skins[s] for s in skin_names]
+        table[name] = {"slots": SKIN_SLOTS, "base": BASE_RAMPS[name], "skins": {s: {} for s in skin_names}}
+
+        for label, filename in find_density_sheets(name):
+            rgba = np.asarray(Image.open(os.path.join(SPRITES_DIR, filename)).convert("RGBA"))
+            variants, coverage = recolor_sheet(rgba, BASE_RAMPS[name], ramps)
+            stem, ext = os.path.splitext(filename)
+            suffix = stem[len(name):]
+            for skin, variant in zip(skin_names, variants):
+                out_name = f"{name}_{skin}{suffix}{ext}"
+                Image.fromarray(variant, "RGBA").save(os.path.join(SKINS_DIR, out_name))
+                table[name]["skins"][skin][label] = out_name
+            print(f"  Created {len(variants)} {name} skins from {filename} "
+                  f"({coverage * 100:.0f}% of opaque pixels on the ramp)")
+    return table
+
+
+# ============================================================
+# Wall themes
+# ============================================================
+
+def reference_tiles(ref):
+    """
+    Split a (192, 128, 4) 16x32 wall reference into (96, 32, 32, 4) unified tiles.
+
+    Tiles 0-47 are the 2x canopies and 48-95 the 2x fronts in sprite index
+    order, matching create_unified_tileset() in generate-arenas.py.
+    """
+    rows = ref.shape[0] // TILE
+    cols = ref.shape[1] // TILE_HALF
+    sprites = ref.reshape(rows, TILE, cols, TILE_HALF, 4).transpose(0, 2, 1, 3, 4).reshape(-1, TILE, TILE_HALF, 4)
+    halves = np.concatenate([sprites[:, :TILE_HALF], sprites[:, TILE_HALF:]])
+    return halves.repeat(2, axis=1).repeat(2, axis=2)
+
+
+def shift_references(refs, themes):
+    """
+    Apply every theme's hue/saturation/value shift to its source reference.
+
+    `refs` maps source theme -> (h, w, 4) uint8. Returns an (n, h, w, 4) array
+    in `themes` order. The HSV math runs once over the stacked references.
+    """
+    stack = np.stack([refs[source] for source, _h, _s, _v in themes])
+    hue = np.array([h / 360.0 for _src, h, _s, _v in themes])[:, None, None]
+    sat = np.array([s for _src, _h, s, _v in themes])[:, None, None]
+    val = np.array([v for _src, _h, _s, v in themes])[:, None, None]
+
+    hsv = rgb_to_hsv(stack[..., :3])
+    hsv[..., 0] = (hsv[..., 0] + hue) % 1.0
+    hsv[..., 1] = np.clip(hsv[..., 1] * sat, 0.0, 1.0)
+    hsv[..., 2] = np.clip(hsv[..., 2] * val, 0.0, 1.0)
+
+    out = stack.copy()
+    out[..., :3] = hsv_to_rgb(hsv)
+    return out
+
+
+def build_wall_themes(base=None):
+    """
+    Write the themed unified tileset and its theme table.
+
+    `base` is an already decoded (368, 32, 32, 4) unified tile array; by
+    default TILESET_PATH is read.
+    """
+    refs = {name: np.asarray(Image.open(os.path.join(WALLS_DIR, f"{name}_tileset.png")).convert("RGBA"))
+            for name in THEME_OFFSETS}
+    names = list(WALL_THEMES)
+    shifted = shift_references(refs, [WALL_THEMES[n] for n in names])
+
+    if base is None:
+        base = read_tiles(Image.open(TILESET_PATH))
+    themed = np.concatenate([base] + [reference_tiles(ref) for ref in shifted])
+    atlas = build_extruded_atlas(themed, COLS, EXTRUDE)
+    Image.fromarray(atlas, "RGBA").save(THEMED_TILESET_PATH)
+    print(f"  Created {THEMED_TILESET_PATH} ({atlas.shape[1]}x{atlas.shape[0]}, {len(themed)} tiles)")
+
+    offsets = dict(THEME_OFFSETS)
+    for i, name in enumerate(names):
+        offsets[name] = len(base) + i * THEME_TILES
+    table = {
+        "image": os.path.basename(THEMED_TILESET_PATH),
+        "tileWidth": TILE,
+        "tileHeight": TILE,
+        "columns": COLS,
+        "margin": EXTRUDE,
+        "spacing": 2 * EXTRUDE,
+        "tileCount": len(themed),
+        "imageWidth": atlas.shape[1],
+        "imageHeight": atlas.shape[0],
+        "wallFrontOffset": THEME_TILES // 2,
+        "themeOffsets": offsets,
+        "themes": {name: {"source": src, "hue": h, "saturation": s, "value": v}
+                   for name, (src, h, s, v) in WALL_THEMES.items()},
+    }
+    with open(THEMES_PATH, "w") as f:
+        json.dump(table, f, indent=2)
+    print(f"  Created {THEMES_PATH} ({len(names)} themes)")
+
+
+def main(tiles=None):
+    print("Building skin and wall theme variants...")
+    print()
+    os.makedirs(SKINS_DIR, exist_ok=True)
+
+    start = time.perf_counter()
+    print("[1/2] Character skins")
+    skins = build_skins()
+    skins_path = os.path.join(SKINS_DIR, "skins.json")
+    with open(skins_path, "w") as f:
+        json.dump(skins, f, indent=2)
+    print(f"  Created {skins_path}")
+
+    print()
+    print("[2/2] Wall themes")
+    build_wall_themes(tiles)
+
+    print()
+    print(f"Variant building complete ({time.perf_counter() - start:.2f}s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Render compact minimap thumbnails for every arena map.
+
+Each map is reduced to one palette index per tile by category (floor, deco,
+wall front, wall canopy, rock), taking the top-most non-empty layer for each
+cell. Classification and coloring are lookup-table gathers over the whole
+layer, so no tile images are decoded. Spawn points from the spawnPoints map
+property are drawn as markers. Thumbnails are written as palette PNGs at
+several pixels-per-tile scales for the lobby and stage-intro previews.
+
+Input:  client/public/maps/*.json
+Output: client/public/images/minimaps/<map>_<scale>x.png
+        client/public/images/minimaps/minimaps.json (index of sizes per map)
+
+Usage:
+    python3 scripts/render-minimaps.py
+"""
+
+from PIL import Image
+import numpy as np
+import json
+import os
+
+from tile_atlas import (COLS, DECORATION_MAX, DECORATION_MIN, ROCK_CANOPY_MAX, ROCK_CANOPY_MIN, ROWS, THEME_OFFSETS,
+                        TILES_PER_THEME, WALL_FRONT_OFFSET, get_property)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+MAPS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "maps")
+MINIMAPS_DIR = os.path.join(PROJECT_ROOT, "client", "public", "images", "minimaps")
+
+# Pixels per tile for each thumbnail size
+SCALES = [1, 2, 4]
+
+# Layers in render order (bottom-to-top); higher layers win per cell
+LAYER_ORDER = ["Ground", "Decorations", "WallFronts", "Walls"]
+
+# ============================================================
+# Categories and palette
+# ============================================================
+CAT_EMPTY = 0
+CAT_FLOOR = 1
+CAT_DECO = 2
+CAT_WALL_FRONT = 3
+CAT_WALL = 4
+CAT_ROCK = 5
+CAT_PARAN = 6
+CAT_GUARDIAN = 7
+
+MAX_TILE_ID = COLS * ROWS
+
+# Per-theme colors for floor, wall front and wall canopy; the rest are shared
+THEME_COLORS = {
+    'hedge': {'floor': (74, 110, 58), 'front': (40, 78, 36), 'wall': (62, 128, 52)},
+    'brick': {'floor': (120, 104, 88), 'front': (92, 48, 40), 'wall': (150, 74, 58)},
+    'wood': {'floor': (132, 108, 76), 'front': (82, 56, 32), 'wall': (128, 88, 50)},
+}
+EMPTY_COLOR = (20, 20, 30)
+DECO_COLOR = (150, 150, 110)
+ROCK_COLOR = (128, 128, 136)
+PARAN_COLOR = (255, 204, 0)       # Paran body yellow
+GUARDIAN_COLOR = (255, 68, 68)    # Faran body red
+
+
+def build_category_lut():
+    """Map every tile ID (0..MAX_TILE_ID) to a minimap category."""
+    lut = np.full(MAX_TILE_ID + 1, CAT_FLOOR, dtype=np.uint8)
+    lut[0] = CAT_EMPTY
+    for offset in THEME_OFFSETS.values():
+        lut[1 + offset:1 + offset + TILES_PER_THEME] = CAT_WALL
+        lut[1 + offset + WALL_FRONT_OFFSET:1 + offset + WALL_FRONT_OFFSET + TILES_PER_THEME] = CAT_WALL_FRONT
+    lut[ROCK_CANOPY_MIN:ROCK_CANOPY_MAX + 1] = CAT_ROCK   # Rock full sprites
+    lut[309:313] = CAT_DECO                               # Hedge floor deco
+    lut[317:321] = CAT_DECO                               # Brick floor deco
+    lut[325:329] = CAT_DECO                               # Wood floor deco
+    lut[DECORATION_MIN:DECORATION_MAX + 1] = CAT_DECO     # Decorations
+    return lut
+
+
+def build_palette(theme):
+    """Return a flat RGB palette list indexed by category for a wall theme."""
+    colors = THEME_COLORS.get(theme, THEME_COLORS['hedge'])
+    entries = [
+        EMPTY_COLOR,
+        colors['floor'],
+        DECO_COLOR,
+        colors['front'],
+        colors['wall'],
+        ROCK_COLOR,
+        PARAN_COLOR,
+        GUARDIAN_COLOR,
+    ]
+    return [c for rgb in entries for c in rgb]
+
+
+# ============================================================
+# Map classification
+# ============================================================
+
+def classify_map(d, lut):
+    """Return a (height, width) uint8 category grid for a map."""
+    w = d["width"]
+    h = d["height"]
+    layers_by_name = {l["name"]: l for l in d["layers"] if l.get("type") == "tilelayer"}
+
+    grid = np.zeros((h, w), dtype=np.uint8)
+    for layer_name in LAYER_ORDER:
+        layer = layers_by_name.get(layer_name)
+        if layer is None:
+            continue
+        ids = np.clip(np.asarray(layer["data"], dtype=np.int64), 0, MAX_TILE_ID)
+        cats = lut[ids].reshape(h, w)
+        grid = np.where(cats != CAT_EMPTY, cats, grid)
+    return grid
+
+
+def spawn_markers(d):
+    """Return [(x_px, y_px, category)] from the spawnPoints property."""
+    raw = get_property(d, "spawnPoints")
+    if not raw:
+        return []
+    spawns = json.loads(raw)
+    markers = []
+    if "paran" in spawns:
+        markers.append((spawns["paran"]["x"], spawns["paran"]["y"], CAT_PARAN))
+    for g in spawns.get("guardians", []):
+        markers.append((g["x"], g["y"], CAT_GUARDIAN))
+    return markers
+
+
+def render_thumbnail(grid, markers, scale, tile_size):
+    """Upscale a category grid to `scale` px per tile and stamp spawn markers."""
+    img = np.repeat(np.repeat(grid, scale, axis=0), scale, axis=1)
+    h, w = img.shape
+    half = max(3, scale) // 2
+    for x_px, y_px, cat in markers:
+        mx = int(x_px * scale / tile_size)
+        my = int(y_px * scale / tile_size)
+        img[max(0, my - half):min(h, my + half + 1), max(0, mx - half):min(w, mx + half + 1)] = cat
+    return img
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def main():
+    print("Rendering map minimaps...")
+    print()
+
+    os.makedirs(MINIMAPS_DIR, exist_ok=True)
+    lut = build_category_lut()
+    index = {}
+
+    for filename in sorted(os.listdir(MAPS_DIR)):
+        if not filename.endswith(".json"):
+            continue
+        map_name = os.path.splitext(filename)[0]
+        with open(os.path.join(MAPS_DIR, filename)) as f:
+            d = json.load(f)
+
+        grid = classify_map(d, lut)
+        markers = spawn_markers(d)
+        palette = build_palette(get_property(d, "wallTheme", "hedge"))
+
+        sizes = {}
+        for scale in SCALES:
+            thumb = render_thumbnail(grid, markers, scale, d["tilewidth"])
+            img = Image.fromarray(thumb, "P")
+            img.putpalette(palette)
+            out_name = f"{map_name}_{scale}x.png"
+            img.save(os.path.join(MINIMAPS_DIR, out_name))
+            sizes[f"{scale}x"] = {"image": out_name, "width": img.width, "height": img.height}
+
+        index[map_name] = sizes
+        print(f"  Created {map_name} minimaps ({', '.join(sizes)}, {len(markers)} spawn markers)")
+
+    index_path = os.path.join(MINIMAPS_DIR, "minimaps.json")
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+    print(f"  Created {index_path}")
+
+    print()
+    print("Minimap rendering complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Tile atlas helpers shared by the tileset scripts.
+
+Not a script itself: the scripts import it (`from tile_atlas import ...`).
+Running a script directly puts scripts/ on sys.path, and the pipeline's
+load_script() does the same.
+
+The unified tileset layout below mirrors shared/tileRegistry.ts; keep the two
+in step.
+"""
+
+import os
+
+import numpy as np
+from PIL import Image
+
+# ============================================================
+# Unified tileset layout (see shared/tileRegistry.ts)
+# ============================================================
+
+TILE = 32
+COLS = 8
+ROWS = 46
+EXTRUDE = 1  # Pixels of extrusion per side (margin=1, spacing=2)
+
+# Built-in wall themes (canopy tile ID = spriteIndex + 1 + offset), WALL_THEME_OFFSET in TS
+THEME_OFFSETS = {'hedge': 0, 'brick': 96, 'wood': 192}
+TILES_PER_THEME = 48      # Canopy auto-tiles per theme, followed by as many front faces
+WALL_FRONT_OFFSET = 48    # wall front ID = canopy ID + 48
+ROCK_FRONT_OFFSET = 8     # rock front ID = canopy ID + 8
+
+# Tile ID ranges (1-based, inclusive; TILE_RANGES in TS)
+ROCK_CANOPY_MIN = 289     # Rock full sprites, row 36
+ROCK_CANOPY_MAX = 296
+DECORATION_MIN = 353      # Decorations appended by append-decorations.py, rows 44-45
+DECORATION_MAX = 364
+
+
+# ============================================================
+# Atlas slicing + building
+# ============================================================
+
+def extruded_size(tile, cols=COLS, rows=ROWS, extrude=EXTRUDE):
+    """
+    Pixel size of an extruded atlas.
+
+    Layout: margin=extrude, spacing=2*extrude. Tile (col, row) starts at
+    (extrude + col * stride, extrude + row * stride) with stride = tile + 2*extrude,
+    and the last tile's extrusion ends exactly at the image edge.
+    """
+    stride = tile + 2 * extrude
+    return cols * stride, rows * stride
+
+
+def read_tiles(img, tile=TILE, cols=COLS, rows=ROWS, extrude=EXTRUDE):
+    """
+    Slice a plain or already extruded atlas image into a (rows * cols, tile, tile, 4) array.
+
+    The layout is detected from the image size.
+    """
+    arr = np.asarray(img.convert("RGBA"))
+    if arr.shape[1::-1] == extruded_size(tile, cols, rows, extrude):
+        stride = tile + 2 * extrude
+        offset = extrude
+    else:
+        expected_w = cols * tile
+        expected_h = rows * tile
+        if arr.shape[1::-1] != (expected_w, expected_h):
+            print(f"WARNING: Expected {expected_w}x{expected_h}, got {arr.shape[1]}x{arr.shape[0]}")
+        stride = tile
+        offset = 0
+    grid = arr[:rows * stride, :cols * stride].reshape(rows, stride, cols, stride, 4)
+    inner = grid[:, offset:offset + tile, :, offset:offset + tile]
+    return inner.transpose(0, 2, 1, 3, 4).reshape(rows * cols, tile, tile, 4)
+
+
+def load_tile_stack(tileset, map_dir):
+    """
+    Decode a Tiled tileset block into an array of tiles.
+
+    Returns a (tilecount + 1, tileheight, tilewidth, 4) uint8 array where
+    index 0 is a fully transparent tile and index i is local tile i - 1,
+    so a layer's GIDs can index it directly after subtracting firstgid - 1.
+    """
+    image_path = os.path.normpath(os.path.join(map_dir, tileset["image"]))
+    atlas = np.asarray(Image.open(image_path).convert("RGBA"))
+
+    tw = tileset["tilewidth"]
+    th = tileset["tileheight"]
+    cols = tileset["columns"]
+    margin = tileset.get("margin", 0)
+    spacing = tileset.get("spacing", 0)
+    count = tileset["tilecount"]
+
+    idx = np.arange(count)
+    ys = margin + (idx // cols) * (th + spacing)
+    xs = margin + (idx % cols) * (tw + spacing)
+    rows = ys[:, None] + np.arange(th)  # (count, th)
+    cols_px = xs[:, None] + np.arange(tw)  # (count, tw)
+
+    stack = np.zeros((count + 1, th, tw, 4), dtype=np.uint8)
+    stack[1:] = atlas[rows[:, :, None], cols_px[:, None, :]]
+    return stack
+
+
+def build_extruded_atlas(tiles, cols, extrude):
+    """
+    Lay out (n, th, tw, 4) tiles in rows of `cols` with edge extrusion.
+
+    Each tile's outermost rows/columns (and corner pixels) are duplicated
+    `extrude` pixels outward, so the extrusion only ever repeats the tile's
+    own pixels. Tile i starts at (extrude + col * (tw + 2*extrude), ...),
+    matching a Tiled tileset with margin=extrude and spacing=2*extrude;
+    extrude=0 gives a plain grid.
+    """
+    n = tiles.shape[0]
+    rows = -(-n // cols)
+    padded = np.pad(tiles, ((0, 0), (extrude, extrude), (extrude, extrude), (0, 0)), mode="edge")
+    grid = np.zeros((rows * cols,) + padded.shape[1:], dtype=np.uint8)
+    grid[:n] = padded
+    sh, sw = padded.shape[1:3]
+    return grid.reshape(rows, cols, sh, sw, 4).transpose(0, 2, 1, 3, 4).reshape(rows * sh, cols * sw, 4)
+
+
+# ============================================================
+# Tiled map properties
+# ============================================================
+
+def get_property(d, name, default=None):
+    """Read a custom map property by name."""
+    for p in d.get("properties", []):
+        if p["name"] == name:
+            return p["value"]
+    return default
+
+
+def set_property(d, name, value, prop_type="string"):
+    """Set (or add) a custom map property."""
+    for p in d.setdefault("properties", []):
+        if p["name"] == name:
+            p["value"] = value
+            return
+    d["properties"].append({"name": name, "type": prop_type, "value": value})